@@ -0,0 +1,243 @@
+"""
+Rows/sec and peak RSS of the ETL hot paths run over synthetic transfers (see synthetic_txns.py). Results
+are written to a JSON file so runs on different commits can be compared. From the repo root:
+
+    python -m benchmarks.etl_benchmarks [--rows 1M --rows 10M] [-k STAGE] [--compare OLD_RESULTS.json]
+
+Every stage works on the same in memory list of txns (like load_transactions.py does) so the 100M row
+size needs a machine with enough RAM to hold them.
+"""
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from os import path
+from typing import Any, Callable, Dict, List
+
+from rich.table import Table
+
+from benchmarks.synthetic_txns import DEFAULT_SEED, synthetic_txns_csv
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.export.graphml import build_graphml
+from ethecycle.export.neo4j_csv import Neo4jCsvs
+from ethecycle.models.token import Token
+from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.filesystem_helper import OUTPUT_DIR, timestamp_for_filename
+from ethecycle.util.logging import console, print_dim
+from ethecycle.util.metrics import PeakRssSampler
+from ethecycle.util.number_helper import size_string
+from ethecycle.util.string_constants import ETHEREUM
+
+BENCHMARKS_DIR = OUTPUT_DIR.joinpath('benchmarks')
+SYNTHETIC_DATA_DIR = BENCHMARKS_DIR.joinpath('data')
+DEFAULT_ROWS = '1M'
+ROW_COUNT_SUFFIXES = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+# rows/sec changes smaller than this are shown as noise when comparing against old results
+NOISE_PCT = 5.0
+
+# Stages in the order they run. Wallets are extracted in 'extract_wallets' and reused by 'neo4j_csvs'.
+EXTRACT_FROM_CSV = 'extract_from_csv'
+EXTRACT_WALLETS = 'extract_wallets_from_transactions'
+LABEL_LOOKUPS = 'label_lookups'
+NEO4J_CSVS = 'neo4j_csvs'
+BUILD_GRAPHML = 'build_graphml'
+STAGES = [EXTRACT_FROM_CSV, EXTRACT_WALLETS, LABEL_LOOKUPS, NEO4J_CSVS, BUILD_GRAPHML]
+
+
+def run_etl_benchmarks(
+        row_counts: List[int],
+        seed: int = DEFAULT_SEED,
+        data_dir: str = str(SYNTHETIC_DATA_DIR),
+        stage_filter: str = ''
+    ) -> List[Dict[str, Any]]:
+    """Run the STAGES whose names contain 'stage_filter' on each row count. Returns one dict per stage run."""
+    # Load the chain addresses DB up front so it isn't counted against whichever stage touches it first
+    Wallet.chain_addresses()
+    Token.chain_addresses()
+    results = []
+
+    for rows in row_counts:
+        csv_path = synthetic_txns_csv(rows, data_dir, seed)
+        console.print(f"\nBenchmarking {rows:,} rows ({size_string(path.getsize(csv_path))})...", style='bright_white')
+        extracted_at = timestamp_for_filename()
+        extract_txns = lambda: Txn.extract_from_csv(csv_path, Ethereum, extracted_at)
+        stages = [stage for stage in STAGES if stage_filter in stage]
+        # The other stages need txns even if extracting them isn't being benchmarked
+        txns = None if EXTRACT_FROM_CSV in stages else extract_txns()
+        wallets = None
+
+        for stage in stages:
+            if stage == EXTRACT_FROM_CSV:
+                result, txns = _run_stage(stage, rows, extract_txns)
+                result['bytes'] = path.getsize(csv_path)
+            elif stage == EXTRACT_WALLETS:
+                result, wallets = _run_stage(stage, rows, lambda: Wallet.extract_wallets_from_transactions(txns))
+                result['wallets'] = len(wallets)
+            elif stage == LABEL_LOOKUPS:
+                result, _labels = _run_stage(stage, rows, lambda: _look_up_labels(txns))
+            elif stage == NEO4J_CSVS:
+                result, neo4j_csvs = _run_stage(stage, rows, lambda: Neo4jCsvs(txns, wallets))
+                result['bytes'] = sum(path.getsize(csv) for csv in neo4j_csvs.generated_csvs)
+
+                for csv in neo4j_csvs.generated_csvs:
+                    os.remove(csv)
+            elif stage == BUILD_GRAPHML:
+                result, _xml = _run_stage(stage, rows, lambda: build_graphml(txns, ETHEREUM))
+                del _xml
+
+            results.append(result)
+            gc.collect()
+
+        del txns, wallets
+        gc.collect()
+
+    _print_results(results)
+    return results
+
+
+def benchmark_metadata(seed: int) -> Dict[str, Any]:
+    """Enough about where the results came from to compare them with results from another run."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        'commit': commit or None,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+    }
+
+
+def compare_results(old_results: List[Dict[str, Any]], new_results: List[Dict[str, Any]]) -> None:
+    """Print the rows/sec and peak RSS change of every (stage, rows) that's in both sets of results."""
+    old_by_key = {(result['stage'], result['rows']): result for result in old_results}
+    table = Table('Stage', 'Rows', 'Old Rows / Sec', 'New Rows / Sec', 'Change', 'Old Peak RSS', 'New Peak RSS')
+
+    for new in new_results:
+        old = old_by_key.get((new['stage'], new['rows']))
+
+        if old is None:
+            continue
+
+        change_pct = 100.0 * (new['rows_per_second'] / old['rows_per_second'] - 1.0)
+        style = 'dim' if abs(change_pct) < NOISE_PCT else ('green' if change_pct > 0 else 'red')
+
+        table.add_row(
+            new['stage'],
+            f"{new['rows']:,}",
+            f"{old['rows_per_second']:,.0f}",
+            f"{new['rows_per_second']:,.0f}",
+            f"[{style}]{change_pct:+.1f}%[/{style}]",
+            size_string(old['peak_rss_bytes']),
+            size_string(new['peak_rss_bytes'])
+        )
+
+    console.print(table)
+
+
+def parse_row_count(row_count: str) -> int:
+    """'1M' => 1_000_000, '250k' => 250_000, '5000' => 5_000."""
+    row_count = row_count.strip().lower().replace('_', '')
+    multiplier = ROW_COUNT_SUFFIXES.get(row_count[-1:], 1)
+
+    if multiplier > 1:
+        row_count = row_count[:-1]
+
+    return int(float(row_count) * multiplier)
+
+
+def _run_stage(stage: str, rows: int, fxn: Callable[[], Any]) -> Any:
+    """Run 'fxn' and return a result dict and whatever 'fxn' returned."""
+    print_dim(f"  Running '{stage}'...")
+
+    with PeakRssSampler() as sampler:
+        start_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        return_value = fxn()
+        seconds = time.perf_counter() - start_time
+        cpu_seconds = time.process_time() - start_cpu_time
+
+    result = {
+        'stage': stage,
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'cpu_seconds': round(cpu_seconds, 4),
+        'rows_per_second': round(rows / seconds, 1) if seconds > 0 else None,
+        'peak_rss_bytes': sampler.peak_rss,
+        'rss_growth_bytes': sampler.peak_rss - sampler.start_rss,
+    }
+
+    return result, return_value
+
+
+def _look_up_labels(txns: List[Txn]) -> int:
+    """The per txn lookups the loader does: wallet name and category of both ends plus the token symbol."""
+    labels_found = 0
+
+    for txn in txns:
+        for address in [txn.from_address, txn.to_address]:
+            labels_found += Wallet.name_at_address(ETHEREUM, address) is not None
+            labels_found += Wallet.category_at_address(ETHEREUM, address) is not None
+
+        labels_found += Token.token_symbol(ETHEREUM, txn.token_address) is not None
+
+    return labels_found
+
+
+def _print_results(results: List[Dict[str, Any]]) -> None:
+    table = Table('Stage', 'Rows', 'Seconds', 'CPU Seconds', 'Rows / Sec', 'Peak RSS', 'RSS Growth')
+
+    for result in results:
+        table.add_row(
+            result['stage'],
+            f"{result['rows']:,}",
+            f"{result['seconds']:,.2f}",
+            f"{result['cpu_seconds']:,.2f}",
+            f"{result['rows_per_second'] or 0:,.0f}",
+            size_string(result['peak_rss_bytes']),
+            size_string(result['rss_growth_bytes'])
+        )
+
+    console.print(table)
+
+
+def _default_output_path(metadata: Dict[str, Any]) -> str:
+    commit = (metadata['commit'] or 'unknown')[:10]
+    return str(BENCHMARKS_DIR.joinpath(f"etl_{commit}_{timestamp_for_filename()}.json"))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Time the ETL stages on synthetic transfers.')
+    parser.add_argument('--rows', action='append', metavar='ROWS',
+                        help=f"row counts like 1M or 250k (repeatable, default {DEFAULT_ROWS})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='synthetic data random seed')
+    parser.add_argument('--data-dir', default=str(SYNTHETIC_DATA_DIR),
+                        help='where synthetic CSVs are generated and cached')
+    parser.add_argument('-k', '--filter', default='', help='only run stages whose name contains this')
+    parser.add_argument('-o', '--output', help='results JSON path (default is in OUTPUT_DIR/benchmarks/)')
+    parser.add_argument('--compare', metavar='RESULTS_JSON', help='compare against results from an earlier run')
+    args = parser.parse_args()
+
+    metadata = benchmark_metadata(args.seed)
+    row_counts = [parse_row_count(rows) for rows in (args.rows or [DEFAULT_ROWS])]
+    results = run_etl_benchmarks(row_counts, args.seed, args.data_dir, args.filter)
+    output_path = args.output or _default_output_path(metadata)
+    os.makedirs(path.dirname(path.abspath(output_path)), exist_ok=True)
+
+    with open(output_path, 'w') as json_file:
+        json.dump({**metadata, 'results': results}, json_file, indent=2)
+
+    console.print(f"\nWrote results to '{output_path}'", style='bright_white')
+
+    if args.compare:
+        with open(args.compare) as json_file:
+            compare_results(json.load(json_file)['results'], results)
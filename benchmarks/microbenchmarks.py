@@ -0,0 +1,69 @@
+"""
+Microbenchmarks of the helpers that are called once per transaction or address row. At 100M rows
+every microsecond spent in one of them is almost two minutes of wall clock. From the repo root:
+
+    python -m benchmarks.microbenchmarks [-n CALLS] [-k SUBSTRING]
+"""
+import timeit
+from argparse import ArgumentParser
+from typing import Callable, Dict
+
+from rich.table import Table
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.models.blockchain import get_chain_info, guess_chain_info_from_address
+from ethecycle.models.token import Token
+from ethecycle.models.transaction import Txn
+from ethecycle.util.logging import console
+from ethecycle.util.string_constants import ETHEREUM, USDT_ETHEREUM_ADDRESS
+
+DEFAULT_CALLS = 100_000
+REPEATS = 5
+ROWS_TO_EXTRAPOLATE_TO = 100_000_000
+WALLET_ADDRESS = '0x3d4e3413babb4cd2ef5220e2cd64e64439b3514e'
+CHECKSUMMED_WALLET_ADDRESS = '0x3d4E3413babB4cd2ef5220e2cD64e64439B3514E'
+TXN_HASH = '0x' + 'c0ffee' * 10 + 'beef'
+
+MICROBENCHMARKS: Dict[str, Callable[[], object]] = {
+    'ChainInfo.chain_string()': lambda: Ethereum.chain_string(),
+    'Ethereum.scanner_url() (address)': lambda: Ethereum.scanner_url(WALLET_ADDRESS),
+    'Ethereum.scanner_url() (txn hash)': lambda: Ethereum.scanner_url(TXN_HASH),
+    'get_chain_info() (known chain)': lambda: get_chain_info(ETHEREUM),
+    'get_chain_info() (default ChainInfo)': lambda: get_chain_info('crypto bro incorporated'),
+    'guess_chain_info_from_address() (lowercase)': lambda: guess_chain_info_from_address(WALLET_ADDRESS),
+    'guess_chain_info_from_address() (EIP-55)': lambda: guess_chain_info_from_address(CHECKSUMMED_WALLET_ADDRESS),
+    'Token.token_symbol()': lambda: Token.token_symbol(ETHEREUM, USDT_ETHEREUM_ADDRESS),
+    'Token.token_decimals()': lambda: Token.token_decimals(ETHEREUM, USDT_ETHEREUM_ADDRESS),
+    'Txn()': lambda: Txn(USDT_ETHEREUM_ADDRESS, WALLET_ADDRESS, WALLET_ADDRESS, '100', TXN_HASH, '7', 1, Ethereum),
+}
+
+
+def run_microbenchmarks(calls: int = DEFAULT_CALLS, name_filter: str = '') -> Dict[str, float]:
+    """
+    Returns {benchmark name: best of REPEATS runs in nanoseconds per call} and prints a table. Slow
+    helpers are called fewer than 'calls' times per run (as many as fit in about 0.2 seconds).
+    """
+    results = {}
+    table = Table('Helper', 'ns / call', 'Calls / sec', f"Seconds per {ROWS_TO_EXTRAPOLATE_TO:,} calls")
+
+    for name, fxn in MICROBENCHMARKS.items():
+        if name_filter.lower() not in name.lower():
+            continue
+
+        fxn()  # Warm up (loads the chain addresses DB for the Token lookups, etc.)
+        timer = timeit.Timer(fxn)
+        number = min(calls, timer.autorange()[0])
+        seconds = min(timer.repeat(repeat=REPEATS, number=number)) / number
+        results[name] = seconds * 1e9
+        table.add_row(name, f"{results[name]:,.0f}", f"{1 / seconds:,.0f}", f"{seconds * ROWS_TO_EXTRAPOLATE_TO:,.0f}")
+
+    console.print(table)
+    return results
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Time the per row helpers.')
+    parser.add_argument('-n', '--calls', type=int, default=DEFAULT_CALLS, help='calls per timing run')
+    parser.add_argument('-k', '--filter', default='', help='only run benchmarks whose name contains this')
+    args = parser.parse_args()
+    run_microbenchmarks(args.calls, args.filter)
@@ -0,0 +1,127 @@
+"""
+Seeded generator of synthetic token transfer CSVs in the same headerless RAW_TXN_DATA_CSV_COLS format
+as the real source data. The same (rows, seed) always produces the same file.
+
+    - Addresses are drawn from a Zipf (power law) distribution so a few exchange / contract
+      addresses appear in a large share of transfers while most addresses appear once or twice.
+    - Tokens follow a fixed mix dominated by stablecoins and ETH itself plus a long tail of made up tokens.
+    - Blocks increase monotonically with a Poisson number of transfers per block, and transactions
+      have a few transfers each (consecutive log indexes under one transaction hash).
+"""
+import os
+from os import path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.util.logging import console
+from ethecycle.util.string_constants import USDT_ETHEREUM_ADDRESS
+
+DEFAULT_SEED = 1337
+CHUNK_ROWS = 1_000_000
+FIRST_BLOCK = 15_000_000
+MEAN_TRANSFERS_PER_BLOCK = 150
+MEAN_TRANSFERS_PER_TXN = 1.5
+# Zipf exponent for address popularity (closer to 1 is more skewed)
+ADDRESS_ZIPF_EXPONENT = 1.3
+# Rows per distinct address (before the power law makes some appear far more often than others)
+ROWS_PER_ADDRESS = 10
+MIN_ADDRESSES = 1_000
+# Odd multiplier mod 2^160 scrambles address indexes into unique random looking addresses
+ADDRESS_MULTIPLIER = 0x9e3779b97f4a7c15f39cc0605cedc8341082276b
+ADDRESS_MODULUS = 2 ** 160
+TXN_HASH_MODULUS = 2 ** 256
+TAIL_TOKEN_COUNT = 500
+TAIL_TOKEN_SHARE = 0.10
+EMPTY_TO_ADDRESS_SHARE = 0.001  # Contract creations, burns, etc.
+
+# (token address, share of transfers). Shares are scaled to 1 - TAIL_TOKEN_SHARE.
+TOKEN_MIX: List[Tuple[str, float]] = [
+    (USDT_ETHEREUM_ADDRESS, 0.40),
+    ('0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48', 0.20),  # USDC
+    (Ethereum.ETH_ADDRESS, 0.15),
+    ('0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2', 0.10),  # WETH
+    ('0x6b175474e89094c44da98b954eedeac495271d0f', 0.08),  # DAI
+    ('0x514910771af9ca656af840dff83e8264ecf986ca', 0.04),  # LINK
+    ('0x2260fac5e5542a773aa44fbcfedf7c193bc2c599', 0.03),  # WBTC
+]
+
+
+def synthetic_txns_csv(rows: int, data_dir: str, seed: int = DEFAULT_SEED) -> str:
+    """Path to a synthetic CSV with 'rows' transfers in 'data_dir', generating it if it's not there."""
+    csv_path = path.join(data_dir, f"synthetic_txns_{rows}_rows_seed_{seed}.csv")
+
+    if path.isfile(csv_path):
+        console.print(f"Using existing '{csv_path}'...", style='dim')
+        return csv_path
+
+    os.makedirs(data_dir, exist_ok=True)
+    tmp_path = csv_path + '.tmp'
+    console.print(f"Generating {rows:,} synthetic transfers in '{csv_path}'...", style='dim')
+
+    with open(tmp_path, 'w') as csv_file:
+        for lines in generate_txn_lines(rows, seed):
+            csv_file.write(lines)
+
+    # Only rename once it's complete so an interrupted run doesn't leave a short file that looks finished
+    os.replace(tmp_path, csv_path)
+    return csv_path
+
+
+def generate_txn_lines(rows: int, seed: int = DEFAULT_SEED) -> Iterator[str]:
+    """Yield the CSV lines for 'rows' transfers CHUNK_ROWS at a time (as one string per chunk)."""
+    rng = np.random.default_rng(seed)
+    num_addresses = max(MIN_ADDRESSES, rows // ROWS_PER_ADDRESS)
+    tokens, token_probabilities = _token_mix()
+    block_number = FIRST_BLOCK
+    txn_number = 0
+    log_index = 0
+
+    for chunk_start in range(0, rows, CHUNK_ROWS):
+        chunk_rows = min(CHUNK_ROWS, rows - chunk_start)
+        from_idxs = _zipf_indexes(rng, chunk_rows, num_addresses)
+        to_idxs = _zipf_indexes(rng, chunk_rows, num_addresses)
+        token_idxs = rng.choice(len(tokens), size=chunk_rows, p=token_probabilities)
+        values = rng.lognormal(mean=3.0, sigma=2.5, size=chunk_rows)
+        empty_to_addresses = rng.random(chunk_rows) < EMPTY_TO_ADDRESS_SHARE
+        new_blocks = rng.random(chunk_rows) < 1 / MEAN_TRANSFERS_PER_BLOCK
+        new_txns = rng.random(chunk_rows) < 1 / MEAN_TRANSFERS_PER_TXN
+        lines = []
+
+        for i in range(chunk_rows):
+            if new_blocks[i]:
+                block_number += 1
+
+            if new_txns[i]:
+                txn_number += 1
+                log_index = 0
+            else:
+                log_index += 1
+
+            token_address = tokens[token_idxs[i]]
+            to_address = '' if empty_to_addresses[i] else _address(to_idxs[i])
+            txn_hash = f"0x{(txn_number * ADDRESS_MULTIPLIER) % TXN_HASH_MODULUS:064x}"
+            from_address = _address(from_idxs[i])
+            row = [token_address, from_address, to_address, f"{values[i]:.6f}", txn_hash, log_index, block_number]
+            lines.append(','.join(str(col) for col in row) + '\n')
+
+        yield ''.join(lines)
+
+
+def _address(index: int) -> str:
+    return f"0x{(int(index) * ADDRESS_MULTIPLIER) % ADDRESS_MODULUS:040x}"
+
+
+def _zipf_indexes(rng: np.random.Generator, size: int, num_addresses: int) -> np.ndarray:
+    """Zipf distributed indexes folded into [0, num_addresses)."""
+    return (rng.zipf(ADDRESS_ZIPF_EXPONENT, size=size) - 1) % num_addresses
+
+
+def _token_mix() -> Tuple[List[str], np.ndarray]:
+    tail_tokens = [_address(ADDRESS_MODULUS - 1 - i) for i in range(TAIL_TOKEN_COUNT)]
+    head_share = sum(share for _token, share in TOKEN_MIX)
+    probabilities = [share * (1 - TAIL_TOKEN_SHARE) / head_share for _token, share in TOKEN_MIX]
+    probabilities += [TAIL_TOKEN_SHARE / TAIL_TOKEN_COUNT] * TAIL_TOKEN_COUNT
+    probabilities = np.array(probabilities)
+    return [token for token, _share in TOKEN_MIX] + tail_tokens, probabilities / probabilities.sum()
@@ -0,0 +1,292 @@
+"""
+Address encodings (EIP-55 hex, base58check, bech32, cashaddr) and a classifier that dispatches an
+address on its (prefix, length) to the formats that could match it and validates those, so guessing
+which chain an address is on doesn't mean trying every chain's rules in turn.
+"""
+import hashlib
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from ethecycle.util.keccak import keccak256
+
+# Encodings
+BASE58 = 'base58'  # No checksum (or one we don't check)
+BASE58CHECK = 'base58check'
+BECH32 = 'bech32'  # bech32 or bech32m
+CASHADDR = 'cashaddr'
+EIP55_HEX = 'eip55_hex'
+RIPPLE_BASE58CHECK = 'ripple_base58check'
+
+# Match levels, higher is better. Candidates are ranked by these.
+PREFIX_MATCH = 1  # Only passes the chain's ChainInfo.is_valid_address() prefix / length check
+WELL_FORMED = 2  # Right prefix, length and characters but there's no checksum to verify
+CHECKSUM_VALID = 3
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+RIPPLE_BASE58_ALPHABET = 'rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz'
+BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+BECH32_CONSTANTS = [1, 0x2bc830a3]  # bech32, bech32m
+BECH32_GENERATOR = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+CASHADDR_GENERATOR = [0x98f2bc8e61, 0x79b76d99e2, 0xf33e5fb3c4, 0xae2eabe2a8, 0x1e4f43e470]
+CASHADDR_PREFIX = 'bitcoincash'
+HEX_REGEX = re.compile('[0-9a-fA-F]+')
+
+_BASE58_INDEXES = {a: {c: i for i, c in enumerate(a)} for a in [BASE58_ALPHABET, RIPPLE_BASE58_ALPHABET]}
+_BECH32_INDEXES = {c: i for i, c in enumerate(BECH32_CHARSET)}
+
+# (chain_info, match level)
+Candidate = Tuple[Type['ChainInfo'], int]
+# [(chain index, format)] to try on an address
+ChainFormats = List[Tuple[int, 'AddressFormat']]
+# ({length: [(chain index, format)]}, [(chain index, format) for formats of any length], [chain indexes])
+PrefixEntry = Tuple[Dict[int, List[Tuple[int, 'AddressFormat']]], List[Tuple[int, 'AddressFormat']], List[int]]
+
+
+@dataclass(frozen=True)
+class AddressFormat:
+    prefix: str
+    encoding: str
+    min_length: Optional[int] = None  # None means any length (as long as it's over ChainInfo.MINIMUM_ADDRESS_LENGTH)
+    max_length: Optional[int] = None  # Defaults to min_length
+    version_bytes: Tuple[int, ...] = ()  # First byte of the decoded payload for the base58check encodings
+
+    def lengths(self) -> Optional[range]:
+        if self.min_length is None:
+            return None
+
+        return range(self.min_length, (self.max_length or self.min_length) + 1)
+
+    def match_level(self, address: str) -> Optional[int]:
+        """WELL_FORMED or CHECKSUM_VALID if 'address' is in this format, None if it isn't."""
+        if self.encoding == EIP55_HEX:
+            return eip55_match_level(address[len(self.prefix):])
+        elif self.encoding == BASE58:
+            return WELL_FORMED if _base58_decode(address, BASE58_ALPHABET) is not None else None
+        elif self.encoding in [BASE58CHECK, RIPPLE_BASE58CHECK]:
+            alphabet = RIPPLE_BASE58_ALPHABET if self.encoding == RIPPLE_BASE58CHECK else BASE58_ALPHABET
+            return CHECKSUM_VALID if is_valid_base58check(address, self.version_bytes, alphabet) else None
+        elif self.encoding == BECH32:
+            return CHECKSUM_VALID if is_valid_bech32(address) else None
+        elif self.encoding == CASHADDR:
+            return CHECKSUM_VALID if is_valid_cashaddr(address) else None
+        else:
+            raise ValueError(f"Unknown address encoding '{self.encoding}'")
+
+
+class AddressClassifier:
+    """
+    Every ADDRESS_FORMATS entry of 'chain_infos' indexed by prefix and then by length (or not by length
+    for formats of any length) plus the chains' ADDRESS_PREFIXES for addresses that only pass the older
+    prefix check. Candidates are ranked by match level and then by the order of 'chain_infos'.
+    """
+    def __init__(self, chain_infos: Iterable[Type['ChainInfo']]) -> None:
+        self.chain_infos = list(chain_infos)
+        self.index: Dict[str, PrefixEntry] = {}
+
+        for i, chain_info in enumerate(self.chain_infos):
+            for address_format in chain_info.ADDRESS_FORMATS:
+                formats_by_length, any_length_formats, _chains = self._prefix_entry(address_format.prefix)
+                lengths = address_format.lengths()
+
+                if lengths is None:
+                    any_length_formats.append((i, address_format))
+                else:
+                    for length in lengths:
+                        formats_by_length.setdefault(length, []).append((i, address_format))
+
+            for prefix in chain_info.ADDRESS_PREFIXES:
+                self._prefix_entry(prefix)[2].append(i)
+
+        self.prefix_lengths = sorted(set(len(prefix) for prefix in self.index))
+
+    def candidates(self, address: str) -> List[Candidate]:
+        """Chains 'address' could be on, best match first."""
+        if not isinstance(address, str):
+            return []
+
+        match_levels = self._match_levels(address, *self._checks(self._prefixes(address), len(address)))
+
+        if len(match_levels) <= 1:
+            return [(self.chain_infos[i], match_level) for i, match_level in match_levels.items()]
+
+        ranked = sorted(match_levels.items(), key=lambda chain_level: (-chain_level[1], chain_level[0]))
+        return [(self.chain_infos[i], match_level) for i, match_level in ranked]
+
+    def best_chain_infos(self, addresses: Iterable[str]) -> Dict[str, Optional[Type['ChainInfo']]]:
+        """
+        The best candidate for each distinct address in 'addresses' (None if there isn't one). The addresses
+        are grouped by (matching prefixes, length) in one pass so the formats and chains to check are
+        looked up once per group instead of once per address; only the checksums are per address.
+        """
+        groups: Dict[Tuple[Tuple[str, ...], int], List[str]] = defaultdict(list)
+        best: Dict[str, Optional[Type['ChainInfo']]] = {}
+
+        for address in set(addresses):
+            if isinstance(address, str):
+                groups[(self._prefixes(address), len(address))].append(address)
+            else:
+                best[address] = None
+
+        for (prefixes, address_length), group_addresses in groups.items():
+            formats, chains = self._checks(prefixes, address_length)
+
+            for address in group_addresses:
+                match_levels = self._match_levels(address, formats, chains)
+
+                if len(match_levels) == 0:
+                    best[address] = None
+                else:
+                    i = min(match_levels, key=lambda i: (-match_levels[i], i))
+                    best[address] = self.chain_infos[i]
+
+        return best
+
+    def _prefixes(self, address: str) -> Tuple[str, ...]:
+        """The prefixes of 'address' that are in the index."""
+        return tuple(
+            address[:prefix_length]
+            for prefix_length in self.prefix_lengths
+            if prefix_length <= len(address) and address[:prefix_length] in self.index
+        )
+
+    def _checks(self, prefixes: Tuple[str, ...], address_length: int) -> Tuple[ChainFormats, List[int]]:
+        """The (chain index, format)s and the prefix only chain indexes to try on addresses of this length."""
+        formats: ChainFormats = []
+        chains: List[int] = []
+
+        for prefix in prefixes:
+            formats_by_length, any_length_formats, prefix_chains = self.index[prefix]
+            formats.extend(formats_by_length.get(address_length, []) + any_length_formats)
+            chains.extend(prefix_chains)
+
+        return formats, chains
+
+    def _match_levels(
+            self,
+            address: str,
+            formats: ChainFormats,
+            chains: List[int]
+        ) -> Dict[int, int]:
+        """{chain index: best match level} for every chain 'address' could be on."""
+        match_levels: Dict[int, int] = {}
+
+        for i, address_format in formats:
+            match_level = address_format.match_level(address)
+
+            if match_level is not None and match_level > match_levels.get(i, 0):
+                match_levels[i] = match_level
+
+        for i in chains:
+            if i not in match_levels and self.chain_infos[i].is_valid_address(address):
+                match_levels[i] = PREFIX_MATCH
+
+        return match_levels
+
+    def _prefix_entry(self, prefix: str) -> 'PrefixEntry':
+        return self.index.setdefault(prefix, ({}, [], []))
+
+
+def eip55_match_level(hex_digits: str) -> Optional[int]:
+    """Single case hex is WELL_FORMED, mixed case has to have the right EIP-55 capitalization."""
+    if not HEX_REGEX.fullmatch(hex_digits):
+        return None
+    elif hex_digits.islower() or hex_digits.isupper() or hex_digits.isdigit():
+        return WELL_FORMED
+
+    return CHECKSUM_VALID if eip55_checksum(hex_digits) == hex_digits else None
+
+
+def eip55_checksum(hex_digits: str) -> str:
+    """Capitalize the letters of an address (without the '0x') whose nibble in the address's keccak hash is >= 8."""
+    hex_digits = hex_digits.lower()
+    address_hash = keccak256(hex_digits.encode()).hex()
+    return ''.join(c.upper() if int(address_hash[i], 16) >= 8 else c for i, c in enumerate(hex_digits))
+
+
+def is_valid_base58check(address: str, version_bytes: Tuple[int, ...] = (), alphabet: str = BASE58_ALPHABET) -> bool:
+    """
+    True if the last 4 decoded bytes are the start of the double SHA-256 of the rest, and the rest
+    starts with one of 'version_bytes' (if any are given).
+    """
+    decoded = _base58_decode(address, alphabet)
+
+    if decoded is None or len(decoded) < 5:
+        return False
+
+    payload, checksum = decoded[:-4], decoded[-4:]
+
+    if len(version_bytes) > 0 and payload[0] not in version_bytes:
+        return False
+
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] == checksum
+
+
+def is_valid_bech32(address: str) -> bool:
+    """BIP-173 / BIP-350 checksum check. Doesn't check the human readable part or the length."""
+    if address.lower() != address and address.upper() != address:
+        return False
+
+    address = address.lower()
+    separator_idx = address.rfind('1')
+
+    if separator_idx < 1 or separator_idx + 7 > len(address):
+        return False
+
+    hrp = address[:separator_idx]
+    data = _bech32_values(address[separator_idx + 1:])
+
+    if data is None:
+        return False
+
+    hrp_expanded = [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+    return _polymod(hrp_expanded + data, BECH32_GENERATOR, 25) in BECH32_CONSTANTS
+
+
+def is_valid_cashaddr(address: str) -> bool:
+    """Bitcoin Cash address checksum check. The 'bitcoincash:' prefix is optional."""
+    address = address.lower()
+    prefix, _, payload = address.rpartition(':')
+    data = _bech32_values(payload)
+
+    if data is None or len(data) <= 8 or prefix not in ['', CASHADDR_PREFIX]:
+        return False
+
+    return _polymod([ord(c) & 31 for c in CASHADDR_PREFIX] + [0] + data, CASHADDR_GENERATOR, 35) == 1
+
+
+def _base58_decode(encoded: str, alphabet: str) -> Optional[bytes]:
+    """None if 'encoded' has a character that's not in 'alphabet'."""
+    indexes = _BASE58_INDEXES[alphabet]
+    number = 0
+
+    for c in encoded:
+        if c not in indexes:
+            return None
+
+        number = number * 58 + indexes[c]
+
+    leading_zeros = len(encoded) - len(encoded.lstrip(alphabet[0]))
+    return bytes(leading_zeros) + number.to_bytes((number.bit_length() + 7) // 8, 'big')
+
+
+def _bech32_values(data: str) -> Optional[List[int]]:
+    values = [_BECH32_INDEXES.get(c) for c in data]
+    return None if None in values else values
+
+
+def _polymod(values: List[int], generator: List[int], shift: int) -> int:
+    """The BCH code checksum shared by bech32 (shift 25) and cashaddr (shift 35, result xor'd with 1)."""
+    checksum = 1
+    mask = (1 << shift) - 1
+
+    for value in values:
+        top = checksum >> shift
+        checksum = ((checksum & mask) << 5) ^ value
+
+        for i, generator_value in enumerate(generator):
+            if (top >> i) & 1:
+                checksum ^= generator_value
+
+    return checksum
@@ -1,4 +1,5 @@
 import re
+from ethecycle.blockchains.address_format import BECH32, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
@@ -6,3 +7,4 @@ class BinanceSmartChain(ChainInfo):
     SHORT_NAME = 'bsc'
     NAME_REGEX = re.compile('\\s*binance\\s*smart\\s*chain$', re.IGNORECASE)
     ADDRESS_PREFIXES = ['bnb']
+    ADDRESS_FORMATS = [AddressFormat('bnb1', BECH32, 42)]
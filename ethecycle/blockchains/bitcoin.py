@@ -1,3 +1,4 @@
+from ethecycle.blockchains.address_format import BASE58CHECK, BECH32, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.util.logging import log
 
@@ -5,3 +6,9 @@ from ethecycle.util.logging import log
 class Bitcoin(ChainInfo):
     SHORT_NAME = 'btc'
     ADDRESS_PREFIXES = ['1', '3', 'bc1', 'lnbc']  # lnbc is lightning
+    ADDRESS_FORMATS = [
+        AddressFormat('1', BASE58CHECK, 26, 35, version_bytes=(0x00,)),  # P2PKH
+        AddressFormat('3', BASE58CHECK, 26, 35, version_bytes=(0x05,)),  # P2SH
+        AddressFormat('bc1', BECH32, 14, 74),  # Segwit
+        AddressFormat('lnbc', BECH32),  # Lightning invoice
+    ]
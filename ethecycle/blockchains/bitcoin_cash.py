@@ -1,6 +1,11 @@
+from ethecycle.blockchains.address_format import CASHADDR, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
 class BitcoinCash(ChainInfo):
     SHORT_NAME = 'bch'
     ADDRESS_PREFIXES = ['q', 'bitcoincash']
+    ADDRESS_FORMATS = [
+        AddressFormat('q', CASHADDR, 42),
+        AddressFormat('bitcoincash:', CASHADDR, 54),
+    ]
@@ -1,6 +1,12 @@
+from ethecycle.blockchains.address_format import BASE58, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
 class Cardano(ChainInfo):
     SHORT_NAME = 'ada'
     ADDRESS_PREFIXES = ['4', 'A', 'D']
+    # Byron era addresses (their CRC32 is inside CBOR so isn't checked)
+    ADDRESS_FORMATS = [
+        AddressFormat('Ae2', BASE58),
+        AddressFormat('DdzFF', BASE58),
+    ]
@@ -3,9 +3,12 @@ Abstract class to hold blockchain specific info (address lengths, token specific
 Handles lookups of address properties for tokens and wallets on the chain.
 """
 from typing import Dict, List
+from urllib.parse import urljoin
 
+import pandas as pd
 from inflection import underscore
 
+from ethecycle.blockchains.address_format import AddressFormat
 from ethecycle.util.string_constants import *
 
 
@@ -17,6 +20,15 @@ class ChainInfo:
     MINIMUM_ADDRESS_LENGTH = 6
     ADDRESS_LENGTH: int
 
+    # Encodings addresses on this chain can be in, used to tell which chain an address is on (see AddressClassifier)
+    ADDRESS_FORMATS: List[AddressFormat] = []
+
+    # Hex addresses can be written in any case (e.g. EIP-55 checksummed) but our source data is lowercase
+    HAS_CASE_INSENSITIVE_ADDRESSES = False
+
+    # Chain browser (e.g. etherscan.io) that scanner_url() links to
+    SCANNER_BASE_URI: str
+
     # Default decimals for tokens on this chain
     DEFAULT_DECIMALS = 0
 
@@ -29,6 +41,16 @@ class ChainInfo:
     _loaded_tokens = False
     _loaded_wallets = False
 
+    # chain_string() is called for every txn and address so it's worked out once per subclass in __init_subclass__()
+    _chain_string = 'chain_info'
+    # {restful path: scanner URL up to the address}, filled in by _scanner_url_prefix()
+    _scanner_url_prefixes: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._chain_string = underscore(cls.__name__)
+        cls._scanner_url_prefixes = {}
+
     @classmethod
     def scanner_url(cls, address: str) -> str:
         """Generate a URL for a chain browser, e.g. etherscan.io."""
@@ -45,19 +67,46 @@ class ChainInfo:
         else:
             if not any(address.startswith(prefix) for prefix in cls.ADDRESS_PREFIXES):
                 return False
-            elif 'ADDRESS_LENGTH' not in dir(cls):
+            elif getattr(cls, 'ADDRESS_LENGTH', None) is None:
                 return True
 
             return len(address) == cls.ADDRESS_LENGTH
 
+    @classmethod
+    def valid_address_mask(cls, addresses: pd.Series) -> pd.Series:
+        """Vectorized is_valid_address(): boolean Series that's True where 'addresses' has a valid address."""
+        # .str methods return NaN for non string values (e.g. NaN itself) and NaN comparisons are False
+        try:
+            lengths = addresses.str.len()
+        except AttributeError:
+            # Columns without a single string in them (e.g. all NaN) have no .str accessor
+            return pd.Series(False, index=addresses.index)
+
+        mask = lengths > cls.MINIMUM_ADDRESS_LENGTH
+
+        if len(cls.ADDRESS_PREFIXES) == 0:
+            return mask
+
+        mask &= addresses.str.startswith(tuple(cls.ADDRESS_PREFIXES), na=False)
+
+        if getattr(cls, 'ADDRESS_LENGTH', None) is not None:
+            mask &= lengths == cls.ADDRESS_LENGTH
+
+        return mask
+
     @classmethod
     def chain_string(cls) -> str:
         """Returns lowercased version of class name (which should be the name of the blockchain)."""
-        return underscore(cls.__name__)
+        return cls._chain_string
 
     @classmethod
     def _chain_shortname(cls):
-        if 'SHORT_NAME' in dir(cls):
-            return cls.SHORT_NAME
-        else:
-            return cls.chain_string()
+        return getattr(cls, 'SHORT_NAME', None) or cls._chain_string
+
+    @classmethod
+    def _scanner_url_prefix(cls, restful_path: str) -> str:
+        """urljoin() of SCANNER_BASE_URI and 'restful_path', cached so building a URL is one string concatenation."""
+        if restful_path not in cls._scanner_url_prefixes:
+            cls._scanner_url_prefixes[restful_path] = urljoin(cls.SCANNER_BASE_URI, f"{restful_path}/")
+
+        return cls._scanner_url_prefixes[restful_path]
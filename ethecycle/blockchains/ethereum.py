@@ -1,6 +1,6 @@
 from typing import Optional
-from urllib.parse import urljoin
 
+from ethecycle.blockchains.address_format import EIP55_HEX, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.util.logging import log
 from ethecycle.util.string_constants import *
@@ -10,6 +10,8 @@ class Ethereum(ChainInfo):
     LABEL_CATEGORIES_SCRAPED_FROM_DUNE = ['cex', 'multisig', 'bridge', 'funds', 'mev', 'hackers', 'ofac_sanction']
     ADDRESS_PREFIXES = ['0x']
     ADDRESS_LENGTH = 42
+    ADDRESS_FORMATS = [AddressFormat('0x', EIP55_HEX, 42)]
+    HAS_CASE_INSENSITIVE_ADDRESSES = True
     TXN_HASH_LENGTH = 66
     SCANNER_BASE_URI = 'https://etherscan.io/'
     ETH_ADDRESS = '0x0'  # Synthetic address because eth itself is not a token
@@ -38,4 +40,4 @@ class Ethereum(ChainInfo):
 
     @classmethod
     def _build_scanner_url(cls, restful_path: str, address: str) -> str:
-        return urljoin(cls.SCANNER_BASE_URI, f"{restful_path}/{address}")
+        return cls._scanner_url_prefix(restful_path) + address
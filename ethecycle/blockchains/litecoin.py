@@ -1,6 +1,12 @@
+from ethecycle.blockchains.address_format import BASE58CHECK, BECH32, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
 class Litecoin(ChainInfo):
     SHORT_NAME = 'ltc'
     ADDRESS_PREFIXES = ['L', 'M', 'ltc1']  # Also '3'...
+    ADDRESS_FORMATS = [
+        AddressFormat('L', BASE58CHECK, 26, 35, version_bytes=(0x30,)),
+        AddressFormat('M', BASE58CHECK, 26, 35, version_bytes=(0x32,)),
+        AddressFormat('ltc1', BECH32, 15, 75),
+    ]
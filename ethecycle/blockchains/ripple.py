@@ -1,6 +1,8 @@
+from ethecycle.blockchains.address_format import RIPPLE_BASE58CHECK, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
 class Ripple(ChainInfo):
     SHORT_NAME = 'xrp'
     ADDRESS_PREFIXES = ['r']
+    ADDRESS_FORMATS = [AddressFormat('r', RIPPLE_BASE58CHECK, 25, 35, version_bytes=(0x00,))]
@@ -1,6 +1,8 @@
+from ethecycle.blockchains.address_format import BASE58CHECK, AddressFormat
 from ethecycle.blockchains.chain_info import ChainInfo
 
 
 class Tron(ChainInfo):
     SHORT_NAME = 'tron'
     ADDRESS_PREFIXES = ['T']
+    ADDRESS_FORMATS = [AddressFormat('T', BASE58CHECK, 34, version_bytes=(0x41,))]
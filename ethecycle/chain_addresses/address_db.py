@@ -1,23 +1,30 @@
 """
 Class to manage sqlite DB holding wallet tag info. Most methods here assume you are bulk
-updating all data in a given table from a given data_source.
+updating all data in a given table from a given data_source. Each process holds one connection
+open (see get_db_connection()) until it exits; loaders read over separate read only connections.
 Context managers: https://rednafi.github.io/digressions/python/2020/03/26/python-contextmanager.html#nesting-contexts
 """
+import atexit
 import json
+import sqlite3
 from contextlib import contextmanager
-from sqlite3.dbapi2 import IntegrityError
-from typing import Any, Dict, List, Optional, Union
+from os import path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import sqllex as sx
 from rich.panel import Panel
 from rich.pretty import pprint
 
 from ethecycle.chain_addresses import db
-from ethecycle.chain_addresses.db.table_definitions import DATA_SOURCE_ID, DATA_SOURCES_TABLE_NAME, TABLE_DEFINITIONS
+from ethecycle.chain_addresses.db.collision_report import CollisionReport
+from ethecycle.chain_addresses.db.connections import configure_connection, enable_wal, read_only_connection
+from ethecycle.chain_addresses.db.search_index import (create_search_index, drop_search_index,
+     is_search_index_in_database, reindex_data_source)
+from ethecycle.chain_addresses.db.table_definitions import (ADDRESS_UNIQUE_INDEX, DATA_SOURCE_ID,
+     DATA_SOURCES_TABLE_NAME, FINGERPRINT, TABLE_DEFINITIONS)
 from ethecycle.config import Config
 #from ethecycle.models.token import Token
-from ethecycle.util.list_helper import compare_lists
-from ethecycle.util.logging import console, log, print_dim, print_indented
+from ethecycle.util.logging import console, log, print_dim
 from ethecycle.util.string_constants import *
 from ethecycle.util.time_helper import current_timestamp_iso8601_str
 #from ethecycle.models.wallet import Wallet
@@ -27,10 +34,33 @@ DbRows = List[Dict[str, Any]]
 # TODO: Deal with this a better way
 COLUMNS_TO_NOT_LOAD = ['chain_info', 'data_source']
 
+# insert_addresses() loads rows into 'temp.staging_[table]' before copying them to the real table
+STAGING_TABLE_PREFIX = 'staging_'
+# ...and deduplicates them into 'temp.new_rows_[table]' before diffing against the real table
+NEW_ROWS_TABLE_PREFIX = 'new_rows_'
+STAGING_ID = 'staging_id'
+COLUMNS_TO_NOT_COMPARE = ['extra_fields']
+COLLISION_SAMPLE_SIZE = 5
+BULK_LOAD_CACHE_SIZE_KB = 256 * 1024
+
+# (objs, fingerprint, data_source, table_name) args of an insert_addresses() call
+InsertBatch = Tuple[List['Address'], Optional[str], Optional[str], Optional[str]]
+
+# When not None insert_addresses() appends to this list instead of writing to the DB (see deferred_inserts())
+_deferred_inserts: Optional[List[InsertBatch]] = None
+# When not None is_data_source_unchanged() checks these {data_source: fingerprint} instead of the DB
+_known_fingerprints: Optional[Dict[str, Optional[str]]] = None
+# {data_source: data_sources.id}, loaded on first use by _get_or_create_data_source_id()
+_data_source_ids: Optional[Dict[str, int]] = None
+# Set once get_db_connection() has created any missing tables / columns
+_is_schema_verified = False
+# Connections inherited through fork() (see forget_db_connection())
+_inherited_connections: List[sx.SQLite3x] = []
+
 
 @contextmanager
 def table_connection(table_name):
-    """Connect to db and yield table obj. Disconnects automatically when done to commit data."""
+    """Yield sqllex table obj for 'table_name' on the process's shared connection."""
     db = get_db_connection()
 
     try:
@@ -38,56 +68,250 @@ def table_connection(table_name):
     except Exception as e:
         console.print(f"Exception {e} while connected to '{table_name}'...")
         raise e
+
+
+@contextmanager
+def deferred_inserts(fingerprints: Dict[str, Optional[str]]) -> Iterator[List[InsertBatch]]:
+    """
+    Collect the batches passed to insert_addresses() inside this context instead of writing them so
+    importers can be run in worker processes while the DB writes happen elsewhere. 'fingerprints'
+    (see data_source_fingerprints()) stand in for the DB when checking for unchanged data sources.
+    """
+    global _deferred_inserts, _known_fingerprints
+    _deferred_inserts = []
+    _known_fingerprints = fingerprints
+
+    try:
+        yield _deferred_inserts
     finally:
-        # Hold connection open for big inserts bc writing is slow.
-        if not Config.skip_load_from_db:
-            db.disconnect()
+        _deferred_inserts = None
+        _known_fingerprints = None
+
+
+def data_source_fingerprints() -> Dict[str, Optional[str]]:
+    """Fingerprint of the input each data_source was last imported from."""
+    connection = get_db_connection().connection
+    return dict(connection.execute(f"SELECT {DATA_SOURCE}, {FINGERPRINT} FROM {DATA_SOURCES_TABLE_NAME}"))
+
 
+def is_data_source_unchanged(data_source: str, fingerprint: Optional[str]) -> bool:
+    """
+    True if 'data_source' was last imported from input with the same 'fingerprint' (a git commit, a file
+    hash, etc.) in which case the importer can skip it. Always False if Config.ignore_data_source_fingerprints.
+    """
+    if fingerprint is None or Config.ignore_data_source_fingerprints:
+        return False
+
+    fingerprints = data_source_fingerprints() if _known_fingerprints is None else _known_fingerprints
 
-def insert_addresses(objs: List['Address']) -> None:
-    """Insert 'rows' into table named 'table_name'. Assumes all rows have the same data_source."""
-    if len(objs) == 0:
+    if fingerprints.get(data_source) != fingerprint:
+        return False
+
+    print_dim(f"Skipping '{data_source}' (unchanged since last import, fingerprint: {fingerprint})")
+    return True
+
+
+def insert_addresses(
+        objs: List['Address'],
+        fingerprint: Optional[str] = None,
+        data_source: Optional[str] = None,
+        table_name: Optional[str] = None
+    ) -> Optional[CollisionReport]:
+    """
+    Make the rows in 'objs' table from objs' data_source match 'objs' (all objs must have the same
+    data_source). In one transaction the rows are loaded into a TEMP staging table, deduplicated into a
+    second TEMP table with 'INSERT OR IGNORE ... SELECT' (in staging order, so the first row for an
+    address wins), and the differences between that and the existing rows are applied as row level
+    INSERTs, UPDATEs and DELETEs (changes to extracted_at alone don't count). One JOIN against the
+    staging table works out which rows collided and which columns differed. If 'fingerprint' is given
+    it is stored with the data_source for is_data_source_unchanged().
+    'data_source' and 'table_name' are only needed when 'objs' might be empty: with them an empty 'objs'
+    deletes all of the data_source's rows from 'table_name' (and stores 'fingerprint'); without them
+    there's nothing to do.
+    """
+    if _deferred_inserts is not None:
+        _deferred_inserts.append((objs, fingerprint, data_source, table_name))
+        return None
+
+    if len(objs) > 0:
+        objs_table_name, objs_data_source = objs[0].table_name(), objs[0].data_source
+
+        if (table_name or objs_table_name, data_source or objs_data_source) != (objs_table_name, objs_data_source):
+            msg = f"'{objs_table_name}' from '{objs_data_source}' passed as '{table_name}' from '{data_source}'"
+            raise ValueError(f"Insertion has mismatched objs: {msg}")
+
+        table_name, data_source = objs_table_name, objs_data_source
+    elif data_source is None or table_name is None:
         print_dim("Nothing to write...")
-        return
+        return None
 
+    print_dim(f"Bulk writing {len(objs)} rows to table '{table_name}'...")
+    # Before the transaction because it may create (and commit) the data_sources row
+    db_dicts = _to_db_dicts(objs) if len(objs) > 0 else []
+    data_source_id = _get_or_create_data_source_id(data_source)
     db_conn = get_db_connection()
-    table_name = objs[0].table_name()
-    data_source = objs[0].data_source
     columns = db_conn.get_columns_names(table_name)
-    print_dim(f"Bulk writing {len(objs)} rows to table '{table_name}'...")
-    _delete_rows_from_source(table_name, data_source)
-    row_tuples = [[row.get(c) for c in columns] for row in _to_db_dicts(objs)]
+    row_tuples = [tuple(row.get(c) for c in columns) for row in db_dicts]
+    staging_table = f"{STAGING_TABLE_PREFIX}{table_name}"
+    new_rows_table = f"{NEW_ROWS_TABLE_PREFIX}{table_name}"
+    connection = db_conn.connection
 
-    try:
-        db_conn.insertmany(table_name, row_tuples)
-    except IntegrityError as e:
-        print_indented(f"{e} bulk loading!", style='red dim')
-        print_indented("Cleaning up and switching to one at a time...", style='white dim')
-        _delete_rows_from_source(table_name, data_source)
-        _insert_one_at_a_time(table_name, row_tuples)
-    finally:
-        # Hold connection open for big inserts bc writing is slow.
-        if not Config.skip_load_from_db:
-            db_conn.disconnect()
+    with connection:
+        _create_temp_table(connection, table_name, staging_table)
+        _create_temp_table(connection, table_name, new_rows_table, with_constraints=True)
+
+        connection.executemany(
+            f"INSERT INTO temp.{staging_table} ({','.join(columns)}) VALUES ({','.join('?' * len(columns))})",
+            row_tuples
+        )
+
+        # OR IGNORE (rather than ON CONFLICT DO NOTHING) so NOT NULL violations skip the row instead of aborting
+        kept_rows = connection.execute(
+            f"INSERT OR IGNORE INTO temp.{new_rows_table} ({','.join(columns)}) "
+            f"SELECT {','.join(columns)} FROM temp.{staging_table} ORDER BY {STAGING_ID}"
+        ).rowcount
+
+        report = CollisionReport(table_name, data_source, len(row_tuples), kept_rows)
 
-    print_dim(f"Finished writing {len(objs)} rows to '{table_name}'.")
+        if kept_rows < len(row_tuples):
+            _find_collisions(connection, f"temp.{new_rows_table}", staging_table, columns, report)
 
+        changed_rows = _apply_row_diff(connection, table_name, new_rows_table, columns, data_source, data_source_id)
 
-def _delete_rows_from_source(table_name: str, _data_source: str) -> None:
-    """Delete all rows where _data_source arg is the data_source col. (Allows updates by reloading entire source)"""
-    data_source_id = _get_or_create_data_source_id(_data_source)
+        if changed_rows > 0:
+            reindex_data_source(connection, table_name, data_source_id)
 
-    with table_connection(table_name) as db_table:
-        data_source_row_count = db_table.select(
-            SELECT='COUNT(*)',
-            WHERE=(db_table[DATA_SOURCE_ID] == data_source_id)
-        )[0][0]
+        if fingerprint is not None:
+            connection.execute(
+                f"UPDATE {DATA_SOURCES_TABLE_NAME} SET {FINGERPRINT} = ? WHERE id = ?",
+                [fingerprint, data_source_id]
+            )
 
-        if data_source_row_count == 0:
-            return
+        connection.execute(f"DROP TABLE temp.{staging_table}")
+        connection.execute(f"DROP TABLE temp.{new_rows_table}")
 
-        console.print(f"Deleting {data_source_row_count} rows in '{table_name}' sourced from '{_data_source}'...", style='bytes')
-        db_table.delete({DATA_SOURCE_ID: data_source_id})
+    report.print()
+    return report
+
+
+@contextmanager
+def bulk_load_mode() -> Iterator[None]:
+    """
+    Trade durability for speed while rebuilding the whole DB (a crash means rebuilding again anyway):
+    no fsyncs, bigger page cache, and temp tables in memory. Restores the defaults afterwards.
+    """
+    connection = get_db_connection().connection
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.execute(f"PRAGMA cache_size = -{BULK_LOAD_CACHE_SIZE_KB}")
+    connection.execute('PRAGMA temp_store = MEMORY')
+
+    try:
+        yield
+    finally:
+        connection = get_db_connection().connection
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute('PRAGMA cache_size = -2000')
+        connection.execute('PRAGMA temp_store = DEFAULT')
+
+
+def _create_temp_table(
+        connection: sqlite3.Connection,
+        table_name: str,
+        temp_table: str,
+        with_constraints: bool = False
+    ) -> None:
+    """
+    TEMP table with the same columns (and column affinities) as 'table_name' plus a STAGING_ID to keep the
+    row order. 'with_constraints' adds the NOT NULL constraints and the ADDRESS_UNIQUE_INDEX.
+    """
+    column_defs = [
+        f"{name} {col_type}{' NOT NULL' if not_null and with_constraints else ''}"
+        for _cid, name, col_type, not_null, _default, _pk in connection.execute(f"PRAGMA table_info({table_name})")
+    ]
+
+    connection.execute(f"DROP TABLE IF EXISTS temp.{temp_table}")
+    connection.execute(f"CREATE TEMP TABLE {temp_table} ({STAGING_ID} INTEGER PRIMARY KEY, {','.join(column_defs)})")
+
+    if with_constraints:
+        index_sql = f"CREATE UNIQUE INDEX temp.idx_{temp_table} ON {temp_table}({','.join(ADDRESS_UNIQUE_INDEX)})"
+        connection.execute(index_sql)
+
+
+def _apply_row_diff(
+        connection: sqlite3.Connection,
+        table_name: str,
+        new_rows_table: str,
+        columns: List[str],
+        data_source: str,
+        data_source_id: int
+    ) -> int:
+    """
+    Make the data_source's rows in 'table_name' match 'new_rows_table'. Returns the number of rows changed. Rows are matched on the
+    ADDRESS_UNIQUE_INDEX; rows with a NULL in the key never match so they are always deleted and reinserted.
+    """
+    key_match = ' AND '.join(f"n.{c} = {table_name}.{c}" for c in ADDRESS_UNIQUE_INDEX)
+    new_row = f"FROM temp.{new_rows_table} n WHERE {key_match}"
+    update_cols = [c for c in columns if c not in ADDRESS_UNIQUE_INDEX]
+    changed = ' OR '.join(f"n.{c} IS NOT {table_name}.{c}" for c in update_cols if c != EXTRACTED_AT)
+
+    deleted = connection.execute(
+        f"DELETE FROM {table_name} WHERE {DATA_SOURCE_ID} = ? AND NOT EXISTS (SELECT 1 {new_row})",
+        [data_source_id]
+    ).rowcount
+
+    updated = connection.execute(
+        f"UPDATE {table_name} SET ({','.join(update_cols)}) = (SELECT {','.join(f'n.{c}' for c in update_cols)} {new_row}) "
+        f"WHERE {DATA_SOURCE_ID} = ? AND EXISTS (SELECT 1 {new_row} AND ({changed}))",
+        [data_source_id]
+    ).rowcount
+
+    inserted = connection.execute(
+        f"INSERT INTO {table_name} ({','.join(columns)}) SELECT {','.join(f'n.{c}' for c in columns)} "
+        f"FROM temp.{new_rows_table} n WHERE NOT EXISTS (SELECT 1 FROM {table_name} WHERE {key_match}) "
+        f"ORDER BY n.{STAGING_ID}"
+    ).rowcount
+
+    msg = f"'{table_name}' rows from '{data_source}': {inserted} inserted, {updated} updated, {deleted} deleted."
+    console.print(msg, style='bytes')
+    return inserted + updated + deleted
+
+
+def _find_collisions(
+        connection: sqlite3.Connection,
+        kept_rows_table: str,
+        staging_table: str,
+        columns: List[str],
+        report: CollisionReport
+    ) -> None:
+    """
+    Join every staged row to the row kept for its address and fill in 'report'. Each kept row joins
+    to itself and to any staged rows that collided with it; NULL keys never collide (or join).
+    """
+    compare_cols = [c for c in columns if c not in ADDRESS_UNIQUE_INDEX + COLUMNS_TO_NOT_COMPARE]
+    mismatches = [f"s.{c} IS NOT t.{c}" for c in compare_cols]
+    any_mismatch = f"({' OR '.join(mismatches)})"
+    join = f"FROM temp.{staging_table} s JOIN {kept_rows_table} t ON " + \
+        ' AND '.join(f"s.{c} = t.{c}" for c in ADDRESS_UNIQUE_INDEX)
+
+    joined_rows, kept_rows, mismatched_rows, *column_counts = connection.execute(
+        f"SELECT COUNT(*), COUNT(DISTINCT t.rowid), TOTAL({any_mismatch}), " +
+        ', '.join(f"TOTAL({m})" for m in mismatches) + f" {join}"
+    ).fetchone()
+
+    report.mismatched_rows = int(mismatched_rows)
+    report.identical_rows = joined_rows - kept_rows - report.mismatched_rows
+    report.column_mismatch_counts.update({c: int(n) for c, n in zip(compare_cols, column_counts) if n > 0})
+
+    if report.mismatched_rows == 0:
+        return
+
+    sample_rows = connection.execute(
+        f"SELECT {', '.join(f's.{c}' for c in columns)}, {', '.join(f't.{c}' for c in columns)} {join} "
+        f"WHERE {any_mismatch} ORDER BY s.{STAGING_ID} LIMIT {COLLISION_SAMPLE_SIZE}"
+    )
+
+    for row in sample_rows:
+        report.samples.append((dict(zip(columns, row[:len(columns)])), dict(zip(columns, row[len(columns):]))))
 
 
 def is_table_in_database(table_name: str) -> bool:
@@ -99,32 +323,96 @@ def is_table_in_database(table_name: str) -> bool:
         return False
 
 
-def drop_and_recreate_tables() -> None:
+def drop_and_recreate_tables(defer_indexes: bool = False) -> None:
     """Drop and recreate all tables and them (only recreates schema; does not re-import rows)"""
+    global _data_source_ids
     db_conn = get_db_connection()
+    _data_source_ids = None
+
+    drop_search_index(db_conn.connection)
 
     for table_definition in TABLE_DEFINITIONS:
         table_definition.drop_table(db_conn)
 
     for table_definition in TABLE_DEFINITIONS:
-        table_definition.create_table(db_conn)
+        table_definition.create_table(db_conn, defer_indexes)
+
+    create_search_index(db_conn.connection)
+
+
+def create_deferred_indexes() -> None:
+    """Build the indexes skipped by drop_and_recreate_tables(defer_indexes=True) and update the planner stats."""
+    db_conn = get_db_connection()
+
+    for table_definition in TABLE_DEFINITIONS:
+        table_definition.create_indexes(db_conn)
+
+    db_conn.connection.execute('ANALYZE')
 
 
 def get_db_connection() -> sx.SQLite3x:
-    """Make sure db._db is built / connected and that the tables have been created."""
+    """
+    The process's shared connection, opened on first use (or after disconnect()) and closed when the
+    process exits. The first call in a process also creates any missing tables / columns / search index.
+    """
+    global _is_schema_verified
+
     if db._db is None:
-        db._db = sx.SQLite3x(path=db.CHAIN_ADDRESSES_DB_PATH)
+        db._db = sx.SQLite3x(path=db.CHAIN_ADDRESSES_DB_PATH, init_connection=False)
 
-    if not _is_connected_to_db_file():
+    if db._db.connection is None:
         db._db.connect()
+        configure_connection(db._db.connection)
+        enable_wal(db._db.connection)
 
-    for table_definition in TABLE_DEFINITIONS:
-        if not is_table_in_database(table_definition.table_name):
-            table_definition.create_table(db._db)
+    if not _is_schema_verified:
+        for table_definition in TABLE_DEFINITIONS:
+            if not is_table_in_database(table_definition.table_name):
+                table_definition.create_table(db._db)
+            else:
+                table_definition.add_missing_columns(db._db)
+
+        if not is_search_index_in_database(db._db.connection):
+            create_search_index(db._db.connection)
+
+        _is_schema_verified = True
 
     return db._db
 
 
+def close_db_connection() -> None:
+    """
+    Commit and close the shared connection. If no other connection has the DB open this checkpoints
+    the WAL and deletes the -wal and -shm files.
+    """
+    if db._db is not None:
+        db._db.disconnect()
+
+
+def forget_db_connection() -> None:
+    """
+    For worker processes started with fork(): stop using the connection inherited from the parent so
+    the next get_db_connection() opens a new one. The inherited one is deliberately never closed
+    (sqlite connections must not be used at all across fork() and closing may write to the DB).
+    """
+    global _is_schema_verified
+
+    if db._db is not None:
+        _inherited_connections.append(db._db)
+        db._db = None
+
+    _is_schema_verified = False
+
+
+def load_table_rows(table_name: str, columns: List[str]) -> List[Tuple[Any, ...]]:
+    """Read 'columns' of every row in 'table_name' over a read only connection."""
+    if not path.isfile(db.CHAIN_ADDRESSES_DB_PATH):
+        get_db_connection()  # Creates the DB
+
+    with read_only_connection() as connection:
+        return connection.execute(f"SELECT {','.join(columns)} FROM {table_name}").fetchall()
+
+
 def coalesce_rows(rows: DbRows) -> DbRows:
     """Assemble the best data for each address by combining the data_sources in the DB."""
     if len(rows) == 0:
@@ -175,86 +463,25 @@ def _to_db_dicts(objs: List['Address']) -> List[Dict[str, Any]]:
     return [obj.__dict__ for obj in objs]
 
 
-def _insert_one_at_a_time(table_name: str, rows: List[List[Any]]) -> None:
-    """Insert 'rows' into table named 'table_name' one at a time for use as a fallback."""
-    console.print(f"Fallback write {len(rows)} rows to '{table_name}' one at a time...", style='yellow dim')
-    rows_written = 0
-    failed_writes = 0
-    identical_writes = 0
-
-    with table_connection(table_name) as table:
-        column_names = table.get_columns_names()
-
-        for row in rows:
-            log.debug(f"Inserting {row}")
-
-            try:
-                table.insert(row)
-                rows_written += 1
-            except IntegrityError as e:
-                if Config.debug:
-                    console.print_exception()
-
-                if 'UNIQUE constraint' in str(e):
-                    row_dict = dict(zip(column_names, row))
-
-                    old_row = table.select_all(
-                        WHERE=(
-                            (table[BLOCKCHAIN] == row_dict[BLOCKCHAIN]) & \
-                            (table[DATA_SOURCE_ID] == row_dict[DATA_SOURCE_ID]) & \
-                            (table[ADDRESS] == row_dict[ADDRESS])
-                        )
-                    )[0]
-
-                    msg = f"Address collision for {row_dict[ADDRESS]} ({row_dict[BLOCKCHAIN]}).\n"
-                    msg +="Mismatched cols:\n    "
-                    mismatches = compare_lists(row, old_row, column_names, ['extra_fields'])
-
-                    if len(mismatches) > 0:
-                        failed_writes += 1
-
-                        if not Config.suppress_chain_address_db_collision_warnings:
-                            log.warning(msg + mismatches + "\n  (Keeping only original row)")
-                    else:
-                        identical_writes += 1
-                else:
-                    if not Config.suppress_chain_address_db_collision_warnings:
-                        log.warning(f"Skipping because {type(e).__name__} error {e} on row {row}...")
-
-    print_dim(f"Wrote {rows_written} '{table_name}' rows one at a time ({failed_writes} collisions, {identical_writes} identical rows).")
-
-
-# https://stackoverflow.com/questions/71655300/python-sqlite3-how-to-check-if-connection-is-an-in-memory-database
-def _is_connected_to_db_file() -> bool:
-    """Abuse 'pragma database list' to check if connection status real or just in memory."""
-    if not db._db.connection:
-        return False
-
-    log.debug("Checking DB connection status...")
-    local_cursor = db._db.connection.cursor()
-    local_cursor.execute('pragma database_list')
-    connected_to_file = local_cursor.fetchall()[0][2]
-    return connected_to_file is not None and len(connected_to_file) > 0
-
-
 def _get_or_create_data_source_id(data_source: str) -> int:
-    """Get the data_sources.id, creating a row if necessary."""
-    data_sources = _load_table(DATA_SOURCES_TABLE_NAME)
-    row = next((r for r in data_sources if r[DATA_SOURCE] == data_source), None)
+    """Get the data_sources.id, creating a row if necessary. Ids are cached for the life of the process."""
+    global _data_source_ids
+    connection = get_db_connection().connection
+
+    if _data_source_ids is None:
+        _data_source_ids = dict(connection.execute(f"SELECT {DATA_SOURCE}, id FROM {DATA_SOURCES_TABLE_NAME}"))
 
-    if row is not None:
-        return row['id']
+    if data_source not in _data_source_ids:
+        # Committed right away so a rollback of the caller's transaction can't leave a stale id in the cache
+        with connection:
+            cursor = connection.execute(
+                f"INSERT INTO {DATA_SOURCES_TABLE_NAME} ({DATA_SOURCE}, {EXTRACTED_AT}) VALUES (?, ?)",
+                [data_source, current_timestamp_iso8601_str()]
+            )
 
-    with table_connection(DATA_SOURCES_TABLE_NAME) as table:
-        table.insert(data_source=data_source, extracted_at=current_timestamp_iso8601_str())
-        return table.select_all(WHERE=table[DATA_SOURCE] == data_source)[0][0]
+        _data_source_ids[data_source] = cursor.lastrowid
 
+    return _data_source_ids[data_source]
 
-def _load_table(table_name: str) -> List[Dict[str, Any]]:
-    """Load whole table into list of dicts."""
-    with table_connection(table_name) as table:
-        column_names = table.get_columns_names()
-        rows = table.select_all(ORDER_BY=EXTRACTED_AT)
 
-    log.debug(f"Table '{table_name}' has columns:\n  {column_names}\nrows: {rows}")
-    return [dict(zip(column_names, row)) for row in rows]
+atexit.register(close_db_connection)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 from ethecycle.util.list_helper import *
 from ethecycle.util.string_constants import *
@@ -271,20 +271,47 @@ DETERMINATIVE_LABELS = [
 ]
 
 
+# Inverted ETHERSCAN_LABEL_CATEGORIES: {label: (position of its category, category)}. A label listed
+# under more than one category belongs to the first one, same as the order the categories are checked in.
+LABEL_CATEGORIES: Dict[str, Tuple[int, str]] = {}
+
+for _i, (_category, _category_labels) in enumerate(ETHERSCAN_LABEL_CATEGORIES.items()):
+    for _label in _category_labels:
+        LABEL_CATEGORIES.setdefault(_label, (_i, _category))
+
+
 def determine_category(labels: List[str]) -> Optional[str]:
-    for category, category_labels in ETHERSCAN_LABEL_CATEGORIES.items():
-        if has_intersection(labels, category_labels):
-            return category
+    categories = [LABEL_CATEGORIES[label] for label in labels if label in LABEL_CATEGORIES]
+
+    if len(categories) > 0:
+        return min(categories)[1]
+
+    label_set = set(labels)
 
     if any(label.endswith('-hack') or label.endswith('-scam') for label in labels):
         return HACKERS
-    elif len(intersection(DETERMINATIVE_LABELS, labels)) > 0:
-        return intersection(DETERMINATIVE_LABELS, labels)[0]
-    elif 'balancer-vested-shareholders' in labels:
+    elif not label_set.isdisjoint(DETERMINATIVE_LABELS):
+        return next(label for label in DETERMINATIVE_LABELS if label in label_set)
+    elif 'balancer-vested-shareholders' in label_set:
         return 'balancer'
-    elif 'ico-wallets' in labels:
+    elif 'ico-wallets' in label_set:
         return 'ico'
-    elif 'wbtc-merchant' in labels or 'wrapped-bitcoin' in labels:
+    elif 'wbtc-merchant' in label_set or 'wrapped-bitcoin' in label_set:
         return 'wbtc'
     else:
         return None
+
+
+def determine_categories(labels_lists: Iterable[List[str]]) -> List[Optional[str]]:
+    """Batch version of determine_category(), classifying each distinct set of labels only once."""
+    categories: Dict[Tuple[str, ...], Optional[str]] = {}
+
+    def category_for(labels: List[str]) -> Optional[str]:
+        key = tuple(labels)
+
+        if key not in categories:
+            categories[key] = determine_category(labels)
+
+        return categories[key]
+
+    return [category_for(labels) for labels in labels_lists]
@@ -2,8 +2,9 @@
 Offers methods that map from a wallet name/category to organizations, e.g. groups
 Alameda and FTX into one org 'Alameda/FTX'.
 """
+import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from ethecycle.util.string_constants import *
 
@@ -27,7 +28,51 @@ class NameToOrg:
 
     @classmethod
     def get_org_for_name(cls, name: str) -> Optional[str]:
-        return next((matcher.organization for matcher in SUBSTRINGS_TO_ORGS if matcher.is_match(name)), None)
+        return ORG_CLASSIFIER.organization(name)
+
+    @classmethod
+    def get_orgs_for_names(cls, names: Iterable[str]) -> List[Optional[str]]:
+        return ORG_CLASSIFIER.organizations(names)
+
+
+class OrgClassifier:
+    """
+    All the matchers' substrings compiled into two regexes (one run against the name, one against the
+    lowercased name) that reject the vast majority of names, which match no org at all, in one C level
+    pass. Names that do hit are checked against the matchers in order so the first match still wins.
+    """
+    def __init__(self, matchers: List[NameToOrg]) -> None:
+        self.matchers = matchers
+        self.case_sensitive_regex = _substrings_regex([m.substring for m in matchers if m.case_sensitive])
+        case_insensitive_substrings = [m.substring.lower() for m in matchers if not m.case_sensitive]
+        self.case_insensitive_regex = _substrings_regex(case_insensitive_substrings)
+
+    def organization(self, name: str) -> Optional[str]:
+        if not self._might_match(name):
+            return None
+
+        return next((matcher.organization for matcher in self.matchers if matcher.is_match(name)), None)
+
+    def organizations(self, names: Iterable[str]) -> List[Optional[str]]:
+        """Batch version of organization(). Wallets often share names so each distinct name is classified once."""
+        orgs: Dict[str, Optional[str]] = {}
+        return [orgs[name] if name in orgs else orgs.setdefault(name, self.organization(name)) for name in names]
+
+    def _might_match(self, name: str) -> bool:
+        if self.case_sensitive_regex and self.case_sensitive_regex.search(name):
+            return True
+
+        return bool(self.case_insensitive_regex and self.case_insensitive_regex.search(name.lower()))
+
+
+def _substrings_regex(substrings: List[str]) -> Optional[re.Pattern]:
+    """Regex matching any of 'substrings' (None if there aren't any; an empty alternation matches everything)."""
+    if len(substrings) == 0:
+        return None
+
+    # Longest first isn't needed for a yes/no search but keeps the alternation deterministic
+    return re.compile('|'.join(re.escape(s) for s in sorted(set(substrings), key=lambda s: (-len(s), s))))
+
 
 # If the key is a substring of the wallet name the org will be the value.
 SUBSTRINGS_TO_ORGS = [
@@ -40,3 +85,5 @@ SUBSTRINGS_TO_ORGS = [
         excluded=['@DakotaLameda', '@TanjaLameda', 'BoycottFTX', 'Binance Wallet for FTX Token ($FTT)', '@ftxjqbhmgv5707']
     )
 ]
+
+ORG_CLASSIFIER = OrgClassifier(SUBSTRINGS_TO_ORGS)
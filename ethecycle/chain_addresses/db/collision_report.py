@@ -0,0 +1,60 @@
+"""
+Summary of the rows insert_addresses() didn't write because they collided with a row already written
+for the same (data_source_id, blockchain, address) or violated a constraint.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from rich.table import Table
+
+from ethecycle.config import Config
+from ethecycle.util.logging import console, print_dim
+from ethecycle.util.string_constants import ADDRESS
+
+# (the row that wasn't written, the row that was already there), each as {column: value}
+CollisionSample = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+@dataclass
+class CollisionReport:
+    table_name: str
+    data_source: str
+    rows: int
+    inserted_rows: int
+    identical_rows: int = 0
+    mismatched_rows: int = 0
+    column_mismatch_counts: Counter = field(default_factory=Counter)
+    samples: List[CollisionSample] = field(default_factory=list)
+
+    @property
+    def collisions(self) -> int:
+        return self.identical_rows + self.mismatched_rows
+
+    @property
+    def failed_rows(self) -> int:
+        """Rows that weren't written for some other reason (e.g. a NULL in a NOT NULL column)."""
+        return self.rows - self.inserted_rows - self.collisions
+
+    def print(self) -> None:
+        """One summary line plus (if any rows differed) per column mismatch counts and sample rows."""
+        msg = f"Finished writing {self.inserted_rows} rows to '{self.table_name}' ({self.collisions} collisions: "
+        msg += f"{self.mismatched_rows} mismatched, {self.identical_rows} identical; {self.failed_rows} failed)."
+        print_dim(msg)
+
+        if self.mismatched_rows == 0 or Config.suppress_chain_address_db_collision_warnings:
+            return
+
+        title = f"'{self.data_source}' collisions (kept the first row written for each address)"
+        table = Table('Column', 'Mismatches', 'Sample Address', 'Kept', 'Discarded', title=title)
+
+        for column, count in self.column_mismatch_counts.most_common():
+            sample = next((s for s in self.samples if s[0][column] != s[1][column]), None)
+
+            if sample is None:
+                table.add_row(column, str(count), '', '', '')
+            else:
+                discarded, kept = sample
+                table.add_row(column, str(count), kept[ADDRESS], str(kept[column]), str(discarded[column]))
+
+        console.print(table)
@@ -0,0 +1,75 @@
+"""
+Connections to the chain addresses DB. Everything that goes through get_db_connection() in address_db.py
+shares one long lived read/write connection per process, which puts the DB in WAL mode. Loaders that
+only need to read whole tables open short lived read only connections instead, which skip locking
+altogether when nothing has the DB open.
+"""
+import sqlite3
+from contextlib import contextmanager
+from os import path
+from typing import Iterator
+from urllib.parse import quote
+
+from ethecycle.chain_addresses.db import CHAIN_ADDRESSES_DB_PATH
+from ethecycle.util.logging import log
+from ethecycle.util.number_helper import MEGABYTE
+
+# The whole DB is well under this so reads come straight out of the OS page cache
+MMAP_SIZE = 256 * MEGABYTE
+WAL_SUFFIX = '-wal'
+SHM_SUFFIX = '-shm'
+# Header bytes 18 and 19 (file format write / read versions) are 2 for WAL mode, 1 for a rollback journal
+DB_HEADER_SIZE = 100
+WAL_HEADER_OFFSETS = (18, 19)
+
+
+def configure_connection(connection: sqlite3.Connection) -> None:
+    connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+
+def enable_wal(connection: sqlite3.Connection) -> None:
+    """
+    Switch a writable connection's DB to write ahead logging so readers don't block (or get blocked
+    by) the writer. The journal mode is stored in the DB file so this only does anything the first time.
+    """
+    connection.execute('PRAGMA journal_mode = WAL')
+
+
+@contextmanager
+def read_only_connection(db_path: str = CHAIN_ADDRESSES_DB_PATH) -> Iterator[sqlite3.Connection]:
+    """Yield a read only connection (see read_only_uri())."""
+    uri = read_only_uri(db_path)
+    log.debug(f"Opening read only connection '{uri}'...")
+    connection = sqlite3.connect(uri, uri=True)
+
+    try:
+        configure_connection(connection)
+        yield connection
+    finally:
+        connection.close()
+
+
+def read_only_uri(db_path: str) -> str:
+    """
+    'mode=ro' URI for 'db_path'. 'immutable=1' (which skips locking and change detection) is only added
+    if the DB is in WAL mode and has neither a -wal nor a -shm file next to it, which means no connection
+    has it open: the last connection to close checkpoints the WAL and deletes both. A DB still using a
+    rollback journal gives no such sign that a writer is working on it so it's never opened as immutable.
+    """
+    uri = f"file:{quote(str(db_path))}?mode=ro"
+
+    if _is_wal_db(db_path) and not any(path.exists(f"{db_path}{suffix}") for suffix in [WAL_SUFFIX, SHM_SUFFIX]):
+        uri += '&immutable=1'
+
+    return uri
+
+
+def _is_wal_db(db_path: str) -> bool:
+    """True if the file format version bytes in the DB header say it's in WAL mode."""
+    try:
+        with open(db_path, 'rb') as db_file:
+            header = db_file.read(DB_HEADER_SIZE)
+    except OSError:
+        return False
+
+    return len(header) == DB_HEADER_SIZE and header[WAL_HEADER_OFFSETS[0]] == header[WAL_HEADER_OFFSETS[1]] == 2
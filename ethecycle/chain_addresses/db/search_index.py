@@ -0,0 +1,136 @@
+"""
+FTS5 full text index over the names, organizations and categories of wallets and tokens (plus token
+symbols) so name searches like 'binance' or 'alameda' don't have to scan the tables with LIKE '%...%'.
+insert_addresses() keeps it in sync one data_source at a time.
+"""
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ethecycle.chain_addresses.db.connections import read_only_connection
+from ethecycle.chain_addresses.db.table_definitions import DATA_SOURCE_ID, TOKENS_TABLE_NAME, WALLETS_TABLE_NAME
+from ethecycle.util.logging import console, log
+from ethecycle.util.string_constants import ADDRESS, BLOCKCHAIN, CATEGORY, NAME, ORGANIZATION, SYMBOL
+
+SEARCH_TABLE_NAME = 'address_search'
+TABLE_NAME = 'table_name'
+SEARCHABLE_TABLES = [WALLETS_TABLE_NAME, TOKENS_TABLE_NAME]
+INDEXED_COLUMNS = [NAME, ORGANIZATION, CATEGORY, SYMBOL]
+UNINDEXED_COLUMNS = [TABLE_NAME, BLOCKCHAIN, ADDRESS, DATA_SOURCE_ID]
+# bm25() weight of a match in each of INDEXED_COLUMNS
+COLUMN_WEIGHTS = [10.0, 5.0, 1.0, 8.0]
+# Extra prefix indexes so short prefix queries ('bin*') don't have to scan the whole term list
+PREFIX_LENGTHS = '2 3 4'
+DEFAULT_SEARCH_LIMIT = 50
+
+
+@dataclass
+class SearchResult:
+    table_name: str
+    blockchain: Optional[str]
+    address: Optional[str]
+    name: Optional[str]
+    organization: Optional[str]
+    category: Optional[str]
+    symbol: Optional[str]
+    rank: float  # bm25() score; lower is a better match
+
+
+def search_addresses(
+        query: str,
+        blockchain: Optional[str] = None,
+        table_name: Optional[str] = None,
+        limit: Optional[int] = DEFAULT_SEARCH_LIMIT,
+        match_any: bool = False
+    ) -> List[SearchResult]:
+    """
+    Find wallets and tokens whose name, organization, category or symbol has words starting with every
+    word in 'query' (or any of them if 'match_any'), best matches first. Addresses labeled by more
+    than one data_source are returned once with their best ranked label.
+    """
+    fts_query = build_fts_query(query.split(), match_any)
+
+    if len(fts_query) == 0:
+        return []
+
+    wheres = [f"{SEARCH_TABLE_NAME} MATCH ?"]
+    params = [fts_query]
+
+    if blockchain is not None:
+        wheres.append(f"{BLOCKCHAIN} = ?")
+        params.append(blockchain.lower())
+
+    if table_name is not None:
+        wheres.append(f"{TABLE_NAME} = ?")
+        params.append(table_name)
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    result_cols = ', '.join([TABLE_NAME, BLOCKCHAIN, ADDRESS] + INDEXED_COLUMNS)
+
+    # bm25() can't be used once the query is flattened into an aggregate so the matches are MATERIALIZED
+    # first. SQLite takes the bare columns in an aggregate query from the row MIN() picked.
+    sql = f"WITH matches AS MATERIALIZED (" \
+          f"SELECT *, bm25({SEARCH_TABLE_NAME}, {weights}) AS score FROM {SEARCH_TABLE_NAME} " \
+          f"WHERE {' AND '.join(wheres)}) " \
+          f"SELECT {result_cols}, MIN(score) FROM matches " \
+          f"GROUP BY {TABLE_NAME}, {BLOCKCHAIN}, {ADDRESS} ORDER BY MIN(score) LIMIT ?"
+
+    params.append(-1 if limit is None else limit)
+    log.debug(f"Search SQL: {sql} (params: {params})")
+
+    with read_only_connection() as connection:
+        return [SearchResult(*row) for row in connection.execute(sql, params)]
+
+
+def build_fts_query(terms: List[str], match_any: bool = False) -> str:
+    """Prefix match each term (quoted so FTS5 syntax chars are literal): ['ftx', 'us'] => '"ftx"* AND "us"*'"""
+    quoted_terms = ['"' + term.replace('"', '""') + '"*' for term in terms if len(term.strip()) > 0]
+    return (' OR ' if match_any else ' AND ').join(quoted_terms)
+
+
+def is_search_index_in_database(connection: sqlite3.Connection) -> bool:
+    sql = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+    return connection.execute(sql, [SEARCH_TABLE_NAME]).fetchone() is not None
+
+
+def create_search_index(connection: sqlite3.Connection) -> None:
+    """Create the FTS5 table and index whatever rows are already in the searchable tables."""
+    console.print(f"Creating full text search table '{SEARCH_TABLE_NAME}'...", style='cyan')
+    columns = INDEXED_COLUMNS + [f"{col} UNINDEXED" for col in UNINDEXED_COLUMNS]
+
+    with connection:
+        connection.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE_NAME} USING fts5({', '.join(columns)}, "
+            f"prefix='{PREFIX_LENGTHS}', tokenize='unicode61 remove_diacritics 2')"
+        )
+
+        for table_name in SEARCHABLE_TABLES:
+            connection.execute(_index_rows_sql(connection, table_name))
+
+
+def drop_search_index(connection: sqlite3.Connection) -> None:
+    console.print(f"Dropping '{SEARCH_TABLE_NAME}'...", style='bright_red')
+
+    with connection:
+        connection.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE_NAME}")
+
+
+def reindex_data_source(connection: sqlite3.Connection, table_name: str, data_source_id: int) -> None:
+    """Replace the index entries for 'table_name' rows from 'data_source_id'. Doesn't commit."""
+    connection.execute(
+        f"DELETE FROM {SEARCH_TABLE_NAME} WHERE {TABLE_NAME} = ? AND {DATA_SOURCE_ID} = ?",
+        [table_name, data_source_id]
+    )
+
+    sql = _index_rows_sql(connection, table_name) + f" WHERE {DATA_SOURCE_ID} = ?"
+    connection.execute(sql, [data_source_id])
+
+
+def _index_rows_sql(connection: sqlite3.Connection, table_name: str) -> str:
+    """INSERT ... SELECT of 'table_name' rows into the index (NULL for INDEXED_COLUMNS the table doesn't have)."""
+    table_columns = [col[1] for col in connection.execute(f"PRAGMA table_info({table_name})")]
+    indexed_values = [col if col in table_columns else 'NULL' for col in INDEXED_COLUMNS]
+    unindexed_values = [f"'{table_name}'", BLOCKCHAIN, ADDRESS, DATA_SOURCE_ID]
+
+    return f"INSERT INTO {SEARCH_TABLE_NAME} ({', '.join(INDEXED_COLUMNS + UNINDEXED_COLUMNS)}) " \
+           f"SELECT {', '.join(indexed_values + unindexed_values)} FROM {table_name}"
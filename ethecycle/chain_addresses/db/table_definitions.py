@@ -18,7 +18,10 @@ WALLETS_TABLE_NAME = pluralize(WALLET)
 TOKENS_TABLE_NAME = pluralize(TOKEN)
 
 DATA_SOURCE_ID = f"{DATA_SOURCE}_id"
+FINGERPRINT = 'fingerprint'
 ADDRESS_UNIQUE_INDEX = [DATA_SOURCE_ID, BLOCKCHAIN, ADDRESS]
+# For looking up an address across all data sources
+ADDRESS_LOOKUP_INDEX = [BLOCKCHAIN, ADDRESS]
 
 
 @dataclass
@@ -28,16 +31,38 @@ class TableDefinition:
     indexes: List[List[str]] = field(default_factory=list)
     unique_indexes: List[List[str]] = field(default_factory=list)
 
-    def create_table(self, db_conn: sx.SQLite3x) -> None:
+    def create_table(self, db_conn: sx.SQLite3x, defer_indexes: bool = False) -> None:
+        """
+        If 'defer_indexes' is True only the unique indexes are created (they are needed to detect
+        collisions during inserts); call create_indexes() after bulk loading to build the rest.
+        """
         console.print(f"Creating table '{self.table_name}' in '{CHAIN_ADDRESSES_DB_PATH}'...", style='cyan')
         db_conn.create_table(self.table_name, self.columns, IF_NOT_EXIST=True)
 
-        for index in self.indexes:
-            self._create_index(db_conn, index)
+        if not defer_indexes:
+            self.create_indexes(db_conn)
 
         for index in self.unique_indexes:
             self._create_index(db_conn, index, True)
 
+    def create_indexes(self, db_conn: sx.SQLite3x) -> None:
+        """Create the non-unique indexes."""
+        for index in self.indexes:
+            self._create_index(db_conn, index)
+
+    def add_missing_columns(self, db_conn: sx.SQLite3x) -> None:
+        """Migrate tables built by older versions. Only works for columns that are nullable or have a default."""
+        existing_columns = db_conn.get_columns_names(self.table_name)
+
+        for column, column_type in self.columns.items():
+            if column in existing_columns:
+                continue
+
+            column_type = ' '.join(column_type) if isinstance(column_type, list) else column_type
+            sql = f"ALTER TABLE {self.table_name} ADD COLUMN {column} {column_type}"
+            console.print(f"Adding column '{column}' to '{self.table_name}': {sql}", style='cyan')
+            db_conn.execute(script=sql)
+
     def drop_table(self, db_conn: sx.SQLite3x) -> None:
         console.print(f"Dropping '{self.table_name}'...", style='bright_red')
         db_conn.drop(TABLE=self.table_name, IF_EXIST=True)
@@ -45,7 +70,7 @@ class TableDefinition:
     def _create_index(self, db_conn: sx.SQLite3x, columns: List[str], is_unique: bool = False) -> None:
         """Add (optionally unique) index on columns to table_name."""
         idx_name = '_'.join(['idx', self.table_name] + columns)
-        sql = f"CREATE {'UNIQUE' if is_unique else ''} INDEX {idx_name} ON {self.table_name}({','.join(columns)})"
+        sql = f"CREATE {'UNIQUE' if is_unique else ''} INDEX IF NOT EXISTS {idx_name} ON {self.table_name}({','.join(columns)})"
         console.print(f"  Index SQL: {sql}", style='dim')
         db_conn.execute(script=sql)
 
@@ -56,7 +81,8 @@ TABLE_DEFINITIONS = [
         {
             'id': [sx.INTEGER, sx.PRIMARY_KEY],
             DATA_SOURCE: [sx.TEXT, sx.NOT_NULL, sx.UNIQUE],
-            EXTRACTED_AT: [sx.DATE, sx.NOT_NULL]
+            EXTRACTED_AT: [sx.DATE, sx.NOT_NULL],
+            FINGERPRINT: sx.TEXT  # git commit, file hash, etc. of the input last imported
         }
     ),
     TableDefinition(
@@ -72,6 +98,7 @@ TABLE_DEFINITIONS = [
             DATA_SOURCE_ID: [sx.INTEGER, sx.NOT_NULL],
             EXTRACTED_AT: [sx.DATE, sx.NOT_NULL]
         },
+        indexes=[ADDRESS_LOOKUP_INDEX],
         unique_indexes=[ADDRESS_UNIQUE_INDEX]
     ),
     TableDefinition(
@@ -95,6 +122,7 @@ TABLE_DEFINITIONS = [
             DATA_SOURCE_ID: [sx.INTEGER, sx.NOT_NULL],
             'extracted_at': [sx.DATE, sx.NOT_NULL]
         },
+        indexes=[ADDRESS_LOOKUP_INDEX],
         unique_indexes=[ADDRESS_UNIQUE_INDEX]
     )
 ]
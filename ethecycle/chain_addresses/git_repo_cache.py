@@ -0,0 +1,65 @@
+"""
+Local checkouts of the git repos some chain address importers read from. Repos are cloned shallow
+(only the latest commit), without blobs until they're checked out and, if sparse_paths are given,
+with only the files matching those patterns checked out. Later syncs fetch the latest commit and
+hard reset to it so the checkout is always a clean copy of the remote's default branch.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from subprocess import CalledProcessError, run
+from typing import List, Optional, Tuple
+
+from ethecycle.util.logging import console, log
+
+MAX_SYNC_THREADS = 4
+ORIGIN = 'origin'
+
+# (clone URL, local repo dir, sparse checkout patterns)
+RepoSpec = Tuple[str, str, Optional[List[str]]]
+
+
+def sync_repo(clone_url: str, repo_dir: str, sparse_paths: Optional[List[str]] = None) -> str:
+    """
+    Clone 'clone_url' into 'repo_dir' if it's not there, otherwise fetch and reset to the latest commit.
+    'sparse_paths' are gitignore style patterns (e.g. 'blockchains/*/assets/*/info.json'). Returns repo_dir.
+    """
+    if path.isdir(path.join(repo_dir, '.git')):
+        console.print(f"Updating '{repo_dir}' from '{clone_url}'...", style='dim')
+        _git(repo_dir, 'remote', 'set-url', ORIGIN, clone_url)
+        _set_sparse_paths(repo_dir, sparse_paths)
+        _git(repo_dir, 'fetch', '--depth', '1', '--filter=blob:none', ORIGIN, 'HEAD')
+        _git(repo_dir, 'reset', '--hard', 'FETCH_HEAD')
+    else:
+        console.print(f"Cloning '{clone_url}' to '{repo_dir}'...", style='dim')
+        _git(None, 'clone', '--depth', '1', '--filter=blob:none', '--no-checkout', clone_url, repo_dir)
+        _set_sparse_paths(repo_dir, sparse_paths)
+        _git(repo_dir, 'reset', '--hard', 'HEAD')
+
+    return repo_dir
+
+
+def sync_repos(repos: List[RepoSpec], max_workers: int = MAX_SYNC_THREADS) -> List[str]:
+    """Sync several repos at once (git does the work in subprocesses so threads are enough)."""
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(sync_repo, *repo) for repo in repos]
+        return [future.result() for future in futures]
+
+
+def _set_sparse_paths(repo_dir: str, sparse_paths: Optional[List[str]]) -> None:
+    """Check out only files matching 'sparse_paths' (or everything if it's empty)."""
+    if sparse_paths:
+        _git(repo_dir, 'sparse-checkout', 'set', '--no-cone', *sparse_paths)
+    else:
+        _git(repo_dir, 'sparse-checkout', 'disable')
+
+
+def _git(repo_dir: Optional[str], *args: str) -> str:
+    cmd = ['git'] + (['-C', repo_dir] if repo_dir else []) + list(args)
+    log.debug(f"Running '{' '.join(cmd)}'...")
+    result = run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        log.error(f"'{' '.join(cmd)}' failed:\n{result.stderr}")
+        raise CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+
+    return result.stdout.strip()
@@ -1,40 +1,82 @@
 """
 Some wallet/token data imports require data to be pulled from GitHub.
 Some of those repos are quite large so rather than just preload them
-all on the docker image, we pull them only on demand.
+all on the docker image, we pull them only on demand (shallow and, where
+the importer only needs some of the files, sparse; see git_repo_cache.py).
 """
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from os import environ, path
 from shutil import rmtree
 from subprocess import check_output
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urljoin
 
+from ethecycle.chain_addresses.git_repo_cache import sync_repo, sync_repos
 from ethecycle.config import Config
-from ethecycle.util.filesystem_helper import SCRIPTS_DIR
+from ethecycle.util.filesystem_helper import CHAIN_ADDRESS_DATA_DIR
 from ethecycle.util.logging import log
 
-GIT_PULL_SCRIPT = SCRIPTS_DIR.joinpath('chain_addresses').joinpath('git_clone_if_missing.sh')
-GITHUB_URL = 'https://github.com/'
+# Can point at some other git server (e.g. file:// URLs of local bare repos)
+GITHUB_URL = environ.get('GITHUB_URL', 'https://github.com/')
 DOT_GIT = '.git'
 
+# Every GithubDataSource created, so they can all be synced at once before the importers run
+GITHUB_DATA_SOURCES: List['GithubDataSource'] = []
+
 
 @dataclass
 class GithubDataSource:
-    """'repo_url' is only user/repo e.g. 'eth-list/token' not 'https://github.com/eth-list/token.git'."""
+    """
+    'repo_url' is only user/repo e.g. 'eth-list/token' not 'https://github.com/eth-list/token.git'.
+    'sparse_paths' are gitignore style patterns of the files the importer needs; None checks out everything.
+    """
     repo_url: str
     folder_name: Optional[str] = None
+    sparse_paths: Optional[List[str]] = None
+    _is_synced: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self):
+        GITHUB_DATA_SOURCES.append(self)
+
+    @property
+    def clone_url(self) -> str:
+        return urljoin(GITHUB_URL, self.repo_url) + DOT_GIT
+
+    @property
+    def local_repo_dir(self) -> str:
+        return path.join(CHAIN_ADDRESS_DATA_DIR, self.folder_name or self.repo_url.split('/')[-1])
+
+    def sync(self) -> None:
+        """Clone the repo or fetch the latest commit if it's already cloned."""
+        sync_repo(self.clone_url, self.local_repo_dir, self.sparse_paths)
+        self._is_synced = True
 
     @contextmanager
     def local_repo_path(self):
-        """Returns path to repo. Pull the data from github if needed."""
-        repo_url = urljoin(GITHUB_URL, self.repo_url) + DOT_GIT
-        cmd = f"{GIT_PULL_SCRIPT} {repo_url} {self.folder_name if self.folder_name else ''}"
-        local_repo_dir = check_output(cmd.split()).decode().rstrip()
-        log.info(f"Pulled '{repo_url}' to local folder '{local_repo_dir}'")
-        yield local_repo_dir
+        """Returns path to repo. Pull the data from github if it hasn't been pulled yet in this process."""
+        if not self._is_synced:
+            self.sync()
+
+        log.info(f"Pulled '{self.clone_url}' to local folder '{self.local_repo_dir}'")
+        yield self.local_repo_dir
 
         # Remove the repo if this is being done during the docker image build.
         if Config.is_docker_image_build:
-            log.info(f"Deleting '{local_repo_dir}'...")
-            rmtree(local_repo_dir)
+            log.info(f"Deleting '{self.local_repo_dir}'...")
+            rmtree(self.local_repo_dir)
+            self._is_synced = False
+
+    @staticmethod
+    def fingerprint(local_repo_dir: str) -> str:
+        """The checked out commit. Used to skip importing repos that haven't changed since the last import."""
+        return check_output(['git', '-C', local_repo_dir, 'rev-parse', 'HEAD']).decode().strip()
+
+    @staticmethod
+    def sync_all(data_sources: Optional[List['GithubDataSource']] = None) -> None:
+        """Clone / fetch several repos (all of them by default) concurrently."""
+        data_sources = GITHUB_DATA_SOURCES if data_sources is None else data_sources
+        sync_repos([(s.clone_url, s.local_repo_dir, s.sparse_paths) for s in data_sources])
+
+        for data_source in data_sources:
+            data_source._is_synced = True
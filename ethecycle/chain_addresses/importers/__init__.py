@@ -11,8 +11,11 @@ TODO: Other possible sources:
     - https://www.bitcoinabuse.com/api/download/forever?api_token={API_TOKEN}
     - Searching for google sheets: 'blockchain addresses site:docs.google.com sheet'
 """
-from ethecycle.chain_addresses.address_db import drop_and_recreate_tables, get_db_connection
-from ethecycle.config import Config
+from typing import Optional
+
+from ethecycle.chain_addresses.address_db import (bulk_load_mode, close_db_connection,
+     create_deferred_indexes, drop_and_recreate_tables)
+from ethecycle.chain_addresses.github_data_source import GithubDataSource
 
 from .coin_market_cap_repo_importer import import_coin_market_cap_repo_addresses
 from .cryptoscamdb_addresses_importer import import_cryptoscamdb_addresses
@@ -24,30 +27,51 @@ from .ftx_major_partners_importer import import_ftx_biggest_trading_partners
 from .google_sheets_importer import import_google_sheets
 from .hand_collated_address_importer import import_hand_collated_addresses
 from .hardcoded_addresses_importer import import_hardcoded_addresses
+from .importer_runner import run_importers
 from .my_ether_wallet_repo_importer import import_my_ether_wallet_addresses
 from .trustwallet_assets_importer import import_trust_wallet_repo
 from .wallets_from_dune_importer import import_wallets_from_dune
 from .w_mcdonald_etherscan_repo_importer import import_w_mcdonald_etherscan_addresses
 
 
-def rebuild_chain_addresses_db():
-    """Drop all tables and rebuild from source data."""
-    Config.skip_load_from_db = True
-    drop_and_recreate_tables()
-    # Import hand collated results first so they have priority
-    import_hand_collated_addresses()
-    import_hardcoded_addresses()
-    import_coin_market_cap_repo_addresses()
-    import_cryptoscamdb_addresses()
-    import_ethereum_contract_crawler_addresses()
-    import_ethereum_lists_addresses()
-    import_etherscan_labels_repo()
-    import_etherscrape_chain_addresses()
-    import_ftx_biggest_trading_partners()
-    import_google_sheets()
-    import_my_ether_wallet_addresses()
-    import_trust_wallet_repo()
-    import_wallets_from_dune()
-    import_w_mcdonald_etherscan_addresses()
-    get_db_connection().disconnect()
-    Config.skip_load_from_db = False
+# Importers are written to the DB in this order. Hand collated results come first so they have priority.
+IMPORTERS = [
+    import_hand_collated_addresses,
+    import_hardcoded_addresses,
+    import_coin_market_cap_repo_addresses,
+    import_cryptoscamdb_addresses,
+    import_ethereum_contract_crawler_addresses,
+    import_ethereum_lists_addresses,
+    import_etherscan_labels_repo,
+    import_etherscrape_chain_addresses,
+    import_ftx_biggest_trading_partners,
+    import_google_sheets,
+    import_my_ether_wallet_addresses,
+    import_trust_wallet_repo,
+    import_wallets_from_dune,
+    import_w_mcdonald_etherscan_addresses,
+]
+
+
+def rebuild_chain_addresses_db(max_workers: Optional[int] = None):
+    """Drop all tables and rebuild from source data, extracting in parallel (see importer_runner.py)."""
+    drop_and_recreate_tables(defer_indexes=True)
+    GithubDataSource.sync_all()
+
+    with bulk_load_mode():
+        run_importers(IMPORTERS, max_workers)
+        create_deferred_indexes()
+
+    # If this is the last connection to the DB closing it checkpoints and deletes the WAL so loaders can
+    # open the DB as immutable (see read_only_uri())
+    close_db_connection()
+
+
+def refresh_chain_addresses_db(max_workers: Optional[int] = None):
+    """
+    Rerun all the importers against the existing DB. Data sources whose fingerprint (git commit, file hash)
+    hasn't changed since they were last imported are skipped; the rest have their row level changes applied.
+    """
+    GithubDataSource.sync_all()
+    run_importers(IMPORTERS, max_workers)
+    close_db_connection()
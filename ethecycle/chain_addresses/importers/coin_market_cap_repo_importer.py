@@ -1,9 +1,8 @@
 """
 Extract token data from https://github.com/tttienthinh/CoinMarketCap.git
 """
-import json
 from os import path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from inflection import underscore
 from rich.pretty import pprint
@@ -12,15 +11,18 @@ from rich.text import Text
 
 from ethecycle.blockchains.ethereum import Ethereum
 from ethecycle.config import Config
-from ethecycle.chain_addresses.address_db import DbRows, insert_addresses
+from ethecycle.chain_addresses.address_db import DbRows, insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import TOKENS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.models.blockchain import guess_chain_info_from_address
 from ethecycle.models.token import Token
-from ethecycle.util.filesystem_helper import files_in_dir
+from ethecycle.util.filesystem_helper import CHAIN_ADDRESS_DATA_DIR, files_in_dir
 from ethecycle.util.logging import console, log, print_address_import
+from ethecycle.util.parallel_file_parser import load_json, parse_files
 from ethecycle.util.string_constants import *
 
-SOURCE_REPO = GithubDataSource('tttienthinh/CoinMarketCap')
+SOURCE_REPO = GithubDataSource('tttienthinh/CoinMarketCap', sparse_paths=['/Download/detail/'])
+PARSED_FILES_CACHE_PATH = path.join(CHAIN_ADDRESS_DATA_DIR, 'coin_market_cap_parsed_files.pickle')
 
 # Strings
 CHAT = 'chat'
@@ -53,6 +55,22 @@ CSV_OUTPUT_COLUMNS = TABLE_COLS + """
     url_telegram
 """.split()
 
+# Rows come back from the parser processes as tuples of these values followed by a dict of any other
+# keys (the url_* columns). Every key here besides the Token fields is in every row.
+ROW_TUPLE_COLS = TABLE_COLS + """
+    decimals
+    url_explorer
+    launched_at
+    coin_market_cap_id
+    listed_on_coin_market_cap_at
+    coin_market_cap_watchers
+    is_hidden
+    is_audited
+    had_an_ico
+""".split()
+
+RowTuple = Tuple[Any, ...]
+
 NON_DISPLAY_KEYS = """
     description
     holders
@@ -72,22 +90,54 @@ def import_coin_market_cap_repo_addresses() -> None:
     print_address_import(SOURCE_REPO.repo_url)
 
     with SOURCE_REPO.local_repo_path() as repo_dir:
-        data_dir = path.join(repo_dir, 'Download', 'detail')
-        tokens = []
+        fingerprint = SOURCE_REPO.fingerprint(repo_dir)
 
-        for json_filename in files_in_dir(data_dir, 'json'):
-            log.debug(f"Processing file {path.basename(json_filename)}...")
+        if is_data_source_unchanged(SOURCE_REPO.repo_url, fingerprint):
+            return
 
-            with open(json_filename, 'r') as json_data:
-                for chain_token in _explode_token_blockchain_rows(json.load(json_data)['data']):
-                    # Skip rows where all core cols are None
-                    if all(chain_token.get(col) is None for col in TABLE_COLS):
-                        continue
+        data_dir = path.join(repo_dir, 'Download', 'detail')
+        json_files = files_in_dir(data_dir, 'json')
+        rows_by_file = parse_files(json_files, _parse_token_file, PARSED_FILES_CACHE_PATH)
 
-                    tokens.append(Token.from_properties(chain_token))
+        tokens = [
+            Token.from_properties(_row_dict(row_tuple))
+            for row_tuples in rows_by_file
+            for row_tuple in row_tuples
+        ]
 
         #_print_debug_table(tokens)
-        insert_addresses(tokens)
+        insert_addresses(tokens, fingerprint, SOURCE_REPO.repo_url, TOKENS_TABLE_NAME)
+
+
+def _parse_token_file(json_filename: str) -> List[RowTuple]:
+    """Runs in the parser processes. Rows where all the core cols are None are skipped."""
+    log.debug(f"Processing file {path.basename(json_filename)}...")
+    rows = _explode_token_blockchain_rows(load_json(json_filename)['data'])
+    return [_row_tuple(row) for row in rows if not all(row.get(col) is None for col in TABLE_COLS)]
+
+
+def _row_tuple(row: Dict[str, Any]) -> RowTuple:
+    """
+    Values of ROW_TUPLE_COLS plus a dict of the rest. data_source is the same for every row so it's
+    dropped and chain_info is swapped for its blockchain string (it may be a class built on the fly
+    that can't be pickled).
+    """
+    row = row.copy()
+    chain_info = row.pop('chain_info', None)
+    del row['data_source']
+
+    if chain_info is not None and row.get(BLOCKCHAIN) is None:
+        row[BLOCKCHAIN] = chain_info.chain_string()
+
+    return tuple(row.pop(col, None) for col in ROW_TUPLE_COLS) + (row,)
+
+
+def _row_dict(row_tuple: RowTuple) -> Dict[str, Any]:
+    """Inverse of _row_tuple()."""
+    row = dict(zip(ROW_TUPLE_COLS, row_tuple))
+    row.update(row_tuple[-1])
+    row['data_source'] = SOURCE_REPO.repo_url
+    return row
 
 
 def _explode_token_blockchain_rows(token_data: Dict[str, Any]) -> DbRows:
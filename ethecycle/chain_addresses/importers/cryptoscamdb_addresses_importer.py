@@ -8,11 +8,12 @@ from typing import List
 from rich.panel import Panel
 from rich.pretty import pprint
 
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.config import Config
-from ethecycle.models.blockchain import guess_chain_info_from_address
+from ethecycle.models.blockchain import guess_chain_infos_from_addresses
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import RAW_DATA_DIR, get_lines
+from ethecycle.util.filesystem_helper import RAW_DATA_DIR, file_fingerprint, get_lines
 from ethecycle.util.logging import console, log, print_address_import
 from ethecycle.util.string_constants import *
 
@@ -23,11 +24,17 @@ CURL_OUTPUT_FILE = str(RAW_DATA_DIR.joinpath('cryptoscamdb.addresses.json.gz'))
 def import_cryptoscamdb_addresses():
     """Import data from ethereum-lists tokens repo."""
     print_address_import(SOURCE_URL)
+    fingerprint = file_fingerprint(CURL_OUTPUT_FILE)
     wallets: List[Wallet] = []
 
-    for address, data in json.loads("\n".join(get_lines(CURL_OUTPUT_FILE)))['result'].items():
+    if is_data_source_unchanged(SOURCE_URL, fingerprint):
+        return
+
+    scams = json.loads("\n".join(get_lines(CURL_OUTPUT_FILE)))['result']
+    chain_infos = guess_chain_infos_from_addresses(scams.keys())
+
+    for (address, data), chain_info in zip(scams.items(), chain_infos):
         name = f"{data[0]['name']}: {data[0]['category']} ({data[0]['subcategory']})"
-        chain_info = guess_chain_info_from_address(address)
 
         if chain_info is None:
             log.warning(f"No chain found for '{address}', skipping...")
@@ -51,4 +58,4 @@ def import_cryptoscamdb_addresses():
             )
         )
 
-    insert_addresses(wallets)
+    insert_addresses(wallets, fingerprint, SOURCE_URL, WALLETS_TABLE_NAME)
@@ -10,10 +10,11 @@ from typing import List
 from rich.text import Text
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.config import Config
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import GZIP_EXTENSION, get_lines
+from ethecycle.util.filesystem_helper import GZIP_EXTENSION, file_fingerprint, get_lines
 from ethecycle.util.logging import console, log
 from ethecycle.util.number_helper import comma_format_str, usd_string
 from ethecycle.util.string_constants import ALAMEDA, ETHEREUM, FTX, ETHEREUM
@@ -37,9 +38,13 @@ class DuneCopyPasteReader:
 
     def extract_wallets(self) -> None:
         """Extract the wallets into chain address DB."""
+        fingerprint = file_fingerprint(self.dune_file)
         wallets: List[Wallet] = []
         current_wallet = None
 
+        if is_data_source_unchanged(self.data_source, fingerprint):
+            return
+
         for line in get_lines(self.dune_file):
             # When we find an address start new current_wallet, append old current_wallet to 'wallets' after setting name
             if Ethereum.is_valid_address(line):
@@ -65,7 +70,7 @@ class DuneCopyPasteReader:
 
             log.debug(line)
 
-        insert_addresses(wallets)
+        insert_addresses(wallets, fingerprint, self.data_source, WALLETS_TABLE_NAME)
 
     def _new_wallet(self, address: str) -> Wallet:
         """New wallet."""
@@ -1,23 +1,31 @@
 """
 Import data from ethereum-lists repo.
 """
-import json
 from os import path
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from ethecycle.blockchains.blockchains import CHAIN_IDS
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import TOKENS_TABLE_NAME, WALLETS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.models.token import Token
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import files_in_dir, subdirs_of_dir
+from ethecycle.util.filesystem_helper import CHAIN_ADDRESS_DATA_DIR, files_in_dir, subdirs_of_dir
 from ethecycle.util.logging import console, log, print_address_import
+from ethecycle.util.parallel_file_parser import load_json, parse_files
 from ethecycle.util.string_constants import *
 
-TOKENS_REPO = GithubDataSource('ethereum-lists/tokens')
-CONTRACTS_REPO = GithubDataSource('ethereum-lists/contracts')
+TOKENS_REPO = GithubDataSource('ethereum-lists/tokens', sparse_paths=['/tokens/'])
+CONTRACTS_REPO = GithubDataSource('ethereum-lists/contracts', sparse_paths=['/contracts/'])
 CONTRACT_JSON_KEYS = set(['project', NAME, 'source', 'features'])
+TOKENS_PARSED_FILES_CACHE_PATH = path.join(CHAIN_ADDRESS_DATA_DIR, 'ethereum_lists_tokens_parsed_files.pickle')
+CONTRACTS_PARSED_FILES_CACHE_PATH = path.join(CHAIN_ADDRESS_DATA_DIR, 'ethereum_lists_contracts_parsed_files.pickle')
+
+# (token_type, address, symbol, name, decimals) from a token JSON file
+TokenRow = Tuple[Optional[str], str, str, str, int]
+# (project, name) from a contract JSON file
+ContractRow = Tuple[Optional[str], Optional[str]]
 
 # Keys are folder names, values are blockchain names.
 DIRS_TO_IMPORT = {
@@ -38,33 +46,41 @@ def _import_ethereum_lists_tokens_addresses() -> None:
     print_address_import(TOKENS_REPO.repo_url)
 
     with TOKENS_REPO.local_repo_path() as repo_dir:
+        fingerprint = TOKENS_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(TOKENS_REPO.repo_url, fingerprint):
+            return
+
         root_data_dir = path.join(repo_dir, 'tokens')
-        tokens: List[Token] = []
+        token_files: List[Tuple[str, str]] = []  # (blockchain, token JSON path)
 
         for subdir, blockchain in DIRS_TO_IMPORT.items():
             log.info(f"    Processing {blockchain}...")
             token_data_dir = path.join(root_data_dir, subdir)
+            token_files.extend((blockchain, token_file) for token_file in files_in_dir(token_data_dir))
+
+        token_rows = parse_files([f for _, f in token_files], _parse_token_file, TOKENS_PARSED_FILES_CACHE_PATH)
+        tokens: List[Token] = []
 
-            for token_info_json_file in files_in_dir(token_data_dir):
-                try:
-                    with open(token_info_json_file, 'r') as json_file:
-                        token_info = json.load(json_file)
+        for (blockchain, _token_file), row in zip(token_files, token_rows):
+            if row is None:
+                continue
 
-                    token = Token(
-                        blockchain=blockchain,
-                        token_type=token_info.get('type'),  # Not always provided
-                        address=token_info[ADDRESS],
-                        symbol=token_info[SYMBOL],
-                        name=token_info[NAME],
-                        decimals=token_info['decimals'],
-                        data_source=TOKENS_REPO.repo_url
-                    )
+            token_type, address, symbol, name, decimals = row
 
-                    tokens.append(token)
-                except KeyError as e:
-                    log.warning(f"Error parsing '{token_info_json_file}': {e}")
+            tokens.append(
+                Token(
+                    blockchain=blockchain,
+                    token_type=token_type,
+                    address=address,
+                    symbol=symbol,
+                    name=name,
+                    decimals=decimals,
+                    data_source=TOKENS_REPO.repo_url
+                )
+            )
 
-        insert_addresses(tokens)
+        insert_addresses(tokens, fingerprint, TOKENS_REPO.repo_url, TOKENS_TABLE_NAME)
 
 
 def _import_contract_addresses() -> None:
@@ -72,8 +88,13 @@ def _import_contract_addresses() -> None:
     print_address_import(CONTRACTS_REPO.repo_url)
 
     with CONTRACTS_REPO.local_repo_path() as repo_dir:
+        fingerprint = CONTRACTS_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(CONTRACTS_REPO.repo_url, fingerprint):
+            return
+
         root_data_dir = path.join(repo_dir, 'contracts')
-        contracts: List[Wallet] = []
+        contract_files: List[Tuple[str, str]] = []  # (blockchain, contract JSON path)
 
         for chain_id_dir in subdirs_of_dir(root_data_dir):
             dir_basename = Path(chain_id_dir).stem
@@ -84,31 +105,55 @@ def _import_contract_addresses() -> None:
                 continue
 
             log.info(f"  Loading contracts for '{blockchain}' from '{chain_id_dir}'...")
-
-            for contract_json_file in files_in_dir(chain_id_dir):
-                contract_file_basename = path.basename(contract_json_file)
-                log.debug(f"    Processing {contract_file_basename}")
-
-                try:
-                    with open(contract_json_file, 'r') as json_file:
-                        contract_info = json.load(json_file)
-                        log.debug(f"    JSON: {contract_info}")
-                        keys = set(contract_info.keys())
-
-                    if not keys.issubset(CONTRACT_JSON_KEYS):
-                        other_keys = keys.difference(CONTRACT_JSON_KEYS)
-                        console.print(f"{contract_file_basename} nonstandard keys: {list(other_keys)}", style='bright_yellow')
-
-                    contract = Wallet(
-                        address=Path(contract_json_file).stem,
-                        blockchain=blockchain,
-                        name=f"{contract_info.get('project')}: {contract_info.get(NAME)}",
-                        category=CONTRACT,
-                        data_source=CONTRACTS_REPO.repo_url
-                    )
-
-                    contracts.append(contract)
-                except KeyError as e:
-                    log.warning(f"Error parsing '{contract_json_file}': {e}")
-
-        insert_addresses(contracts)
+            contract_files.extend((blockchain, contract_file) for contract_file in files_in_dir(chain_id_dir))
+
+        contract_rows = parse_files(
+            [f for _, f in contract_files],
+            _parse_contract_file,
+            CONTRACTS_PARSED_FILES_CACHE_PATH
+        )
+
+        contracts = [
+            Wallet(
+                address=Path(contract_json_file).stem,
+                blockchain=blockchain,
+                name=f"{project}: {name}",
+                category=CONTRACT,
+                data_source=CONTRACTS_REPO.repo_url
+            )
+            for (blockchain, contract_json_file), (project, name) in zip(contract_files, contract_rows)
+        ]
+
+        insert_addresses(contracts, fingerprint, CONTRACTS_REPO.repo_url, WALLETS_TABLE_NAME)
+
+
+def _parse_token_file(token_info_json_file: str) -> Optional[TokenRow]:
+    """Runs in the parser processes. Returns None if a required key is missing."""
+    try:
+        token_info = load_json(token_info_json_file)
+
+        return (
+            token_info.get('type'),  # Not always provided
+            token_info[ADDRESS],
+            token_info[SYMBOL],
+            token_info[NAME],
+            token_info['decimals'],
+        )
+    except KeyError as e:
+        log.warning(f"Error parsing '{token_info_json_file}': {e}")
+        return None
+
+
+def _parse_contract_file(contract_json_file: str) -> ContractRow:
+    """Runs in the parser processes."""
+    contract_file_basename = path.basename(contract_json_file)
+    log.debug(f"    Processing {contract_file_basename}")
+    contract_info = load_json(contract_json_file)
+    log.debug(f"    JSON: {contract_info}")
+    keys = set(contract_info.keys())
+
+    if not keys.issubset(CONTRACT_JSON_KEYS):
+        other_keys = keys.difference(CONTRACT_JSON_KEYS)
+        console.print(f"{contract_file_basename} nonstandard keys: {list(other_keys)}", style='bright_yellow')
+
+    return contract_info.get('project'), contract_info.get(NAME)
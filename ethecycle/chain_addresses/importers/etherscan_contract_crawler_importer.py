@@ -8,14 +8,15 @@ from typing import List, Type
 from ethecycle.blockchains.binance_smart_chain import BinanceSmartChain
 from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import (insert_addresses)
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.util.filesystem_helper import files_in_dir
 from ethecycle.util.logging import console, log, print_address_import
 from ethecycle.util.string_constants import *
 from ethecycle.models.wallet import Wallet
 
-SOURCE_REPO = GithubDataSource('cl2089/etherscan-contract-crawler')
+SOURCE_REPO = GithubDataSource('cl2089/etherscan-contract-crawler', sparse_paths=['/contracts/', '/bsc_contracts/'])
 
 
 def import_ethereum_contract_crawler_addresses():
@@ -23,10 +24,15 @@ def import_ethereum_contract_crawler_addresses():
     wallets: List[Wallet] = []
 
     with SOURCE_REPO.local_repo_path() as root_dir:
+        fingerprint = SOURCE_REPO.fingerprint(root_dir)
+
+        if is_data_source_unchanged(SOURCE_REPO.repo_url, fingerprint):
+            return
+
         wallets.extend(_import_contracts(path.join(root_dir, 'contracts'), Ethereum))
         wallets.extend(_import_contracts(path.join(root_dir, 'bsc_contracts'), BinanceSmartChain))
 
-    insert_addresses(wallets)
+    insert_addresses(wallets, fingerprint, SOURCE_REPO.repo_url, WALLETS_TABLE_NAME)
 
 
 def _import_contracts(contracts_dir: str, chain_info: Type[ChainInfo]) -> List[Wallet]:
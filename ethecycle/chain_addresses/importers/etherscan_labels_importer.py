@@ -7,8 +7,9 @@ from rich.panel import Panel
 from rich.pretty import pprint
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
-from ethecycle.chain_addresses.config.etherscan import determine_category
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
+from ethecycle.chain_addresses.config.etherscan import determine_categories
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.config import Config
 from ethecycle.models.wallet import Wallet
@@ -16,7 +17,7 @@ from ethecycle.util.dict_helper import sort_dict
 from ethecycle.util.logging import console, print_address_import
 from ethecycle.util.string_constants import *
 
-SOURCE_REPO = GithubDataSource('brianleect/etherscan-labels')
+SOURCE_REPO = GithubDataSource('brianleect/etherscan-labels', sparse_paths=['/combined/combinedLabels.json'])
 
 
 def import_etherscan_labels_repo():
@@ -24,31 +25,38 @@ def import_etherscan_labels_repo():
     print_address_import(SOURCE_REPO.repo_url)
 
     with SOURCE_REPO.local_repo_path() as repo_dir:
+        fingerprint = SOURCE_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(SOURCE_REPO.repo_url, fingerprint):
+            return
+
         addresses_file = path.join(repo_dir, 'combined', 'combinedLabels.json')
         wallets: List[Wallet] = []
         label_counts = defaultdict(lambda: 0)
         uncategorized_label_counts = defaultdict(lambda: 0)
 
         with open(addresses_file, newline='') as json_file:
-            for address, data in json.load(json_file).items():
-                labels = data['labels']
-                labels_str = ', '.join(sorted(labels))
-                label_counts[labels_str] += 1
-                category = determine_category(labels)
-
-                if category is None:
-                    #console.print(f"{address}: {data['name']}\n    {labels}\n")
-                    uncategorized_label_counts[labels_str] += 1
-
-                wallet = Wallet(
-                    address=address,
-                    chain_info=Ethereum,
-                    name=data[NAME],
-                    category=category,
-                    data_source=SOURCE_REPO.repo_url
-                )
-
-                wallets.append(wallet)
+            labeled_addresses = json.load(json_file)
+
+        categories = determine_categories(data['labels'] for data in labeled_addresses.values())
+
+        for (address, data), category in zip(labeled_addresses.items(), categories):
+            labels_str = ', '.join(sorted(data['labels']))
+            label_counts[labels_str] += 1
+
+            if category is None:
+                #console.print(f"{address}: {data['name']}\n    {data['labels']}\n")
+                uncategorized_label_counts[labels_str] += 1
+
+            wallet = Wallet(
+                address=address,
+                chain_info=Ethereum,
+                name=data[NAME],
+                category=category,
+                data_source=SOURCE_REPO.repo_url
+            )
+
+            wallets.append(wallet)
 
         if Config.debug:
             console.print(Panel('UNCATEGORIZED'))
@@ -56,4 +64,4 @@ def import_etherscan_labels_repo():
             console.print(Panel('CATEGORIZED'))
             pprint(sort_dict(label_counts))
 
-        insert_addresses(wallets)
+        insert_addresses(wallets, fingerprint, SOURCE_REPO.repo_url, WALLETS_TABLE_NAME)
@@ -6,8 +6,9 @@ from typing import Dict
 from inflection import titleize
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
-from ethecycle.util.filesystem_helper import RAW_DATA_DIR, get_lines
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
+from ethecycle.util.filesystem_helper import RAW_DATA_DIR, file_fingerprint, get_lines
 from ethecycle.util.logging import log, print_address_import
 from ethecycle.models.wallet import Wallet
 
@@ -20,8 +21,12 @@ ETHERSCAN_DONATE_LABEL = 'Etherscan: Donate'
 def import_etherscrape_chain_addresses() -> None:
     """Load 3rd party data (apparently pulled from etherscan)."""
     print_address_import('etherscrape')
+    fingerprint = file_fingerprint(SCRAPE_DATA_FILE)
     wallet_addresses: Dict[str, Wallet] = {}
 
+    if is_data_source_unchanged(DATA_SOURCE, fingerprint):
+        return
+
     for line in get_lines(SCRAPE_DATA_FILE):
         line_label, addresses = line.split(':')
         log.debug(f"Getting addresses for {line_label}...")
@@ -45,4 +50,4 @@ def import_etherscrape_chain_addresses() -> None:
                 log.debug(f"  Processing address {address}...")
                 wallet_addresses[address] = Wallet(address=address, chain_info=Ethereum, name=name, data_source=DATA_SOURCE)
 
-    insert_addresses(list(wallet_addresses.values()))
+    insert_addresses(list(wallet_addresses.values()), fingerprint, DATA_SOURCE, WALLETS_TABLE_NAME)
@@ -2,27 +2,27 @@
 Read public sheets: https://medium.com/geekculture/2-easy-ways-to-read-google-sheets-data-using-python-9e7ef366c775#e4bb
 """
 import re
-from os import path
+from os import environ, path
 
-import numpy as np
 import pandas as pd
 from rich.panel import Panel
 from rich.pretty import pprint
-from typing import List, Optional, Type
+from typing import List, Optional, Tuple, Type, Union
 from urllib.parse import urlencode
 
 from ethecycle.blockchains.bitcoin import Bitcoin
 from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
+from ethecycle.chain_addresses.remote_snapshot import RemoteSnapshot, refresh_snapshots
 from ethecycle.config import Config
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import RAW_DATA_DIR
+from ethecycle.util.filesystem_helper import RAW_DATA_DIR, file_fingerprint
 from ethecycle.util.logging import console, log, print_indented
 from ethecycle.util.number_helper import pct, pct_str
 from ethecycle.util.string_constants import (BITCOINTALK, FACEBOOK, HTTPS, INDIVIDUAL,
      SOCIAL_MEDIA_ORGS, SOCIAL_MEDIA_URLS, social_media_url)
-from ethecycle.util.string_helper import has_as_substring
 
 ETHEREUM_SHEETS = {
     '1I30YwfcqO7r7hP63hKdJM1BaaqAWiFfz_biIk2fyouM': [
@@ -168,11 +168,11 @@ SHEETS_ARGS = {'tqx': 'out:csv'}
 CHARS_THAT_NEED_QUOTE = [c for c in '):;"|-_*&']
 ETHEREUM_ADDRESS_REGEX = re.compile('(eth(ereum)?|erc-?20)\\s+(wallet|address)', re.IGNORECASE)
 WALLET_ADDRESS_REGEX = re.compile('^wallet\\s+.*\\s*address', re.IGNORECASE)
+SOCIAL_MEDIA_URL_REGEX = re.compile('|'.join(re.escape(url) for url in SOCIAL_MEDIA_URLS))
 SHEETS_URL = 'https://docs.google.com/spreadsheets/d/'
-VALID_ADDRESS = 'valid_address'
+# Where sheets are actually fetched from (can point at a local stand-in). Data sources always use SHEETS_URL.
+SHEETS_FETCH_URL = environ.get('GOOGLE_SHEETS_URL', SHEETS_URL)
 
-# Fix the embedded timestamp so that every write of a gzipped CSV doesn't change the binary
-GZIP_COMPRESSION_ARGS = {'method': 'gzip', 'mtime': 1667767780.0}
 GZIPPED_CSV_DIR = str(RAW_DATA_DIR.joinpath('google_sheets'))
 
 # Min % of col matching a URL or @something style string
@@ -183,31 +183,67 @@ MAX_MISMATCHES = 10
 
 
 def import_google_sheets() -> None:
-    for sheet_id, worksheets in ETHEREUM_SHEETS.items():
-        for worksheet_name in worksheets:
-            worksheet = GoogleWorksheet(sheet_id, worksheet_name, Ethereum)
-            insert_addresses(worksheet.extract_wallets())
-            console.line(2)
+    """Refresh any stale local CSV snapshots of the worksheets concurrently, then import from the snapshots."""
+    worksheets: List[Tuple[str, Union[str, int], Type[ChainInfo]]] = [
+        (sheet_id, worksheet_name, chain_info)
+        for chain_info, sheets in [(Ethereum, ETHEREUM_SHEETS), (Bitcoin, BITCOIN_SHEETS)]
+        for sheet_id, worksheet_names in sheets.items()
+        for worksheet_name in worksheet_names
+    ]
 
-    for sheet_id, worksheets in BITCOIN_SHEETS.items():
-        for worksheet_name in worksheets:
-            worksheet = GoogleWorksheet(sheet_id, worksheet_name, Bitcoin)
-            insert_addresses(worksheet.extract_wallets())
-            console.line(2)
+    snapshots = [worksheet_snapshot(sheet_id, worksheet_name) for sheet_id, worksheet_name, _ in worksheets]
+    refresh_snapshots(snapshots)
+
+    for (sheet_id, worksheet_name, chain_info), snapshot in zip(worksheets, snapshots):
+        if snapshot.exists():
+            _import_worksheet(sheet_id, worksheet_name, chain_info)
+
+
+def worksheet_url(sheet_id: str, worksheet_name: Union[str, int], base_url: str = SHEETS_URL) -> str:
+    """CSV export URL. 'worksheet_name' can also be the integer 'gid' of a worksheet."""
+    sheet_url = f"{base_url}{sheet_id}"
+
+    if isinstance(worksheet_name, int):
+        return f"{sheet_url}/export?format=csv&gid={worksheet_name}"
+    else:
+        args = SHEETS_ARGS.copy()
+        args['sheet'] = worksheet_name
+        return f'{sheet_url}/gviz/tq?{urlencode(args).replace("/", "%%2F")}'
+
+
+def worksheet_snapshot(sheet_id: str, worksheet_name: Union[str, int]) -> RemoteSnapshot:
+    file_basename = f"{sheet_id}___{worksheet_name}.csv.gz".replace('/', '_slash_')
+    snapshot_path = path.join(GZIPPED_CSV_DIR, file_basename)
+    return RemoteSnapshot(worksheet_url(sheet_id, worksheet_name, SHEETS_FETCH_URL), snapshot_path)
+
+
+def _import_worksheet(sheet_id: str, worksheet_name: Union[str, int], chain_info: Type[ChainInfo]) -> None:
+    """
+    Fingerprint is the hash of the gzipped CSV snapshot (written with a fixed mtime so it's deterministic)
+    so unchanged worksheets aren't even parsed.
+    """
+    fingerprint = file_fingerprint(worksheet_snapshot(sheet_id, worksheet_name).snapshot_path)
+
+    if not is_data_source_unchanged(worksheet_url(sheet_id, worksheet_name), fingerprint):
+        wallets = GoogleWorksheet(sheet_id, worksheet_name, chain_info).extract_wallets()
+        insert_addresses(wallets, fingerprint, worksheet_url(sheet_id, worksheet_name), WALLETS_TABLE_NAME)
+
+    console.line(2)
 
 
 class GoogleWorksheet:
-    def __init__(self, sheet_id: str, worksheet_name: str, chain_info: Type[ChainInfo]) -> None:
+    def __init__(self, sheet_id: str, worksheet_name: Union[str, int], chain_info: Type[ChainInfo]) -> None:
         self.sheet_id = sheet_id
         self.worksheet_name = worksheet_name
         self.chain_info = chain_info
-        self._build_url()
-        self.df = pd.read_csv(self.url)
+        self.url = worksheet_url(sheet_id, worksheet_name)
+        self.csv_path = worksheet_snapshot(sheet_id, worksheet_name).snapshot_path
+        console.print(f"Reading sheet '{self.worksheet_name}' from '{self.csv_path}'...")
+        self.df = pd.read_csv(self.csv_path)
         self.df = self.df[[c for c in self.df if not c.startswith("Unnamed")]]
         self.df_length = len(self.df)
         self.column_names = list(self.df.columns.values)
         self.email_col = None
-        self._write_df_to_csv()
 
     def extract_wallets(self) -> List[Wallet]:
         self.address_col_label = self._guess_address_column()
@@ -220,17 +256,25 @@ class GoogleWorksheet:
 
         # Determine which social media column is suitable for use as the wallet label
         self.social_media_col_label = self._guess_social_media_column()
-        self.df[self.social_media_col_label].str.strip()
+        labels = self.df[self.social_media_col_label].str.strip()
 
-        # Strip whitespace from remaining rows' addresses and check filter invalid rows
-        self.df[self.address_col_label].str.strip()
-        is_valid_address = lambda r: self.chain_info.is_valid_address(r[self.address_col_label])
-        self.df[VALID_ADDRESS] = self.df.apply(is_valid_address, axis=1)
-        valid_address_df = self.df[self.df[VALID_ADDRESS] == True]
-        self.invalid_address_count = non_null_address_count - len(valid_address_df)
+        # Strip whitespace from remaining rows' addresses and filter invalid rows
+        addresses = self.df[self.address_col_label].str.strip()
+        is_valid_address = self.chain_info.valid_address_mask(addresses)
+        self.invalid_address_count = non_null_address_count - int(is_valid_address.sum())
 
         # Build Wallet() objects for valid rows
-        wallets = [self._build_wallet(row) for (_row_number, row) in valid_address_df.iterrows()]
+        wallets = [
+            Wallet(
+                address=address,
+                chain_info=self.chain_info,
+                category=INDIVIDUAL,
+                data_source=self.url,
+                name=name
+            )
+            for address, name in zip(addresses[is_valid_address], self._wallet_names(labels[is_valid_address]))
+        ]
+
         self._print_extraction_stats()
 
         if Config.debug:
@@ -239,41 +283,14 @@ class GoogleWorksheet:
 
         return wallets
 
-    def _build_wallet(self, df_row: pd.Series) -> Wallet:
-        row = df_row.to_dict()
-        address = row[self.address_col_label]
-        wallet_name = row[self.social_media_col_label]
-
-        if isinstance(wallet_name, float) and np.isnan(wallet_name):
-            name = '?'
-        else:
-            name = row[self.social_media_col_label].removeprefix(HTTPS).removeprefix('www.')
-
-            if has_as_substring(name, SOCIAL_MEDIA_URLS) and '?' in name:
-                name = name.split('?')[0].strip()
-
-        wallet = Wallet(
-            address=address,
-            chain_info=Ethereum,
-            category=INDIVIDUAL,
-            data_source=self.url,
-            name=name
-        )
-
-        return wallet
-
-    def _build_url(self):
-        """Build google sheets URL."""
-        base_url = f"{SHEETS_URL}{self.sheet_id}"
-
-        if isinstance(self.worksheet_name, int):
-            self.url = f"{base_url}/export?format=csv&gid={self.worksheet_name}"
-        else:
-            args = SHEETS_ARGS.copy()
-            args['sheet'] = self.worksheet_name
-            self.url = f'{base_url}/gviz/tq?{urlencode(args).replace("/", "%%2F")}'
-
-        console.print(f"Reading sheet '{self.worksheet_name}' from '{self.url}'...")
+    @staticmethod
+    def _wallet_names(labels: pd.Series) -> pd.Series:
+        """Social media URLs minus the 'https://www.' and any query string; '?' where there's no label."""
+        names = labels.str.removeprefix(HTTPS).str.removeprefix('www.')
+        is_url = names.str.contains(SOCIAL_MEDIA_URL_REGEX, na=False)
+        has_query_string = is_url & names.str.contains('?', regex=False, na=False)
+        names = names.mask(has_query_string, names.str.split('?', n=1).str[0].str.strip())
+        return names.fillna('?')
 
     def _guess_address_column(self) -> str:
         """Guess which col has the addresses."""
@@ -299,11 +316,7 @@ class GoogleWorksheet:
             & ~(wallet_cols_df[wallet_cols[0]].isna() & wallet_cols_df[wallet_cols[0]].isna())
         ]
 
-        def count_valid_rows(col):
-            is_valid_address = lambda row: self.chain_info.is_valid_address(row[col])
-            return len(self.df[self.df.apply(is_valid_address, axis=1)])
-
-        valid_row_counts = {col: count_valid_rows(col) for col in wallet_cols}
+        valid_row_counts = {col: int(self.chain_info.valid_address_mask(self.df[col]).sum()) for col in wallet_cols}
         console.print(f"Valid Row Counts: {valid_row_counts}")
 
         # Hack to handle cases where one col is an actual address column and the other is not an address col.
@@ -328,7 +341,7 @@ class GoogleWorksheet:
         if self.sheet_id in DEFAULT_LABELS:
             label = DEFAULT_LABELS[self.sheet_id]
             print_indented(f"Applying default label '{label}'...")
-            self.df[FACEBOOK] = self.df.apply(lambda row: f"{label} {row.name}", axis=1)
+            self.df[FACEBOOK] = f"{label} " + self.df.index.astype(str)
             self.column_names = self.df.columns.values
             return FACEBOOK
 
@@ -393,16 +406,6 @@ class GoogleWorksheet:
             print_indented(f"IGNORING {msg}", style='color(155) dim', indent_level=2)
             return False
 
-    def _write_df_to_csv(self) -> None:
-        file_basename = f"{self.sheet_id}___{self.worksheet_name}.csv.gz".replace('/', '_slash_')
-        file_path = path.join(GZIPPED_CSV_DIR, file_basename)
-        print_indented(f"Writing sheet to CSV: '{file_path}'", style='dim')
-
-        if False and path.isfile(file_path):
-            console.print(f"File already exists: '{file_path}', skipping...")
-        else:
-            self.df.to_csv(file_path, index=False, compression=GZIP_COMPRESSION_ARGS)
-
     def _print_extraction_stats(self) -> None:
         invalid_row_msgs = [
             f"{self.invalid_address_count} invalid",
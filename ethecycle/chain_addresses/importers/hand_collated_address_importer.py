@@ -2,9 +2,10 @@ import csv
 from os import path
 from typing import List
 
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import RAW_DATA_DIR
+from ethecycle.util.filesystem_helper import RAW_DATA_DIR, file_fingerprint
 from ethecycle.util.string_constants import DATA_SOURCE
 
 HAND_COLLATED_ADDRESS_CSV = str(RAW_DATA_DIR.joinpath('hand_collated.csv'))
@@ -12,6 +13,11 @@ HAND_COLLATED_DATA_SOURCE = path.basename(HAND_COLLATED_ADDRESS_CSV)
 
 
 def import_hand_collated_addresses():
+    fingerprint = file_fingerprint(HAND_COLLATED_ADDRESS_CSV)
+
+    if is_data_source_unchanged(HAND_COLLATED_DATA_SOURCE, fingerprint):
+        return
+
     with open(HAND_COLLATED_ADDRESS_CSV, newline='') as csvfile:
         wallets: List[Wallet] = []
 
@@ -20,4 +26,4 @@ def import_hand_collated_addresses():
             del row['comment']
             wallets.append(Wallet(**row))
 
-    insert_addresses(wallets)
+    insert_addresses(wallets, fingerprint, HAND_COLLATED_DATA_SOURCE, WALLETS_TABLE_NAME)
@@ -0,0 +1,101 @@
+"""
+Run chain address importers in parallel. The slow part of most importers is pulling and parsing
+the source data (cloning repos, reading thousands of JSON files, etc.) so that happens in a pool
+of worker processes, with each importer's insert_addresses() calls captured by deferred_inserts()
+and shipped back to the parent process. Only the parent writes to the sqlite DB and it writes each
+importer's rows in the order the importers were given (which is their priority order: rows written
+first win address collisions) as soon as that importer and all the ones ahead of it are done.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from os import cpu_count
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.table import Table
+
+from ethecycle.chain_addresses.address_db import (InsertBatch, data_source_fingerprints, deferred_inserts,
+     forget_db_connection, insert_addresses)
+from ethecycle.util.logging import console
+
+Importer = Callable[[], None]
+# (args of each insert_addresses() call, seconds spent extracting)
+ExtractResult = Tuple[List[InsertBatch], float]
+
+DEFAULT_IMPORTER_WORKERS = min(8, cpu_count() or 1)
+
+
+@dataclass
+class ImporterTiming:
+    importer_name: str
+    extract_seconds: float
+    write_seconds: float
+    rows: int
+
+
+def run_importers(importers: List[Importer], max_workers: Optional[int] = None) -> List[ImporterTiming]:
+    """
+    Extract with all 'importers' concurrently, then write their rows in order. max_workers=1 runs
+    everything serially in this process (easier to debug).
+    """
+    max_workers = max_workers or DEFAULT_IMPORTER_WORKERS
+    fingerprints = data_source_fingerprints()
+    timings: List[ImporterTiming] = []
+
+    if max_workers == 1:
+        for importer in importers:
+            timings.append(_write(importer, _extract(importer, fingerprints)))
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_extract, importer, fingerprints) for importer in importers]
+
+            # Results are consumed in priority order; later importers keep extracting while earlier ones write
+            for importer, future in zip(importers, futures):
+                timings.append(_write(importer, future.result()))
+
+    print_importer_timings(timings)
+    return timings
+
+
+def print_importer_timings(timings: List[ImporterTiming]) -> None:
+    table = Table('Importer', 'Extract', 'Write', 'Rows', title='Chain Address Import Timings')
+
+    for timing in timings:
+        table.add_row(
+            timing.importer_name,
+            f"{timing.extract_seconds:.2f}s",
+            f"{timing.write_seconds:.2f}s",
+            str(timing.rows),
+        )
+
+    console.print(table)
+
+
+def _extract(importer: Importer, fingerprints: Dict[str, Optional[str]]) -> ExtractResult:
+    """Run 'importer' with insert_addresses() calls deferred. Returns the captured batches."""
+    start_time = time.perf_counter()
+
+    with deferred_inserts(fingerprints) as batches:
+        importer()
+
+    return batches, time.perf_counter() - start_time
+
+
+def _write(importer: Importer, extract_result: ExtractResult) -> ImporterTiming:
+    batches, extract_seconds = extract_result
+    start_time = time.perf_counter()
+
+    for batch in batches:
+        insert_addresses(*batch)
+
+    return ImporterTiming(
+        importer_name=importer.__name__,
+        extract_seconds=extract_seconds,
+        write_seconds=time.perf_counter() - start_time,
+        rows=sum(len(objs) for objs, *_args in batches)
+    )
+
+
+def _init_worker() -> None:
+    """Workers only extract; if anything in them does touch the DB it has to be over a connection of their own."""
+    forget_db_connection()
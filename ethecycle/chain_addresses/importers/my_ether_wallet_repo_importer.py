@@ -5,13 +5,14 @@ import json
 from os import path
 from typing import List
 
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import TOKENS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.models.token import Token
 from ethecycle.util.logging import print_address_import, print_dim
 from ethecycle.util.string_constants import *
 
-MY_ETHER_WALLET_REPO = GithubDataSource('MyEtherWallet/ethereum-lists')
+MY_ETHER_WALLET_REPO = GithubDataSource('MyEtherWallet/ethereum-lists', sparse_paths=['/dist/tokens/'])
 
 # Keys are folder names, values are blockchain names.
 DIRS_TO_IMPORT = {
@@ -30,6 +31,11 @@ def _import_tokens_addresses():
     print_address_import(MY_ETHER_WALLET_REPO.repo_url)
 
     with MY_ETHER_WALLET_REPO.local_repo_path() as repo_dir:
+        fingerprint = MY_ETHER_WALLET_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(MY_ETHER_WALLET_REPO.repo_url, fingerprint):
+            return
+
         root_data_dir = path.join(repo_dir, 'dist', 'tokens')
         tokens: List[Token] = []
 
@@ -53,4 +59,4 @@ def _import_tokens_addresses():
 
                 tokens.append(token)
 
-        insert_addresses(tokens)
+        insert_addresses(tokens, fingerprint, MY_ETHER_WALLET_REPO.repo_url, TOKENS_TABLE_NAME)
@@ -4,21 +4,33 @@ Details: https://developer.trustwallet.com/assets/repository_details
 """
 
 import json
+from collections import Counter
 from os import path
-from typing import List
+from typing import List, Optional, Tuple
 
 from rich.panel import Panel
 
-from ethecycle.chain_addresses.address_db import insert_addresses, insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import TOKENS_TABLE_NAME, WALLETS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.config import Config
 from ethecycle.models.token import Token
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import subdirs_of_dir
+from ethecycle.util.filesystem_helper import CHAIN_ADDRESS_DATA_DIR, subdirs_of_dir
 from ethecycle.util.logging import console, log, print_address_import
+from ethecycle.util.parallel_file_parser import load_json, parse_files
 from ethecycle.util.string_constants import *
 
-SOURCE_REPO = GithubDataSource('trustwallet/assets', 'trustwallet_assets')
+SOURCE_REPO = GithubDataSource(
+    'trustwallet/assets',
+    'trustwallet_assets',
+    ['blockchains/*/assets/*/info.json', 'blockchains/*/validators/list.json']
+)
+PARSED_FILES_CACHE_PATH = path.join(CHAIN_ADDRESS_DATA_DIR, 'trustwallet_parsed_files.pickle')
+TOKEN_INFO_JSON = 'info.json'
+
+# (token_type, address, symbol, name, decimals, is_active, is_scam, url_explorer) from an info.json file
+TokenRow = Tuple[Optional[str], str, str, str, int, Optional[bool], Optional[bool], Optional[str]]
 
 # Folders that are the same name as the chain
 DIRS_TO_IMPORT = [
@@ -42,8 +54,13 @@ def import_trust_wallet_repo():
     print_address_import(SOURCE_REPO.repo_url)
 
     with SOURCE_REPO.local_repo_path() as repo_dir:
+        fingerprint = SOURCE_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(SOURCE_REPO.repo_url, fingerprint):
+            return
+
         root_data_dir = path.join(repo_dir, 'blockchains')
-        tokens: List[Token] = []
+        token_info_files: List[Tuple[str, str]] = []  # (blockchain, info.json path)
         wallets: List[Wallet] = []
 
         for subdir, blockchain in MAPPED_DIRS_TO_IMPORT.items():
@@ -55,8 +72,8 @@ def import_trust_wallet_repo():
             token_list_json = path.join(chain_data_dir, 'tokenlist.json')
 
             if path.exists(tokens_dir):
-                chain_tokens = _get_tokens_for_chain(blockchain, tokens_dir)
-                tokens.extend(chain_tokens)
+                token_dirs = subdirs_of_dir(tokens_dir)
+                token_info_files.extend((blockchain, path.join(d, TOKEN_INFO_JSON)) for d in token_dirs)
             else:
                 log.info(f"    No token assets dir in '{subdir}'...")
 
@@ -66,54 +83,77 @@ def import_trust_wallet_repo():
             else:
                 log.info(f"    No validators assets dir in '{subdir}'...")
 
-        insert_addresses(tokens)
-        insert_addresses(wallets)
+        # All the chains' info.json files are parsed in one pass so they share the worker pool and the cache
+        token_rows = parse_files([f for _, f in token_info_files], _parse_token_info, PARSED_FILES_CACHE_PATH)
+        tokens = _build_tokens([blockchain for blockchain, _ in token_info_files], token_rows)
+        # Only the last write for the repo stores its fingerprint so an interrupted import is redone in full
+        insert_addresses(tokens, None, SOURCE_REPO.repo_url, TOKENS_TABLE_NAME)
+        insert_addresses(wallets, fingerprint, SOURCE_REPO.repo_url, WALLETS_TABLE_NAME)
 
 
-def _get_tokens_for_chain(blockchain: str, tokens_dir: str) -> List[Token]:
-    tokens: List[Token] = []
+def _parse_token_info(token_info_json_file: str) -> Optional[TokenRow]:
+    """Runs in the parser processes. Returns None if a required key is missing."""
+    try:
+        token_info = load_json(token_info_json_file)
+        token_status = token_info['status']
+
+        # Unclear if status of 'spam' means active or inactive
+        if token_status == 'spam':
+            is_active = None
+            is_scam = True
+        else:
+            is_active = token_status == 'active'
+            is_scam = None
+
+        if Config.debug:
+            subdir = path.dirname(token_info_json_file)
+            console.print(Panel(f"{token_info['id']} ({path.basename(subdir)})", expand=False))
+            print(token_info)
+
+        return (
+            token_info.get('type'),  # Not always provided
+            token_info['id'],
+            token_info[SYMBOL],
+            token_info[NAME],
+            token_info['decimals'],
+            is_active,
+            is_scam,
+            token_info.get('explorer'),
+        )
+    except KeyError as e:
+        log.warning(f"Error parsing '{token_info_json_file}': {e}")
+        return None
 
-    for subdir in subdirs_of_dir(tokens_dir):
-        token_info_json_file = path.join(subdir, 'info.json')
 
-        try:
-            with open(token_info_json_file, 'r') as json_file:
-                token_info = json.load(json_file)
+def _build_tokens(blockchains: List[str], token_rows: List[Optional[TokenRow]]) -> List[Token]:
+    tokens: List[Token] = []
 
-            token_status = token_info['status']
+    for blockchain, row in zip(blockchains, token_rows):
+        if row is None:
+            continue
 
-            # Unclear if status of 'spam' means active or inactive
-            if token_status == 'spam':
-                is_active = None
-                is_scam = True
-            else:
-                is_active = token_status == 'active'
-                is_scam = None
+        token_type, address, symbol, name, decimals, is_active, is_scam, url_explorer = row
 
-            token = Token(
+        tokens.append(
+            Token(
                 blockchain=blockchain,
-                token_type=token_info.get('type'),  # Not always provided
-                address=token_info['id'],
-                symbol=token_info[SYMBOL],
-                name=token_info[NAME],
-                decimals=token_info['decimals'],
+                token_type=token_type,
+                address=address,
+                symbol=symbol,
+                name=name,
+                decimals=decimals,
                 is_active=is_active,
                 is_scam=is_scam,
-                url_explorer=token_info.get('explorer'),
+                url_explorer=url_explorer,
                 data_source=SOURCE_REPO.repo_url
             )
+        )
 
-            if Config.debug:
-                console.print(Panel(f"{token_info['id']} ({path.basename(subdir)})", expand=False))
-                print(token_info)
-                print("\n\n---------------------\n\n")
-                print(token)
+    token_counts = Counter(token.blockchain for token in tokens)
 
-            tokens.append(token)
-        except KeyError as e:
-            log.warning(f"Error parsing '{token_info_json_file}': {e}")
+    for blockchain in MAPPED_DIRS_TO_IMPORT.values():
+        console.print(f"  Found {token_counts[blockchain]} tokens for {blockchain}...", style='dim')
 
-    console.print(f"  Found {len(tokens)} tokens for {blockchain}...", style='dim')
     return tokens
 
 
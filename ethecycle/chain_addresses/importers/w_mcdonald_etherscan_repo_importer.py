@@ -3,13 +3,14 @@ from os import path
 from typing import List
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.chain_addresses.github_data_source import GithubDataSource
 from ethecycle.models.wallet import Wallet
 from ethecycle.util.logging import print_address_import
 from ethecycle.util.string_constants import *
 
-SOURCE_REPO = GithubDataSource('W-McDonald/etherscan')
+SOURCE_REPO = GithubDataSource('W-McDonald/etherscan', sparse_paths=['/addresses.csv'])
 
 
 def import_w_mcdonald_etherscan_addresses():
@@ -17,6 +18,11 @@ def import_w_mcdonald_etherscan_addresses():
     print_address_import(SOURCE_REPO.repo_url)
 
     with SOURCE_REPO.local_repo_path() as repo_dir:
+        fingerprint = SOURCE_REPO.fingerprint(repo_dir)
+
+        if is_data_source_unchanged(SOURCE_REPO.repo_url, fingerprint):
+            return
+
         addresses_file = path.join(repo_dir, 'addresses.csv')
         wallets: List[Wallet] = []
 
@@ -46,4 +52,4 @@ def import_w_mcdonald_etherscan_addresses():
 
                 wallets.append(wallet)
 
-        insert_addresses(wallets)
+        insert_addresses(wallets, fingerprint, SOURCE_REPO.repo_url, WALLETS_TABLE_NAME)
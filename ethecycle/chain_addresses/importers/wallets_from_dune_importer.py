@@ -7,9 +7,10 @@ from os import path
 from typing import Dict, List
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.address_db import insert_addresses, is_data_source_unchanged
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.models.wallet import Wallet
-from ethecycle.util.filesystem_helper import RAW_DATA_DIR, files_in_dir, get_lines
+from ethecycle.util.filesystem_helper import RAW_DATA_DIR, file_fingerprint, files_in_dir, get_lines
 from ethecycle.util.logging import log, print_address_import
 
 DATA_SOURCE = 'https://dune.com/crypto_oracle/wallets'
@@ -20,11 +21,16 @@ def import_wallets_from_dune() -> None:
     """Load all files matching the pattern raw_data/*wallets_from_dune.txt.gz."""
     print_address_import(DATA_SOURCE)
     wallets: List[Wallet] = []
+    files = sorted(f for f in files_in_dir(RAW_DATA_DIR) if f.endswith(WALLETS_FROM_DUNE_SUFFIX))
+    fingerprint = file_fingerprint(*files)
 
-    for file in [f for f in files_in_dir(RAW_DATA_DIR) if f.endswith(WALLETS_FROM_DUNE_SUFFIX)]:
+    if is_data_source_unchanged(DATA_SOURCE, fingerprint):
+        return
+
+    for file in files:
         wallets.extend(extract_wallets_from_file(file))
 
-    insert_addresses(wallets)
+    insert_addresses(wallets, fingerprint, DATA_SOURCE, WALLETS_TABLE_NAME)
 
 
 def extract_wallets_from_file(file) -> List[Wallet]:
@@ -0,0 +1,132 @@
+"""
+Fill in the organization column of rows that are already in the chain addresses DB from their names
+(see NameToOrg) without reimporting anything. Rows are read in rowid order one chunk at a time (keyset
+pagination, so memory use doesn't grow with the table) and changes are written with executemany()
+UPDATEs, all inside one transaction. Rows NameToOrg has no organization for are left alone.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from rich.table import Table
+
+from ethecycle.chain_addresses.address_db import get_db_connection
+from ethecycle.chain_addresses.config.organizations import NameToOrg
+from ethecycle.chain_addresses.db.search_index import reindex_data_source
+from ethecycle.chain_addresses.db.table_definitions import DATA_SOURCE_ID, WALLETS_TABLE_NAME
+from ethecycle.util.logging import console, print_dim
+from ethecycle.util.number_helper import comma_format, pct_str
+from ethecycle.util.string_constants import ADDRESS, NAME, ORGANIZATION
+
+BACKFILL_CHUNK_SIZE = 10_000
+PROGRESS_INTERVAL_SECONDS = 5
+SAMPLE_SIZE = 10
+
+# (address, name, old organization, new organization)
+OrganizationChange = Tuple[str, str, Optional[str], str]
+
+
+@dataclass
+class BackfillReport:
+    table_name: str
+    dry_run: bool
+    rows_scanned: int = 0
+    rows_changed: int = 0
+    elapsed_seconds: float = 0.0
+    # {(old organization, new organization): number of rows}
+    change_counts: Counter = field(default_factory=Counter)
+    samples: List[OrganizationChange] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_scanned / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def record_change(self, change: OrganizationChange) -> None:
+        self.rows_changed += 1
+        self.change_counts[(change[2], change[3])] += 1
+
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(change)
+
+    def print(self) -> None:
+        """Summary line plus, if anything changed, a table of (old => new organization) counts and sample rows."""
+        verb = 'Would update' if self.dry_run else 'Updated'
+        msg = f"{verb} organization of {comma_format(self.rows_changed)} of {comma_format(self.rows_scanned)} "
+        msg += f"'{self.table_name}' rows in {self.elapsed_seconds:.1f}s ({self.rows_per_second:,.0f} rows/sec)."
+        print_dim(msg)
+
+        if self.rows_changed == 0:
+            return
+
+        table = Table('Old Organization', 'New Organization', 'Rows', title=f"'{self.table_name}' organization changes")
+
+        for (old_org, new_org), count in self.change_counts.most_common():
+            table.add_row(str(old_org), new_org, comma_format(count))
+
+        console.print(table)
+        samples = Table('Address', 'Name', 'Old Organization', 'New Organization', title='Sample rows')
+
+        for address, name, old_org, new_org in self.samples:
+            samples.add_row(address, name, str(old_org), new_org)
+
+        console.print(samples)
+
+
+def backfill_organizations(
+        table_name: str = WALLETS_TABLE_NAME,
+        dry_run: bool = False,
+        chunk_size: int = BACKFILL_CHUNK_SIZE
+    ) -> BackfillReport:
+    """
+    Set the organization of every row in 'table_name' whose name NameToOrg finds a different one for.
+    With 'dry_run' nothing is written; the returned report shows what would have changed.
+    """
+    connection = get_db_connection().connection
+    report = BackfillReport(table_name, dry_run)
+    max_rowid = connection.execute(f"SELECT MAX(rowid) FROM {table_name}").fetchone()[0] or 0
+    select_sql = f"SELECT rowid, {DATA_SOURCE_ID}, {ADDRESS}, {NAME}, {ORGANIZATION} FROM {table_name} " \
+                 f"WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    update_sql = f"UPDATE {table_name} SET {ORGANIZATION} = ? WHERE rowid = ?"
+    changed_data_source_ids: Set[int] = set()
+    start_time = last_progress_time = time.perf_counter()
+    last_rowid = 0
+    console.print(f"{'Dry run of backfilling' if dry_run else 'Backfilling'} '{table_name}' organizations...")
+
+    with connection:
+        while True:
+            rows = connection.execute(select_sql, [last_rowid, chunk_size]).fetchall()
+
+            if len(rows) == 0:
+                break
+
+            organizations = NameToOrg.get_orgs_for_names(row[3] or '' for row in rows)
+            updates = []
+
+            for (rowid, data_source_id, address, name, old_org), new_org in zip(rows, organizations):
+                if new_org is None or new_org == old_org:
+                    continue
+
+                updates.append((new_org, rowid))
+                changed_data_source_ids.add(data_source_id)
+                report.record_change((address, name, old_org, new_org))
+
+            if not dry_run and len(updates) > 0:
+                connection.executemany(update_sql, updates)
+
+            report.rows_scanned += len(rows)
+            last_rowid = rows[-1][0]
+
+            if time.perf_counter() - last_progress_time >= PROGRESS_INTERVAL_SECONDS:
+                last_progress_time = time.perf_counter()
+                rows_per_second = report.rows_scanned / (last_progress_time - start_time)
+                msg = f"  Scanned {comma_format(report.rows_scanned)} rows ({pct_str(last_rowid, max_rowid)}), "
+                print_dim(msg + f"{comma_format(report.rows_changed)} changed ({rows_per_second:,.0f} rows/sec)...")
+
+        # The search index has its own copy of the organization column
+        if not dry_run:
+            for data_source_id in sorted(changed_data_source_ids):
+                reindex_data_source(connection, table_name, data_source_id)
+
+    report.elapsed_seconds = time.perf_counter() - start_time
+    return report
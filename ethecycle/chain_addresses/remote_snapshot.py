@@ -0,0 +1,148 @@
+"""
+Offline first local copies of remote files (e.g. Google Sheets exported as CSV). The gzipped
+snapshots on disk are used as is until they're older than the max age, at which point they're
+refreshed with conditional requests (ETag / Last-Modified) from a bounded pool of threads. A failed
+refresh keeps using the old snapshot. With Config.offline set nothing is ever fetched.
+"""
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from os import path
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from ethecycle.config import Config
+from ethecycle.util.logging import console, log
+
+# Fix the embedded timestamp so that every write of the same content is the same binary
+GZIP_MTIME = 1667767780
+HTTP_VALIDATORS_FILE_NAME = '.http_validators.json'
+SNAPSHOT_MAX_AGE = timedelta(days=7)
+MAX_FETCH_THREADS = 8
+FETCH_TIMEOUT_SECONDS = 60
+ETAG = 'ETag'
+LAST_MODIFIED = 'Last-Modified'
+
+# Outcomes of refresh_snapshots()
+FRESH = 'fresh'
+NOT_MODIFIED = 'not_modified'
+DOWNLOADED = 'downloaded'
+FAILED = 'failed'
+OFFLINE = 'offline'
+
+# {header name: value} of the ETag / Last-Modified headers of the response a snapshot was written from
+Validators = Dict[str, str]
+
+
+@dataclass
+class RemoteSnapshot:
+    url: str
+    snapshot_path: str
+
+    def exists(self) -> bool:
+        return path.isfile(self.snapshot_path)
+
+    def is_fresh(self, max_age: timedelta = SNAPSHOT_MAX_AGE) -> bool:
+        return self.exists() and time.time() - path.getmtime(self.snapshot_path) < max_age.total_seconds()
+
+
+def refresh_snapshots(
+        snapshots: List[RemoteSnapshot],
+        max_age: timedelta = SNAPSHOT_MAX_AGE,
+        max_workers: int = MAX_FETCH_THREADS
+    ) -> Dict[str, str]:
+    """Refresh any missing or stale 'snapshots' concurrently. Returns {snapshot_path: outcome}."""
+    outcomes = {s.snapshot_path: FRESH for s in snapshots if s.is_fresh(max_age)}
+    stale_snapshots = [s for s in snapshots if s.snapshot_path not in outcomes]
+
+    if Config.offline:
+        outcomes.update({s.snapshot_path: OFFLINE for s in stale_snapshots})
+    elif len(stale_snapshots) > 0:
+        console.print(f"Refreshing {len(stale_snapshots)} of {len(snapshots)} snapshots...", style='dim')
+        validators = {s.snapshot_path: _load_validators(s.snapshot_path).get(s.url) for s in stale_snapshots}
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            futures = [executor.submit(_refresh, s, validators[s.snapshot_path]) for s in stale_snapshots]
+            results = [future.result() for future in futures]
+
+        # Validators are written here in the calling thread so the threads never write the same file
+        for snapshot, (outcome, new_validators) in zip(stale_snapshots, results):
+            outcomes[snapshot.snapshot_path] = outcome
+
+            if outcome == DOWNLOADED:
+                _save_validators(snapshot, new_validators)
+
+    for snapshot in [s for s in snapshots if not s.exists()]:
+        outcome = outcomes[snapshot.snapshot_path]
+        log.warning(f"No snapshot of '{snapshot.url}' at '{snapshot.snapshot_path}' (refresh outcome: {outcome})")
+
+    return outcomes
+
+
+def _refresh(snapshot: RemoteSnapshot, validators: Optional[Validators]) -> Tuple[str, Validators]:
+    """Conditional GET of 'snapshot.url'. Returns the outcome and the new response's validators."""
+    request = Request(snapshot.url)
+
+    if snapshot.exists() and validators:
+        if ETAG in validators:
+            request.add_header('If-None-Match', validators[ETAG])
+        if LAST_MODIFIED in validators:
+            request.add_header('If-Modified-Since', validators[LAST_MODIFIED])
+
+    try:
+        with urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+            body = response.read()
+            new_validators = {h: response.headers[h] for h in [ETAG, LAST_MODIFIED] if response.headers[h]}
+    except HTTPError as e:
+        if e.code == 304:
+            log.debug(f"'{snapshot.url}' not modified, keeping '{snapshot.snapshot_path}'")
+            os.utime(snapshot.snapshot_path)
+            return NOT_MODIFIED, {}
+
+        log.warning(f"Failed to fetch '{snapshot.url}' (HTTP {e.code}), keeping existing snapshot if there is one")
+        return FAILED, {}
+    except OSError as e:
+        log.warning(f"Failed to fetch '{snapshot.url}' ({e}), keeping existing snapshot if there is one")
+        return FAILED, {}
+
+    # Write to a tmp file and rename so an interrupted write never leaves a truncated snapshot
+    tmp_path = snapshot.snapshot_path + '.tmp'
+
+    with open(tmp_path, 'wb') as tmp_file:
+        tmp_file.write(gzip.compress(body, mtime=GZIP_MTIME))
+
+    os.replace(tmp_path, snapshot.snapshot_path)
+    log.info(f"Wrote {len(body)} bytes from '{snapshot.url}' to '{snapshot.snapshot_path}'")
+    return DOWNLOADED, new_validators
+
+
+def _validators_path(snapshot_path: str) -> str:
+    return path.join(path.dirname(snapshot_path), HTTP_VALIDATORS_FILE_NAME)
+
+
+def _load_validators(snapshot_path: str) -> Dict[str, Validators]:
+    """{url: validators} for all the snapshots in the same dir as 'snapshot_path'."""
+    validators_path = _validators_path(snapshot_path)
+
+    if not path.isfile(validators_path):
+        return {}
+
+    with open(validators_path) as validators_file:
+        return json.load(validators_file)
+
+
+def _save_validators(snapshot: RemoteSnapshot, validators: Validators) -> None:
+    all_validators = _load_validators(snapshot.snapshot_path)
+
+    if len(validators) == 0:
+        all_validators.pop(snapshot.url, None)
+    else:
+        all_validators[snapshot.url] = validators
+
+    with open(_validators_path(snapshot.snapshot_path), 'w') as validators_file:
+        json.dump(all_validators, validators_file, indent=4, sort_keys=True)
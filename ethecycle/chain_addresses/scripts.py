@@ -2,12 +2,15 @@
 Helper for generating dune queries to find new labels
 TODO: Get this into the /scripts dir?
 """
+from argparse import ArgumentParser
 from typing import Any, Dict, List
 
 import sqllex as sx
+from rich.table import Table
 
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import table_connection
+from ethecycle.chain_addresses.address_db import get_db_connection
+from ethecycle.chain_addresses.db.search_index import DEFAULT_SEARCH_LIMIT, search_addresses
 from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
 from ethecycle.chain_addresses.importers.wallets_from_dune_importer import DATA_SOURCE
 from ethecycle.config import Config
@@ -42,17 +45,41 @@ def generate_ethereum_dune_labels_query():
 
 
 def generate_dune_analytics_where_clause(blockchain: str, substrings: List[str]) -> List[Dict[str, Any]]:
-    """Generate WHERE fragment to build a dune analytics query against wallets whose names contain 'name_match'."""
-    selects = [ADDRESS, NAME]
-    wheres = [f"{NAME} LIKE '%{substring}%'" for substring in substrings]
-
-    with table_connection(WALLETS_TABLE_NAME) as table:
-        rows = table.select(
-            SELECT=selects,
-            WHERE=' OR '.join(wheres)
+    """
+    Find wallets on 'blockchain' with a word in their name, organization or category starting with any
+    of 'substrings' (for building a dune analytics query). Uses the full text search index.
+    """
+    results = search_addresses(' '.join(substrings), blockchain, WALLETS_TABLE_NAME, limit=None, match_any=True)
+    return [{ADDRESS: result.address, NAME: result.name} for result in results]
+
+
+def search_chain_addresses():
+    """CLI for full text search of the wallet and token labels in the chain_addresses DB."""
+    parser = ArgumentParser(description='Search wallet / token names, organizations, categories and symbols.')
+    parser.add_argument('terms', nargs='+', help='words to search for (prefix matched, so "bina" finds binance)')
+    parser.add_argument('-a', '--any', action='store_true', help='match any of the terms instead of all of them')
+    parser.add_argument('-b', '--blockchain', help='only return addresses on this blockchain')
+    parser.add_argument('-l', '--limit', type=int, default=DEFAULT_SEARCH_LIMIT, help='max results to show')
+    args = parser.parse_args()
+
+    get_db_connection()  # Creates the search index if this DB predates it
+    results = search_addresses(' '.join(args.terms), args.blockchain, limit=args.limit, match_any=args.any)
+    table = Table('Type', 'Blockchain', 'Address', 'Name', 'Organization', 'Category', 'Symbol', 'Rank')
+
+    for result in results:
+        table.add_row(
+            result.table_name,
+            result.blockchain,
+            result.address,
+            result.name,
+            result.organization,
+            result.category,
+            result.symbol,
+            f"{result.rank:.2f}"
         )
 
-    return [dict(zip(selects, row)) for row in rows]
+    console.print(table)
+    console.print(f"{len(results)} matches.", style='dim')
 
 
 def show_chain_addresses():
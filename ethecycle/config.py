@@ -10,11 +10,19 @@ class Config:
     debug = DEBUG in environ
     drop_database = False
     extract_only = False
-    skip_load_from_db = False
     is_docker_image_build = 'IS_DOCKER_IMAGE_BUILD' in environ
     is_test_env = IS_TEST_ENV
     preserve_csvs = False
     suppress_chain_address_db_collision_warnings = False
+    ignore_data_source_fingerprints = False
+    # Only use the local snapshots of remote data sources (e.g. Google Sheets), never fetch them
+    offline = False
+    # Write per stage load metrics in this format (see metrics.py; None means don't write them)
+    metrics_format = None
+    # Run each load stage under cProfile
+    profile = False
+    # Reuse the Neo4j CSVs of source files an earlier failed run already transformed (see run_manifest.py)
+    resume = False
 
     # Hacky way to limit output
     max_rows = 1000 if IS_TEST_ENV else 10000000000
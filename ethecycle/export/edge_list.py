@@ -0,0 +1,31 @@
+"""
+Export txns as a gzipped weighted edge list, one 'from_address to_address num_tokens' line per txn.
+Readable by networkx.read_weighted_edgelist() (which handles .gz transparently) and igraph's
+Graph.Read_Ncol().
+"""
+import gzip
+from typing import List
+
+from ethecycle.export.graph_exporter import GraphExporter
+from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.filesystem_helper import GZIP_EXTENSION, OUTPUT_DIR
+from ethecycle.util.string_constants import MISSING_ADDRESS
+
+
+class EdgeListExporter(GraphExporter):
+    FORMAT = 'edge_list'
+    FILE_EXTENSION = '.txt' + GZIP_EXTENSION
+
+    def __init__(self, blockchain: str, output_dir: str = str(OUTPUT_DIR)) -> None:
+        super().__init__(blockchain, output_dir)
+        self.file = gzip.open(self.output_path(), 'wt', compresslevel=6)
+
+    def _write_txns(self, txns: List[Txn], _wallets: List[Wallet]) -> None:
+        self.file.writelines(
+            f"{txn.from_address or MISSING_ADDRESS} {txn.to_address or MISSING_ADDRESS} {txn.num_tokens!r}\n"
+            for txn in txns
+        )
+
+    def _finish(self) -> None:
+        self.file.close()
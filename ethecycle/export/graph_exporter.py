@@ -0,0 +1,56 @@
+"""
+Base class for pluggable graph export formats (GraphML, Parquet, edge lists, GraphSON, etc).
+The transaction loader extracts and transforms each source file once and then feeds the resulting
+txns (and the wallets extracted from them) to every requested exporter, so any number of formats can
+be produced from a single read of the source data.
+
+To add a format subclass GraphExporter, set FORMAT and FILE_EXTENSION, implement _write_txns() and
+(optionally) _finish(), and make sure the module is imported in graph_exporters.py.
+"""
+from abc import ABC, abstractmethod
+from os import path
+from typing import List
+
+from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.filesystem_helper import OUTPUT_DIR, timestamp_for_filename
+from ethecycle.util.logging import console
+
+
+class GraphExporter(ABC):
+    # Name used to select the exporter (e.g. on the command line)
+    FORMAT: str
+    FILE_EXTENSION: str
+
+    def __init__(self, blockchain: str, output_dir: str = str(OUTPUT_DIR)) -> None:
+        self.blockchain = blockchain
+        self.output_dir = output_dir
+        self.basename = timestamp_for_filename()
+        self.txn_count = 0
+        self.generated_files: List[str] = []
+
+    def add_txns(self, txns: List[Txn], wallets: List[Wallet]) -> None:
+        """Write a batch of txns (and the wallets at either end of them) to the output."""
+        self._write_txns(txns, wallets)
+        self.txn_count += len(txns)
+
+    def finish(self) -> List[str]:
+        """Close any open files and return the paths that were written."""
+        self._finish()
+        console.print(f"Exported {self.txn_count} txns as {self.FORMAT} to {self.generated_files}", style='dim')
+        return self.generated_files
+
+    def output_path(self, label: str = '') -> str:
+        """Build an output file path in output_dir (and remember it in generated_files)."""
+        label = f"_{label}" if label else ''
+        file_path = path.join(self.output_dir, f"{self.FORMAT}{label}_{self.basename}{self.FILE_EXTENSION}")
+        self.generated_files.append(file_path)
+        return file_path
+
+    @abstractmethod
+    def _write_txns(self, txns: List[Txn], wallets: List[Wallet]) -> None:
+        pass
+
+    def _finish(self) -> None:
+        """Subclasses that hold open file handles should close them here."""
+        pass
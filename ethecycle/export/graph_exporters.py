@@ -0,0 +1,40 @@
+"""
+Registry of available graph export formats. Keys are the FORMAT strings ('graphml', 'parquet', etc.)
+and values are GraphExporter subclasses. Any GraphExporter subclass that has been imported is
+registered, so plugging in a new format only requires importing its module here.
+"""
+from inspect import isabstract
+from typing import Dict, List, Type
+
+from ethecycle.export.edge_list import EdgeListExporter
+from ethecycle.export.graph_exporter import GraphExporter
+from ethecycle.export.graphml import GraphmlExporter
+from ethecycle.export.graphson import GraphsonExporter
+from ethecycle.export.parquet import ParquetExporter
+from ethecycle.util.filesystem_helper import OUTPUT_DIR
+
+
+def graph_exporters() -> Dict[str, Type[GraphExporter]]:
+    return {
+        exporter.FORMAT: exporter
+        for exporter in GraphExporter.__subclasses__()
+        if not isabstract(exporter)
+    }
+
+
+def build_graph_exporters(
+        export_formats: List[str],
+        blockchain: str,
+        output_dir: str = str(OUTPUT_DIR)
+    ) -> List[GraphExporter]:
+    """Instantiate an exporter for each of 'export_formats'."""
+    exporters = graph_exporters()
+
+    for export_format in export_formats:
+        if export_format not in exporters:
+            raise ValueError(f"Unknown export format '{export_format}' (options: {list(exporters.keys())})")
+
+    return [exporters[export_format](blockchain, output_dir) for export_format in export_formats]
+
+
+GRAPH_EXPORT_FORMATS = list(graph_exporters().keys())
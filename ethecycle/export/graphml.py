@@ -1,20 +1,28 @@
 """
 Turn txions into Gremlin style GraphML.
 Example: https://github.com/tinkerpop/gremlin/blob/master/data/graph-example-1.xml
+
+export_graphml() streams the XML to disk with lxml's incremental xmlfile writer so memory use does
+not grow with the number of txns (only the set of wallet addresses already written is retained, so
+memory grows with the number of distinct wallets). build_graphml() constructs the whole tree in memory
+and is only useful for small graphs / debugging.
 """
 import time
 from dataclasses import dataclass
 from functools import partial
 from os import path
-from typing import List, Union
+from typing import Generator, Iterable, List, Optional, Set, Type, Union
 
-from bs4 import BeautifulSoup
 from lxml import etree
 from pympler.asizeof import asizeof
 
+from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.models.blockchain import get_chain_info
 from ethecycle.config import Config
+from ethecycle.export.graph_exporter import GraphExporter
 from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.filesystem_helper import OUTPUT_DIR
 from ethecycle.util.logging import console, log
 from ethecycle.util.number_helper import MEGABYTE, size_string
 from ethecycle.util.string_constants import *
@@ -51,7 +59,7 @@ class GraphPropertyManager:
         EdgeProperty('num_tokens', 'double'),
         EdgeProperty('block_number', 'int'),
         EdgeProperty('token_address', 'string'),
-        EdgeProperty('token', 'string'),
+        EdgeProperty(SYMBOL, 'string'),
     ]
 
     EXTENDED_NODE_PROPERTIES = ALL_OBJ_PROPERTIES + NODE_PROPERTIES
@@ -94,73 +102,126 @@ XML_PROPS = {
 }
 
 
-def build_graphml(wallets_txns: WalletTxns, blockchain: str) -> etree._ElementTree:
-    """Export txions to GraphML format. Graph ID is 'blockchain'. Returns file written."""
-    all_txns = [txn for txns in wallets_txns.values() for txn in txns]
+def build_graphml(txns: List[Txn], blockchain: str, estimate_size: bool = False) -> etree._ElementTree:
+    """
+    Build an in memory GraphML tree for 'txns'. Graph ID is 'blockchain'. Estimating the in memory size
+    of the XML walks every element with asizeof() so it is very slow and off by default.
+    """
     chain_info = get_chain_info(blockchain)
     root = etree.Element('graphml')#, **XML_PROPS)
-    wallets_already_in_graph_count = 0
 
     # <key> elements describe the properties vertices and edges can have.
     for graph_obj_property in GraphPropertyManager.all_obj_properties():
         root.append(graph_obj_property.to_graphml())
 
     # Add the <graph>. IMPORTANT: the <key> elements MUST come before the <graph> in the XML.
-    graph = etree.SubElement(root, 'graph', **{'id': blockchain, 'edgedefault': 'directed'})
+    graph = etree.SubElement(root, 'graph', **_graph_attribs(blockchain))
 
     # Wallets are <node> elements. TODO: wallets still don't label correctly...
-    wallets = set(wallets_txns.keys()).union(set([txn.to_address for txn in all_txns]))
+    wallets = set([_node_id(txn.from_address) for txn in txns]).union(set([_node_id(txn.to_address) for txn in txns]))
 
     for wallet_address in wallets:
-        # Commented out because until we have a way to actually totally bisect the graph this is an
-        # unnecessary cost.
-        # if is_wallet_in_graph(wallet_address):
-        #     log.debug(f"Wallet '{wallet_address}' is already in graph...")
-        #     wallets_already_in_graph_count += 1
-        #     continue
-
-        wallet = etree.SubElement(graph, 'node', **{'id': wallet_address})
-        _attribute_xml(wallet, LABEL_V, WALLET)
-
-        if Config.include_extended_properties:
-            _attribute_xml(wallet, SCANNER_URL, chain_info.scanner_url(wallet_address))
+        graph.append(_wallet_node(wallet_address, chain_info))
 
     # Transactions are <edge> elements.
-    for txn in all_txns:
-        _add_transaction(graph, txn)
+    for txn in txns:
+        graph.append(_transaction_edge(txn))
 
     xml = etree.ElementTree(root)
     console.print(f"Created XML for {len(wallets)} wallet nodes...")
-    console.print(f"Created XML for {len(all_txns)} transaction edges...")
-    console.print(f"   Skipped {wallets_already_in_graph_count} wallets already extant in graph...", style='dim')
-    console.print(f"   Estimated in memory size of generated XML: {(size_string(_xml_size(xml)))}", style='dim')
+    console.print(f"Created XML for {len(txns)} transaction edges...")
+
+    if estimate_size:
+        console.print(f"   Estimated in memory size of generated XML: {(size_string(_xml_size(xml)))}", style='dim')
+
     return xml
 
 
-def export_graphml(
-        wallets_txns: WalletTxns,
-        blockchain: str,
-        output_path: str
-    ) -> str:
+class GraphmlStreamWriter:
+    """
+    Incrementally write txns to a GraphML file. Each wallet <node> is written just before the first <edge>
+    that references it (GraphML allows nodes and edges to be interleaved) so the only state held in
+    memory is the set of wallet addresses already written. That set is O(distinct wallets), not O(1).
+    Always close() the writer (even if reading the txns fails) or the file will be missing its closing tags.
     """
-    Build graphML data for 'wallets_txns' and write to output_path. Note that output_path must also be
-    accessible from the gremlin-server container.
+    def __init__(self, output_path: str, blockchain: str) -> None:
+        self.output_path = output_path
+        self.blockchain = blockchain
+        self.chain_info = get_chain_info(blockchain)
+        self.wallets_written: Set[str] = set()
+        self.txn_count = 0
+        # lxml's xmlfile() only works as a context manager so it lives inside a generator that is fed txns
+        self._xml_writer = self._write_xml()
+        next(self._xml_writer)
+
+    def write_txns(self, txns: Iterable[Txn]) -> None:
+        # Iterate here rather than inside the generator so exceptions raised by 'txns' don't kill the writer
+        for txn in txns:
+            self._xml_writer.send(txn)
+
+    def close(self) -> None:
+        """Write the closing tags and close the file."""
+        try:
+            self._xml_writer.send(None)
+        except StopIteration:
+            pass
+
+    def _write_xml(self) -> Generator[None, Optional[Txn], None]:
+        with etree.xmlfile(self.output_path, encoding='utf-8') as xml_file:
+            xml_file.write_declaration()
+
+            with xml_file.element('graphml'):
+                # IMPORTANT: the <key> elements MUST come before the <graph> in the XML.
+                for graph_obj_property in GraphPropertyManager.all_obj_properties():
+                    xml_file.write(graph_obj_property.to_graphml())
+
+                with xml_file.element('graph', **_graph_attribs(self.blockchain)):
+                    while (txn := (yield)) is not None:
+                        for address in (_node_id(txn.from_address), _node_id(txn.to_address)):
+                            if address not in self.wallets_written:
+                                xml_file.write(_wallet_node(address, self.chain_info))
+                                self.wallets_written.add(address)
+
+                        xml_file.write(_transaction_edge(txn))
+                        self.txn_count += 1
+
+
+class GraphmlExporter(GraphExporter):
+    FORMAT = 'graphml'
+    FILE_EXTENSION = GRAPHML_EXTENSION
+
+    def __init__(self, blockchain: str, output_dir: str = str(OUTPUT_DIR)) -> None:
+        super().__init__(blockchain, output_dir)
+        self.writer = GraphmlStreamWriter(self.output_path(), blockchain)
+
+    def _write_txns(self, txns: List[Txn], _wallets: List[Wallet]) -> None:
+        self.writer.write_txns(txns)
+
+    def _finish(self) -> None:
+        self.writer.close()
+
+
+def export_graphml(txns: Iterable[Txn], blockchain: str, output_path: str) -> str:
+    """
+    Stream GraphML for 'txns' to 'output_path' one element at a time. Returns the path written.
+    Note that output_path must also be accessible from the gremlin-server container.
     """
     if not output_path.endswith(GRAPHML_EXTENSION):
         log.warning(f"Forcing graphML output_path '{output_path}' to end in {GRAPHML_EXTENSION}.")
         output_path = output_path + GRAPHML_EXTENSION
 
     start_time = time.perf_counter()
-    graphml = build_graphml(wallets_txns, blockchain)
-    transform_duration = time.perf_counter() - start_time
-    console.print(f"   Transformed to in memory graphML in {transform_duration:02.2f} seconds...", style='benchmark')
+    console.print(f"Streaming graphML to '{output_path}'...")
+    writer = GraphmlStreamWriter(output_path, blockchain)
 
-    with open(output_path, 'wb') as file:
-        console.print(f"Writing graphML to '{output_path}'...")
-        graphml.write(file)
-        write_duration = time.perf_counter() - transform_duration - start_time
-        console.print(f"   Wrote graphML to disk in {write_duration:02.2f} seconds...", style='benchmark')
+    try:
+        writer.write_txns(txns)
+    finally:
+        writer.close()
 
+    console.print(f"   Wrote {len(writer.wallets_written)} wallet nodes and {writer.txn_count} transaction edges...", style='dim')
+    write_duration = time.perf_counter() - start_time
+    console.print(f"   Wrote graphML to disk in {write_duration:02.2f} seconds...", style='benchmark')
     return output_path
 
 
@@ -172,19 +233,40 @@ def pretty_print_xml_file(xml_file_path: str, force: bool = False) -> None:
         console.print(f"XML file '{xml_file_path}' is {size_string(file_size)}, too big to print for debugging...")
         return
 
+    from bs4 import BeautifulSoup  # Only needed for debugging
     console.print(BeautifulSoup(open(xml_file_path), 'xml').prettify())
 
 
-def _add_transaction(graph_xml: etree._Element, txn: Txn) -> etree._Element:
-    """Add txn as an edge as a sub element of the <graph> xml element."""
-    edge = etree.SubElement(graph_xml, 'edge', **_txn_edge_attribs(txn))
+def _graph_attribs(blockchain: str) -> dict:
+    return {'id': blockchain, 'edgedefault': 'directed'}
+
+
+def _node_id(address: str) -> str:
+    """Txns with no to/from address point at the same placeholder node the Neo4j CSVs use."""
+    return address or MISSING_ADDRESS
+
+
+def _wallet_node(wallet_address: str, chain_info: Type[ChainInfo]) -> etree._Element:
+    """Build a <node> element for a wallet."""
+    wallet = etree.Element('node', **{'id': wallet_address})
+    _attribute_xml(wallet, LABEL_V, WALLET)
+
+    if Config.include_extended_properties:
+        _attribute_xml(wallet, SCANNER_URL, chain_info.scanner_url(wallet_address))
+
+    return wallet
+
+
+def _transaction_edge(txn: Txn) -> etree._Element:
+    """Build an <edge> element for a txn."""
+    edge = etree.Element('edge', **_txn_edge_attribs(txn))
     txn.labelE = TXN  # Tag with 'labelE' for convenience of upcoming for loop
 
     for edge_property in GraphPropertyManager.edge_properties():
-        property_value = vars(txn)[edge_property.name]
+        property_value = getattr(txn, edge_property.name)
 
         if property_value:
-            _attribute_xml(edge, edge_property.name, vars(txn)[edge_property.name])
+            _attribute_xml(edge, edge_property.name, property_value)
 
     return edge
 
@@ -194,8 +276,8 @@ def _txn_edge_attribs(txn: Txn) -> dict:
     return {
         'id': txn.transaction_id,
         'label': TXN,
-        'source': txn.from_address,
-        'target': txn.to_address,
+        'source': _node_id(txn.from_address),
+        'target': _node_id(txn.to_address),
     }
 
 
@@ -0,0 +1,83 @@
+"""
+Export txns as TinkerPop GraphSON 3.0 adjacency lists (one JSON vertex per line), the format
+Gremlin's g.io(path).read() loads natively.
+Docs: https://tinkerpop.apache.org/docs/current/dev/io/#graphson
+
+GraphSON is vertex-centric (every vertex line carries all its in and out edges) so unlike the other
+exporters the adjacency lists have to be accumulated in memory until finish() is called.
+"""
+import json
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from ethecycle.export.graph_exporter import GraphExporter
+from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.filesystem_helper import OUTPUT_DIR
+from ethecycle.util.string_constants import *
+
+GRAPHSON_EXTENSION = '.graphson.json'
+VERTEX_PROPERTIES = [BLOCKCHAIN, NAME, CATEGORY]
+
+
+class GraphsonExporter(GraphExporter):
+    FORMAT = 'graphson'
+    FILE_EXTENSION = GRAPHSON_EXTENSION
+
+    def __init__(self, blockchain: str, output_dir: str = str(OUTPUT_DIR)) -> None:
+        super().__init__(blockchain, output_dir)
+        self.vertex_properties: Dict[str, Dict[str, Any]] = {}
+        self.out_edges: Dict[str, List[dict]] = defaultdict(list)
+        self.in_edges: Dict[str, List[dict]] = defaultdict(list)
+
+    def _write_txns(self, txns: List[Txn], wallets: List[Wallet]) -> None:
+        for wallet in wallets:
+            if wallet.address not in self.vertex_properties:
+                self.vertex_properties[wallet.address] = {p: getattr(wallet, p) for p in VERTEX_PROPERTIES}
+
+        for txn in txns:
+            from_address = txn.from_address or MISSING_ADDRESS
+            to_address = txn.to_address or MISSING_ADDRESS
+            properties = _edge_properties(txn)
+            self.out_edges[from_address].append({'id': txn.transaction_id, 'inV': to_address, 'properties': properties})
+            self.in_edges[to_address].append({'id': txn.transaction_id, 'outV': from_address, 'properties': properties})
+
+    def _finish(self) -> None:
+        vertex_ids = set(self.vertex_properties.keys()).union(self.out_edges.keys()).union(self.in_edges.keys())
+        property_id = 0
+
+        with open(self.output_path(), 'w') as graphson_file:
+            for vertex_id in vertex_ids:
+                vertex = {'id': vertex_id, 'label': WALLET}
+
+                if vertex_id in self.out_edges:
+                    vertex['outE'] = {TXN: self.out_edges[vertex_id]}
+                if vertex_id in self.in_edges:
+                    vertex['inE'] = {TXN: self.in_edges[vertex_id]}
+
+                vertex['properties'] = {}
+
+                for name, value in self.vertex_properties.get(vertex_id, {}).items():
+                    if value is not None:
+                        vertex['properties'][name] = [{'id': _typed('g:Int64', property_id), 'value': value}]
+                        property_id += 1
+
+                graphson_file.write(json.dumps(vertex) + "\n")
+
+
+def _edge_properties(txn: Txn) -> Dict[str, Any]:
+    properties = {
+        NUM_TOKENS: _typed('g:Double', txn.num_tokens),
+        BLOCK_NUMBER: _typed('g:Int64', txn.block_number),
+        TOKEN_ADDRESS: txn.token_address,
+    }
+
+    if txn.symbol:
+        properties[SYMBOL] = txn.symbol
+
+    return properties
+
+
+def _typed(graphson_type: str, value: Any) -> Dict[str, Any]:
+    """GraphSON 3.0 wraps non-string values in a type declaration."""
+    return {'@type': graphson_type, '@value': value}
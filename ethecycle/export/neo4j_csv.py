@@ -9,23 +9,32 @@ Data types: int, long, float, double, boolean, byte, short, char, string, point,
 """
 import time
 from os import path
-from typing import List, Type, Union
+from typing import List, Optional, Type, Union
 
 from ethecycle.models.transaction import NEO4J_TXN_CSV_HEADER, Txn
 from ethecycle.models.wallet import NEO4J_WALLET_CSV_HEADER, Wallet
 from ethecycle.util.csv_helper import write_list_of_lists_to_csv
 from ethecycle.util.filesystem_helper import OUTPUT_DIR, timestamp_for_filename
 from ethecycle.util.logging import print_benchmark
+from ethecycle.util.metrics import WRITE_TXNS, WRITE_WALLETS, LoadMetrics
 from ethecycle.util.neo4j_helper import EDGE_LABEL, HEADER, NODE_LABEL
 
 
 class Neo4jCsvs:
-    def __init__(self, txns: Union[List[Txn], str]) -> None:
+    def __init__(
+            self,
+            txns: Union[List[Txn], str],
+            wallets: Optional[List[Wallet]] = None,
+            metrics: Optional[LoadMetrics] = None
+        ) -> None:
         """
         Generate Neo4j CSV files for the Neo4j bulk loader.
         If 'txns' is the string 'header' the CSVs are single row header files.
         If 'txns' is a list of Txns the CSVs will contain the wallet/txn information about those txns.
+        'wallets' can be passed if they have already been extracted from 'txns'.
+        Writing the CSVs is recorded as WRITE_WALLETS and WRITE_TXNS stages in 'metrics' if it's given.
         """
+        self.metrics = metrics or LoadMetrics()
         csv_basename = HEADER if txns == HEADER else timestamp_for_filename()
         build_csv_path = lambda label: path.join(OUTPUT_DIR, f"{label}_{csv_basename}.csv")
         self.wallet_csv_path = build_csv_path(NODE_LABEL)
@@ -35,19 +44,38 @@ class Neo4jCsvs:
             self._write_header_csvs()
         else:
             # Don't make txns a property of the instance (pass them as arg) so GC can reclaim the memory later.
-            self._write_txn_and_wallet_csvs(txns)
+            self._write_txn_and_wallet_csvs(txns, wallets)
 
         self.generated_csvs = [self.wallet_csv_path, self.txn_csv_path]
 
-    def _write_txn_and_wallet_csvs(self, txns: List[Txn]) -> None:
+    @classmethod
+    def from_existing_csvs(cls, wallet_csv_path: str, txn_csv_path: str) -> 'Neo4jCsvs':
+        """Alternate constructor for CSVs that were written by an earlier (resumed) run."""
+        neo4j_csvs = cls.__new__(cls)
+        neo4j_csvs.metrics = LoadMetrics()
+        neo4j_csvs.wallet_csv_path = wallet_csv_path
+        neo4j_csvs.txn_csv_path = txn_csv_path
+        neo4j_csvs.generated_csvs = [wallet_csv_path, txn_csv_path]
+        return neo4j_csvs
+
+    def _write_txn_and_wallet_csvs(self, txns: List[Txn], wallets: Optional[List[Wallet]]) -> None:
         """Break out wallets and txions into two CSV files for nodes and edges for Neo4j bulk loader."""
+        wallets = wallets or Wallet.extract_wallets_from_transactions(txns)
+
         # Wallet nodes
         start_time = time.perf_counter()
-        self._write_csv(self.wallet_csv_path, Wallet.extract_wallets_from_transactions(txns))
+
+        with self.metrics.stage(WRITE_WALLETS, path.basename(self.wallet_csv_path), len(wallets)) as stage:
+            self._write_csv(self.wallet_csv_path, wallets)
+            stage.bytes = path.getsize(self.wallet_csv_path)
+
         duration_from_start = print_benchmark('Wrote wallet CSV', start_time, indent_level=2)
 
         # Transaction edges
-        self._write_csv(self.txn_csv_path, txns)
+        with self.metrics.stage(WRITE_TXNS, path.basename(self.txn_csv_path), len(txns)) as stage:
+            self._write_csv(self.txn_csv_path, txns)
+            stage.bytes = path.getsize(self.txn_csv_path)
+
         print_benchmark('Wrote txn CSV', start_time + duration_from_start, indent_level=2)
 
     # NOTE: Had bizarre issues with this on macOS... removed WALLET_header.csv but could not write to
@@ -0,0 +1,58 @@
+"""
+Export txns and wallets as Parquet edge and node tables (e.g. for pandas, DuckDB, Spark, etc).
+Each batch of txns passed to the exporter is written as a row group so memory use stays flat.
+Requires pyarrow, which is imported on demand so it is only needed if this format is selected.
+"""
+from typing import List, Set
+
+from ethecycle.export.graph_exporter import GraphExporter
+from ethecycle.models.transaction import NEO4J_TXN_CSV_COLUMN_NAMES, Txn
+from ethecycle.models.wallet import WALLET_CSV_COLUMNS, Wallet
+from ethecycle.util.filesystem_helper import OUTPUT_DIR
+from ethecycle.util.neo4j_helper import EDGE_LABEL, NODE_LABEL
+
+PARQUET_EXTENSION = '.parquet'
+
+# Parquet types for columns that are not strings
+COLUMN_TYPES = {
+    'num_tokens': 'float64',
+    'block_number': 'int64',
+}
+
+
+class ParquetExporter(GraphExporter):
+    FORMAT = 'parquet'
+    FILE_EXTENSION = PARQUET_EXTENSION
+
+    def __init__(self, blockchain: str, output_dir: str = str(OUTPUT_DIR)) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow ('pip install pyarrow')")
+
+        super().__init__(blockchain, output_dir)
+        self.pa = pa
+        self.txn_schema = self._schema(NEO4J_TXN_CSV_COLUMN_NAMES)
+        self.wallet_schema = self._schema(WALLET_CSV_COLUMNS)
+        self.txn_writer = pq.ParquetWriter(self.output_path(EDGE_LABEL), self.txn_schema)
+        self.wallet_writer = pq.ParquetWriter(self.output_path(NODE_LABEL), self.wallet_schema)
+        self.wallets_written: Set[str] = set()
+
+    def _write_txns(self, txns: List[Txn], wallets: List[Wallet]) -> None:
+        new_wallets = [w for w in wallets if w.address not in self.wallets_written]
+        self.wallets_written.update(w.address for w in new_wallets)
+        self.txn_writer.write_table(self._table([t.to_neo4j_csv_row() for t in txns], self.txn_schema))
+        self.wallet_writer.write_table(self._table([w.to_neo4j_csv_row() for w in new_wallets], self.wallet_schema))
+
+    def _finish(self) -> None:
+        self.txn_writer.close()
+        self.wallet_writer.close()
+
+    def _table(self, rows: List[list], schema) -> 'pa.Table':
+        """Pivot row lists into columns and build a pyarrow Table."""
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in schema.names]
+        return self.pa.Table.from_arrays(columns, schema=schema)
+
+    def _schema(self, column_names: List[str]) -> 'pa.Schema':
+        return self.pa.schema([(col, COLUMN_TYPES.get(col, 'string')) for col in column_names])
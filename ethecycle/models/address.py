@@ -9,7 +9,7 @@ from typing import Any, ClassVar, Dict, Iterator, List, Optional, Type, Union
 from inflection import pluralize, titleize, underscore
 
 from ethecycle.blockchains.chain_info import ChainInfo
-from ethecycle.chain_addresses.address_db import table_connection, coalesce_rows
+from ethecycle.chain_addresses.address_db import coalesce_rows, load_table_rows
 from ethecycle.models.blockchain import get_chain_info
 from ethecycle.util.logging import console, log, print_dim
 from ethecycle.util.string_helper import strip_and_set_empty_string_to_none
@@ -50,6 +50,18 @@ class Address:
         if isinstance(self.extracted_at, datetime):
             self.extracted_at = self.extracted_at.replace(microsecond=0).isoformat()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """chain_info may be a ChainInfo subclass built on the fly which can't be pickled so rebuild it."""
+        state = self.__dict__.copy()
+        state['chain_info'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+        if self.blockchain is not None:
+            self.chain_info = get_chain_info(self.blockchain)
+
     def table_name(self) -> str:
         """Name of the table these objs are stored to in chain addresses DB."""
         return underscore(pluralize(type(self).__name__))
@@ -69,9 +81,7 @@ class Address:
             cls._by_blockchain_address = defaultdict(lambda: dict())
             column_names = [c for c in cls.__dataclass_fields__.keys() if c not in COLUMNS_TO_NOT_LOAD]
 
-            with table_connection(pluralize(cls.__name__.lower())) as table:
-                db_rows = table.select_all(SELECT=column_names) # , WHERE=table[BLOCKCHAIN] == blockchain)
-
+            db_rows = load_table_rows(pluralize(cls.__name__.lower()), column_names)
             db_rows = [dict(zip(column_names, row)) for row in db_rows]
             objs = [cls(**row) for row in coalesce_rows(db_rows)]
 
@@ -1,10 +1,11 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, ClassVar, Dict, List, Optional, Type, Union
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Type, Union
 
 from inflection import pluralize, titleize, underscore
 
+from ethecycle.blockchains.address_format import AddressClassifier
 from ethecycle.blockchains.binance_smart_chain import BinanceSmartChain
 from ethecycle.blockchains.bitcoin import Bitcoin
 from ethecycle.blockchains.bitcoin_cash import BitcoinCash
@@ -24,6 +25,10 @@ BLOCKCHAINS = {
     for chain_info in ChainInfo.__subclasses__()
 }
 
+# Only the ChainInfo subclasses defined in ethecycle.blockchains, not the defaults get_chain_info() makes up
+# on the fly (which have no ADDRESS_PREFIXES so would accept any address).
+ADDRESS_CLASSIFIER = AddressClassifier(BLOCKCHAINS.values())
+
 
 @dataclass
 class Blockchain:
@@ -34,15 +39,28 @@ class Blockchain:
 
 def get_chain_info(blockchain: str) -> Type['ChainInfo']:
     """Return the ChainInfo subclass for 'blockchain' or create default ChainInfo on the fly."""
-    if blockchain not in BLOCKCHAINS:
+    chain_info = BLOCKCHAINS.get(blockchain)
+
+    if chain_info is None:
         log.debug(f"Using default ChainInfo for unknown blockchain: '{blockchain}'.")
-        BLOCKCHAINS[blockchain] = type(titleize(blockchain), (ChainInfo,), {})
+        chain_info = BLOCKCHAINS[blockchain] = type(titleize(blockchain), (ChainInfo,), {})
 
-    return BLOCKCHAINS[blockchain]
+    return chain_info
 
 
 def guess_chain_info_from_address(address: str) -> Optional[Type['ChainInfo']]:
     """Guess which chain the address is on from the address format. Not guaranteed accurate!"""
-    for chain_info in BLOCKCHAINS.values():
-        if chain_info.is_valid_address(address):
-            return chain_info
+    candidates = ADDRESS_CLASSIFIER.candidates(address)
+    return candidates[0][0] if len(candidates) > 0 else None
+
+
+def guess_chain_infos_from_addresses(addresses: Iterable[str]) -> List[Optional[Type['ChainInfo']]]:
+    """Batch version of guess_chain_info_from_address(). See AddressClassifier.best_chain_infos()."""
+    addresses = list(addresses)
+    chain_infos = ADDRESS_CLASSIFIER.best_chain_infos(addresses)
+    return [chain_infos[address] for address in addresses]
+
+
+def candidate_chain_infos(address: str) -> List[Type['ChainInfo']]:
+    """All the chains 'address' could be on, most likely first (checksummed formats beat unchecked ones)."""
+    return [chain_info for chain_info, _match_level in ADDRESS_CLASSIFIER.candidates(address)]
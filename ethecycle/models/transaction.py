@@ -2,25 +2,25 @@ import csv
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Type, Union
+from typing import Any, Callable, Iterable, List, Optional, Type, Union
 
 from rich.pretty import pprint
 from rich.text import Text
 
 from ethecycle.blockchains.chain_info import ChainInfo
 from ethecycle.models.token import Token
+from ethecycle.models.txn_filter import TxnFilter
+from ethecycle.util.block_index import BlockIndex
+from ethecycle.util.compressed_file import csv_rows as compressed_csv_rows, is_compressed
+from ethecycle.util.csv_helper import RAW_TXN_DATA_CSV_COLS
+from ethecycle.util.logging import log
+from ethecycle.util.progress import LoadProgress
 from ethecycle.util.string_constants import *
 
-# Expected column order for source CSVs.
-RAW_TXN_DATA_CSV_COLS = [
-    TOKEN_ADDRESS,
-    FROM_ADDRESS,
-    TO_ADDRESS,
-    'value',  # num_tokens
-    TRANSACTION_HASH,
-    LOG_INDEX,
-    BLOCK_NUMBER
-]
+PARQUET_EXTENSION = '.parquet'
+
+# Raw txn columns that can't be empty (empty addresses are allowed and handled downstream)
+REQUIRED_RAW_TXN_DATA_COLS = ['value', TRANSACTION_HASH, LOG_INDEX, BLOCK_NUMBER]
 
 # Columns for Neo4j import
 NEO4J_TXN_CSV_COLS = [
@@ -79,26 +79,106 @@ class Txn():
 
         return row
 
+    @classmethod
+    def extract_from_file(
+            cls,
+            file_path: str,
+            chain_info: Type['ChainInfo'],
+            extracted_at: str,
+            txn_filter: Optional[TxnFilter] = None,
+            progress: Optional[LoadProgress] = None
+        ) -> List['Txn']:
+        """Extract txns from a Parquet file or a headerless CSV depending on the file extension."""
+        if file_path.endswith(PARQUET_EXTENSION):
+            return cls.extract_from_parquet(file_path, chain_info, extracted_at, txn_filter, progress)
+        else:
+            return cls.extract_from_csv(file_path, chain_info, extracted_at, txn_filter, progress)
+
     @classmethod
     def extract_from_csv(
             cls,
             csv_path: str,
             chain_info: Type['ChainInfo'],
             extracted_at: str,
-            token: Optional['str']
+            txn_filter: Optional[TxnFilter] = None,
+            progress: Optional[LoadProgress] = None
         ) -> List['Txn']:
-        """Load txions from a headerless CSV to list of Txn objects."""
+        """
+        Load txions from a headerless CSV to list of Txn objects, skipping rows that don't pass 'txn_filter'.
+        Block range filters use the CSV's BlockIndex to skip chunks of the file that are out of range.
+        gzip, zstd and bz2 compressed CSVs are decompressed on the fly (the block index isn't used for them).
+        Rows read are counted by 'progress' (bytes read too, but only for uncompressed CSVs read in full).
+        """
+        if is_compressed(csv_path):
+            return cls._build_txns(compressed_csv_rows(csv_path), chain_info, extracted_at, txn_filter, progress)
+        elif txn_filter and txn_filter.has_block_range:
+            rows = BlockIndex(csv_path).rows_in_block_range(txn_filter.from_block, txn_filter.to_block)
+            return cls._build_txns(rows, chain_info, extracted_at, txn_filter, progress)
+
         with open(csv_path, newline='') as csvfile:
-            txns = [Txn(*(row + [chain_info])) for row in csv.reader(csvfile, delimiter=',')]
+            rows = csv.reader(csvfile, delimiter=',')
+            # The raw file's position can be checked mid iteration (the text wrapper's tell() can't)
+            position = csvfile.buffer.raw.tell
+            return cls._build_txns(rows, chain_info, extracted_at, txn_filter, progress, position)
+
+    @classmethod
+    def _build_txns(
+            cls,
+            rows: Iterable[List[str]],
+            chain_info: Type['ChainInfo'],
+            extracted_at: str,
+            txn_filter: Optional[TxnFilter] = None,
+            progress: Optional[LoadProgress] = None,
+            position: Optional[Callable[[], int]] = None
+        ) -> List['Txn']:
+        if progress:
+            rows = progress.track_rows(rows, position)
+
+        if txn_filter:
+            rows = (row for row in rows if txn_filter.is_match(row))
 
         # Fill in extracted_at so all records in same job have same timestamp
-        for txn in txns:
-            txn.extracted_at = extracted_at
+        return [Txn(*row, chain_info, extracted_at) for row in rows]
 
-        # Optionally filter for a singly token symbol
-        if token:
-            token_address = Token.token_address(chain_info.chain_string(), token)
-            txns = [txn for txn in txns if txn.token_address == token_address]
+    @classmethod
+    def extract_from_parquet(
+            cls,
+            parquet_path: str,
+            chain_info: Type['ChainInfo'],
+            extracted_at: str,
+            txn_filter: Optional[TxnFilter] = None,
+            progress: Optional[LoadProgress] = None
+        ) -> List['Txn']:
+        """
+        Load txions from a Parquet file (or directory of Parquet files) with RAW_TXN_DATA_CSV_COLS columns.
+        Only those columns are read and the token/block filters are pushed down to the row group statistics
+        so row groups that can't contain matching txns are never read or decompressed.
+        """
+        try:
+            import pyarrow.dataset as ds
+        except ImportError:
+            raise ValueError("Reading Parquet files requires pyarrow ('pip install pyarrow')")
+
+        dataset = ds.dataset(parquet_path, format='parquet')
+        filter_expression = _arrow_filter_expression(ds, txn_filter)
+        row_groups = []
+        total_row_group_count = 0
+
+        for fragment in dataset.get_fragments(filter=filter_expression):
+            total_row_group_count += fragment.metadata.num_row_groups
+            row_groups.extend(fragment.split_by_row_group(filter_expression))
+
+        log.info(f"Reading {len(row_groups)} of {total_row_group_count} row groups in '{parquet_path}' ({txn_filter})")
+        txns = []
+
+        for row_group in row_groups:
+            for batch in row_group.to_batches(columns=RAW_TXN_DATA_CSV_COLS, filter=filter_expression):
+                _check_for_nulls(batch, parquet_path)
+                columns = [_none_to_empty_string(batch.column(col).to_pylist()) for col in RAW_TXN_DATA_CSV_COLS]
+                txns.extend(Txn(*row, chain_info, extracted_at) for row in zip(*columns))
+
+                if progress:
+                    progress.add_rows(batch.num_rows)
 
         return txns
 
@@ -122,3 +202,45 @@ class Txn():
 
     def __eq__(self, other: 'Txn'):
         return self.transaction_id == other.transaction_id
+
+
+def _arrow_filter_expression(ds, txn_filter: Optional[TxnFilter]) -> Optional['ds.Expression']:
+    """Translate a TxnFilter to a pyarrow dataset expression that can be checked against row group stats."""
+    if txn_filter is None:
+        return None
+
+    expressions = []
+
+    if txn_filter.token_address is not None:
+        expressions.append(ds.field(TOKEN_ADDRESS) == txn_filter.token_address)
+    if txn_filter.from_block is not None:
+        expressions.append(ds.field(BLOCK_NUMBER) >= txn_filter.from_block)
+    if txn_filter.to_block is not None:
+        expressions.append(ds.field(BLOCK_NUMBER) <= txn_filter.to_block)
+    if txn_filter.addresses is not None:
+        addresses = list(txn_filter.addresses)
+        expressions.append(ds.field(FROM_ADDRESS).isin(addresses) | ds.field(TO_ADDRESS).isin(addresses))
+
+    if len(expressions) == 0:
+        return None
+
+    filter_expression = expressions[0]
+
+    for expression in expressions[1:]:
+        filter_expression = filter_expression & expression
+
+    return filter_expression
+
+
+def _check_for_nulls(batch: 'pa.RecordBatch', parquet_path: str) -> None:
+    """Raise if any column that can't be empty in a source CSV has nulls (addresses can be empty)."""
+    for col in REQUIRED_RAW_TXN_DATA_COLS:
+        null_count = batch.column(col).null_count
+
+        if null_count > 0:
+            raise ValueError(f"'{parquet_path}' has {null_count} null values in required column '{col}'")
+
+
+def _none_to_empty_string(values: List[Any]) -> List[Any]:
+    """Parquet nulls in address columns become empty strings to match what csv.reader() produces."""
+    return ['' if value is None else value for value in values]
@@ -0,0 +1,100 @@
+"""
+Filters that can be applied to txns while they are being extracted from source files. Filters are
+applied to raw rows before any Txn objects are built and can be pushed down to the Parquet reader.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, Sequence, Set
+
+from ethecycle.models.blockchain import get_chain_info
+from ethecycle.models.token import Token
+from ethecycle.util.csv_helper import BLOCK_NUMBER_IDX, FROM_ADDRESS_IDX, TO_ADDRESS_IDX, TOKEN_ADDRESS_IDX
+from ethecycle.util.filesystem_helper import get_lines
+
+
+@dataclass
+class TxnFilter:
+    token_address: Optional[str] = None
+    from_block: Optional[int] = None
+    to_block: Optional[int] = None
+    # Watchlist: only txns to or from one of these addresses pass
+    addresses: Optional[Set[str]] = None
+
+    @classmethod
+    def build(
+            cls,
+            blockchain: str,
+            token: Optional[str] = None,
+            from_block: Optional[int] = None,
+            to_block: Optional[int] = None,
+            address_file: Optional[str] = None
+        ) -> Optional['TxnFilter']:
+        """
+        Alternate constructor that looks up the address for a 'token' symbol and reads the watchlist
+        addresses (one per line, '#' for comments) from 'address_file'. Returns None if no filters.
+        """
+        if token is None and from_block is None and to_block is None and address_file is None:
+            return None
+
+        if from_block is not None and to_block is not None and from_block > to_block:
+            raise ValueError(f"from_block {from_block} is after to_block {to_block}")
+
+        token_address = Token.token_address(blockchain, token) if token else None
+        addresses = _read_address_file(blockchain, address_file) if address_file else None
+        return cls(token_address=token_address, from_block=from_block, to_block=to_block, addresses=addresses)
+
+    @property
+    def has_block_range(self) -> bool:
+        return self.from_block is not None or self.to_block is not None
+
+    def is_match(self, row: Sequence) -> bool:
+        """True if a raw source row (in RAW_TXN_DATA_CSV_COLS order) passes the filter."""
+        if self.token_address is not None and row[TOKEN_ADDRESS_IDX] != self.token_address:
+            return False
+
+        if self.addresses is not None \
+                and row[FROM_ADDRESS_IDX] not in self.addresses \
+                and row[TO_ADDRESS_IDX] not in self.addresses:
+            return False
+
+        if not self.has_block_range:
+            return True
+
+        return self.is_block_in_range(int(row[BLOCK_NUMBER_IDX]))
+
+    def is_block_in_range(self, block_number: int) -> bool:
+        if self.from_block is not None and block_number < self.from_block:
+            return False
+
+        return self.to_block is None or block_number <= self.to_block
+
+    def fingerprint(self) -> str:
+        """Like str() but with a sha256 of the sorted watchlist addresses so different watchlists never match."""
+        filters = [f"{k}={v}" for k, v in vars(self).items() if v is not None and k != 'addresses']
+
+        if self.addresses is not None:
+            addresses_hash = hashlib.sha256('\n'.join(sorted(self.addresses)).encode()).hexdigest()
+            filters.append(f"addresses=sha256:{addresses_hash}")
+
+        return f"TxnFilter({', '.join(filters)})"
+
+    def __str__(self) -> str:
+        filters = [f"{k}={v}" for k, v in vars(self).items() if v is not None and k != 'addresses']
+
+        if self.addresses is not None:
+            filters.append(f"addresses=<{len(self.addresses)} addresses>")
+
+        return f"TxnFilter({', '.join(filters)})"
+
+
+def _read_address_file(blockchain: str, address_file: str) -> Set[str]:
+    """Lowercase addresses on chains where source data addresses are lowercase but watchlists may be checksummed."""
+    addresses = set(line for line in get_lines(address_file) if len(line) > 0)
+
+    if get_chain_info(blockchain).HAS_CASE_INSENSITIVE_ADDRESSES:
+        addresses = set(address.lower() for address in addresses)
+
+    if len(addresses) == 0:
+        raise ValueError(f"No addresses found in '{address_file}'")
+
+    return addresses
@@ -8,51 +8,137 @@ from typing import List, Optional
 from rich.text import Text
 
 from ethecycle.config import Config
+from ethecycle.export.graph_exporters import build_graph_exporters
 from ethecycle.export.neo4j_csv import HEADER, Neo4jCsvs
 from ethecycle.models.blockchain import get_chain_info
 from ethecycle.models.transaction import Txn
+from ethecycle.models.txn_filter import TxnFilter
+from ethecycle.models.wallet import Wallet
 from ethecycle.util.filesystem_helper import OUTPUT_DIR
-from ethecycle.util.logging import console, log, print_benchmark
+from ethecycle.util.logging import console, log, print_benchmark, print_dim
+from ethecycle.util.metrics import ENRICH, EXPORT, EXTRACT, NEO4J_ADMIN_IMPORT, LoadMetrics
 from ethecycle.util.neo4j_helper import admin_load_bash_command, import_to_neo4j
+from ethecycle.util.progress import LoadProgress
+from ethecycle.util.run_manifest import FAILED, LOADED, LOADING, TRANSFORMED, RunManifest
 from ethecycle.util.string_constants import *
-from ethecycle.util.time_helper import current_timestamp_iso8601_str
 
 
-def load_into_neo4j(txn_csvs: List[str], blockchain: str, token: Optional[str] = None) -> None:
+def load_into_neo4j(
+        txn_csvs: List[str],
+        blockchain: str,
+        txn_filter: Optional[TxnFilter] = None,
+        export_formats: Optional[List[str]] = None
+    ) -> None:
     """
-    ETL that loads chain txion CSVs into Neo4j, optionally filtered for 'token' arg.
+    ETL that loads chain txion CSVs (or Parquet files) into Neo4j, optionally filtered by 'txn_filter'.
     CSVs will be deleted after successful load unless the 'preserve_csvs' arg is set to True.
+    Each source CSV is only read and transformed once; the results are also passed to the exporters
+    for any 'export_formats' (see graph_exporters.py) so other graph formats come along for free.
+    Per stage metrics are written to OUTPUT_DIR if Config.metrics_format is set (see metrics.py).
+    Progress is recorded in a RunManifest; with Config.resume the Neo4j CSVs of source files that an
+    earlier failed run already transformed are reused instead of being extracted and transformed again.
     """
-    extracted_at = current_timestamp_iso8601_str()
     start_time = time.perf_counter()
     chain_info = get_chain_info(blockchain)
+    txn_filter_fingerprint = txn_filter.fingerprint() if txn_filter else str(None)
+    manifest = RunManifest.load_or_create(blockchain, txn_filter_fingerprint, Config.resume)
+    # Resumed runs keep the original run's timestamp so all records in the same job have the same one
+    extracted_at = manifest.extracted_at
+    completed_records = {txn_csv: manifest.completed_record(txn_csv) for txn_csv in txn_csvs}
+    pending_csvs = [txn_csv for txn_csv, record in completed_records.items() if record is None]
+
+    if export_formats and len(pending_csvs) < len(txn_csvs):
+        raise ValueError("--resume can't skip already transformed files when exporting other formats")
+
+    progress = LoadProgress(pending_csvs)
+    metrics = LoadMetrics(labels={'blockchain': blockchain}, profile=Config.profile, progress=progress)
     neo4j_csvs = [Neo4jCsvs(HEADER)]
+    graph_exporters = build_graph_exporters(export_formats or [], blockchain)
+
+    with progress:
+        for txn_csv in txn_csvs:
+            source = path.basename(txn_csv)
+            record = completed_records[txn_csv]
+
+            if record:
+                print_dim(f"Reusing the {record.txn_count} txns already transformed from '{source}'...")
+                neo4j_csvs.append(Neo4jCsvs.from_existing_csvs(record.wallet_csv_path, record.txn_csv_path))
+                continue
+
+            start_file_time = time.perf_counter()
+            progress.start_file(txn_csv)
+
+            with metrics.stage(EXTRACT, source, bytes=progress.file_sizes[txn_csv]) as stage:
+                txns = Txn.extract_from_file(txn_csv, chain_info, extracted_at, txn_filter, progress)
+                stage.rows = len(txns)
+
+            duration = print_benchmark(f"Extracted {len(txns)} from source file", start_file_time)
+
+            with metrics.stage(ENRICH, source, len(txns)):
+                wallets = Wallet.extract_wallets_from_transactions(txns)
+
+            neo4j_csvs.append(Neo4jCsvs(txns, wallets, metrics))
+            manifest.record_transformed(
+                txn_csv,
+                neo4j_csvs[-1].wallet_csv_path,
+                neo4j_csvs[-1].txn_csv_path,
+                len(txns),
+                len(wallets)
+            )
 
-    for txn_csv in txn_csvs:
-        start_file_time = time.perf_counter()
-        txns = Txn.extract_from_csv(txn_csv, chain_info, extracted_at, token)
-        duration = print_benchmark(f"Extracted {len(txns)} from source CSV", start_file_time)
-        neo4j_csvs.append(Neo4jCsvs(txns))
-        print_benchmark(f"Generated CSVs for '{path.basename(txn_csv)}'", start_file_time + duration)
+            for graph_exporter in graph_exporters:
+                with metrics.stage(f"{EXPORT}_{graph_exporter.FORMAT}", source, len(txns)):
+                    graph_exporter.add_txns(txns, wallets)
+
+            progress.finish_file()
+            print_benchmark(f"Generated CSVs for '{source}'", start_file_time + duration)
+
+    for graph_exporter in graph_exporters:
+        with metrics.stage(f"{EXPORT}_{graph_exporter.FORMAT}"):
+            graph_exporter.finish()
 
     # Create neo4j-admin shell command that will bulk load all the Neo4j CSVs we just extracted/transformed.
     bulk_load_shell_command = admin_load_bash_command(neo4j_csvs)
     print_benchmark(f"\nProcessed {len(txn_csvs)} CSVs", start_time, indent_level=0, style='yellow')
+    manifest.set_status(TRANSFORMED)
 
-    if Config.extract_only:
-        print("\n" + bulk_load_shell_command)  # Use regular print() because console.print() does weird line wraps
-        console.print("\n     --extract-only mode; not executing load. Above command can be run manually.", style='red bold')
-    elif Config.drop_database:
-        import_to_neo4j(bulk_load_shell_command)
-    else:
-        print("\n" + bulk_load_shell_command)
-        raise ValueError("Incremental load doesn't work yet)")
-        with stop_database() as context:
-            _import_to_neo4j(bulk_load_shell_command)
+    # Metrics are written even if the import fails so the transform stages' numbers aren't lost
+    try:
+        if Config.extract_only:
+            print("\n" + bulk_load_shell_command)  # Use regular print() because console.print() does weird line wraps
+            msg = "\n     --extract-only mode; not executing load. Above command can be run manually."
+            console.print(msg, style='red bold')
+        elif Config.drop_database:
+            txn_count = manifest.txn_count(txn_csvs)
+            manifest.set_status(LOADING)
+
+            with metrics.stage(NEO4J_ADMIN_IMPORT, rows=txn_count):
+                import_to_neo4j(bulk_load_shell_command)
+
+            manifest.set_status(LOADED)
+        else:
+            print("\n" + bulk_load_shell_command)
+            raise ValueError("Incremental load doesn't work yet)")
+            with stop_database() as context:
+                _import_to_neo4j(bulk_load_shell_command)
+    except Exception:
+        manifest.set_status(FAILED)
+        console.print(f"Load failed. Rerun with --resume to reuse the CSVs in '{OUTPUT_DIR}'.", style='red')
+        raise
+    finally:
+        _report_metrics(metrics)
 
     _clean_up(neo4j_csvs)
 
 
+def _report_metrics(metrics: LoadMetrics) -> None:
+    """Print the per stage summary and write the metrics file if Config.metrics_format is set."""
+    metrics.print_summary()
+
+    if Config.metrics_format:
+        metrics.write(Config.metrics_format)
+
+
 def _clean_up(neo4j_csvs: List[Neo4jCsvs]) -> None:
     """Remove CSVs that were successfully loaded and other maintenance"""
     console.line()
@@ -0,0 +1,112 @@
+"""
+Sidecar index of the min/max block_number in each ~BLOCK_INDEX_CHUNK_SIZE byte chunk of a source txn CSV.
+Lets block range filters seek past the parts of a multi-GB dump that can't contain matching txns
+without reading or parsing them. The index is built as a byproduct of the first full read of a CSV,
+stored as a hidden JSON file next to it (so files_in_dir() doesn't pick it up), and thrown away if
+the CSV's size or mtime changes.
+"""
+import csv
+import io
+import json
+import os
+from os import path
+from typing import Iterator, List, Optional, Tuple
+
+from ethecycle.util.csv_helper import BLOCK_NUMBER_IDX
+from ethecycle.util.logging import log
+from ethecycle.util.number_helper import MEGABYTE
+
+BLOCK_INDEX_CHUNK_SIZE = 16 * MEGABYTE
+
+# (byte offset, byte length, min block_number, max block_number)
+Chunk = Tuple[int, int, int, int]
+
+
+class BlockIndex:
+    def __init__(self, csv_path: str, chunk_size: int = BLOCK_INDEX_CHUNK_SIZE) -> None:
+        self.csv_path = csv_path
+        self.chunk_size = chunk_size
+        self.index_path = path.join(path.dirname(csv_path), f".{path.basename(csv_path)}.block_index.json")
+        self.chunks: Optional[List[Chunk]] = self._load()
+
+    def rows_in_block_range(self, from_block: Optional[int], to_block: Optional[int]) -> Iterator[List[str]]:
+        """
+        Yield raw CSV rows from every chunk that might contain blocks in [from_block, to_block]. Rows in
+        those chunks that are outside the range are still yielded so callers must filter them themselves.
+        """
+        if self.chunks is None:
+            yield from self._build_while_reading()
+            return
+
+        chunks = [c for c in self.chunks if _overlaps(c, from_block, to_block)]
+        log.info(f"Block index: reading {len(chunks)} of {len(self.chunks)} chunks of '{self.csv_path}'")
+
+        with open(self.csv_path, 'rb') as csvfile:
+            for offset, length, _min_block, _max_block in chunks:
+                csvfile.seek(offset)
+                yield from _csv_rows(csvfile.read(length))
+
+    def _build_while_reading(self) -> Iterator[List[str]]:
+        """Read the whole CSV chunk by chunk, yielding all the rows and recording each chunk's block range."""
+        log.info(f"Building block index for '{self.csv_path}'...")
+        chunks = []
+
+        with open(self.csv_path, 'rb') as csvfile:
+            while True:
+                offset = csvfile.tell()
+                data = csvfile.read(self.chunk_size)
+
+                if not data:
+                    break
+
+                # Extend the chunk to the end of the current line so chunks only contain whole rows
+                data += csvfile.readline()
+                rows = _csv_rows(data)
+
+                if len(rows) > 0:
+                    block_numbers = [int(row[BLOCK_NUMBER_IDX]) for row in rows]
+                    chunks.append((offset, len(data), min(block_numbers), max(block_numbers)))
+
+                yield from rows
+
+        self.chunks = chunks
+        self._save()
+
+    def _load(self) -> Optional[List[Chunk]]:
+        if not path.isfile(self.index_path):
+            return None
+
+        try:
+            with open(self.index_path) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable block index '{self.index_path}': {e}")
+            return None
+
+        if index.get('file_stat') != self._file_stat() or index.get('chunk_size') != self.chunk_size:
+            log.info(f"'{self.csv_path}' has changed since its block index was built; rebuilding...")
+            return None
+
+        return [tuple(chunk) for chunk in index['chunks']]
+
+    def _save(self) -> None:
+        index = {'file_stat': self._file_stat(), 'chunk_size': self.chunk_size, 'chunks': self.chunks}
+
+        try:
+            with open(self.index_path, 'w') as index_file:
+                json.dump(index, index_file)
+        except OSError as e:
+            log.warning(f"Couldn't write block index '{self.index_path}' (next run will rebuild it): {e}")
+
+    def _file_stat(self) -> List[int]:
+        stat = os.stat(self.csv_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+
+def _overlaps(chunk: Chunk, from_block: Optional[int], to_block: Optional[int]) -> bool:
+    _offset, _length, min_block, max_block = chunk
+    return (from_block is None or max_block >= from_block) and (to_block is None or min_block <= to_block)
+
+
+def _csv_rows(data: bytes) -> List[List[str]]:
+    return [row for row in csv.reader(io.StringIO(data.decode(), newline='')) if row]
@@ -0,0 +1,221 @@
+"""
+Read gzip, zstd and bz2 compressed source files without decompressing them to disk first.
+
+Files made of independently compressed blocks are decompressed on a thread pool (zlib and zstandard
+both release the GIL while they work) with a bounded number of blocks in flight so memory use stays flat:
+  * BGZF gzip files (as written by 'bgzip' from htslib) - block sizes are in each gzip member's header
+  * Seekable zstd files (as written by 'zstd --seekable' / 't2sz') - frame sizes are in the seek table
+Any other gzip or zstd file and all bz2 files are decompressed as a single stream.
+"""
+import bz2
+import csv
+import gzip
+import io
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from ethecycle.util.filesystem_helper import GZIP_EXTENSION
+from ethecycle.util.logging import log
+from ethecycle.util.number_helper import MEGABYTE
+
+BZ2_EXTENSION = '.bz2'
+ZSTD_EXTENSION = '.zst'
+COMPRESSED_EXTENSIONS = [BZ2_EXTENSION, GZIP_EXTENSION, ZSTD_EXTENSION]
+
+DECOMPRESSION_THREADS = min(8, cpu_count() or 1)
+STREAM_READ_SIZE = 4 * MEGABYTE
+# Contiguous compressed blocks are handed to the thread pool in batches of about this size
+BLOCK_BATCH_SIZE = 4 * MEGABYTE
+
+# BGZF header: gzip magic, deflate, FEXTRA flag ... and a 'BC' extra subfield holding the block size
+BGZF_HEADER = struct.Struct('<4BI2BH2BHH')
+BGZF_MAGIC = (0x1f, 0x8b, 8, 4)
+
+# Zstd seekable format: https://github.com/facebook/zstd/blob/dev/contrib/seekable_format/zstd_seekable_compression_format.md
+ZSTD_SEEKABLE_FOOTER = struct.Struct('<IBI')
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+ZSTD_SEEK_TABLE_CHECKSUM_FLAG = 0x80
+
+
+def is_compressed(file_path: str) -> bool:
+    return any(file_path.endswith(extension) for extension in COMPRESSED_EXTENSIONS)
+
+
+def csv_rows(file_path: str) -> Iterator[List[str]]:
+    """Yield rows of a compressed headerless CSV."""
+    for text in decompressed_text(file_path):
+        yield from csv.reader(io.StringIO(text, newline=''), delimiter=',')
+
+
+def decompressed_text(file_path: str) -> Iterator[str]:
+    """Yield decoded text of a compressed file in chunks that always end on a line boundary."""
+    partial_line = b''
+
+    for data in decompressed_chunks(file_path):
+        data = partial_line + data
+        line_end = data.rfind(b'\n') + 1
+        partial_line = data[line_end:]
+
+        if line_end > 0:
+            yield data[:line_end].decode()
+
+    if partial_line:
+        yield partial_line.decode()
+
+
+def decompressed_chunks(file_path: str, threads: int = DECOMPRESSION_THREADS) -> Iterator[bytes]:
+    """Yield decompressed bytes in file order, decompressing independent blocks in parallel where possible."""
+    block_spans: Optional[List[Tuple[int, int]]] = None
+
+    if file_path.endswith(GZIP_EXTENSION):
+        block_spans = _bgzf_block_spans(file_path)
+        decompress = gzip.decompress
+    elif file_path.endswith(ZSTD_EXTENSION):
+        block_spans = _zstd_seekable_frame_spans(file_path)
+        decompress = _zstd_decompressor()
+    elif not file_path.endswith(BZ2_EXTENSION):
+        raise ValueError(f"'{file_path}' is not a compressed file")
+
+    if block_spans is None or threads <= 1:
+        log.debug(f"Decompressing '{file_path}' as a single stream...")
+        yield from _stream_chunks(file_path)
+        return
+
+    log.debug(f"Decompressing {len(block_spans)} blocks of '{file_path}' with {threads} threads...")
+    yield from _parallel_decompress(file_path, _batch_spans(block_spans), decompress, threads)
+
+
+def _parallel_decompress(
+        file_path: str,
+        spans: List[Tuple[int, int]],
+        decompress: Callable[[bytes], bytes],
+        threads: int
+    ) -> Iterator[bytes]:
+    """Decompress spans on a thread pool, keeping at most 2 * threads spans in memory at once."""
+    max_in_flight = 2 * threads
+    futures = deque()
+
+    with open(file_path, 'rb') as compressed_file, ThreadPoolExecutor(threads) as executor:
+        for offset, length in spans:
+            if len(futures) >= max_in_flight:
+                yield futures.popleft().result()
+
+            compressed_file.seek(offset)
+            futures.append(executor.submit(decompress, compressed_file.read(length)))
+
+        while futures:
+            yield futures.popleft().result()
+
+
+def _stream_chunks(file_path: str) -> Iterator[bytes]:
+    if file_path.endswith(GZIP_EXTENSION):
+        stream = gzip.open(file_path, 'rb')
+    elif file_path.endswith(BZ2_EXTENSION):
+        stream = bz2.open(file_path, 'rb')
+    else:
+        stream = _zstd_stream(file_path)
+
+    with stream:
+        while data := stream.read(STREAM_READ_SIZE):
+            yield data
+
+
+def _bgzf_block_spans(file_path: str) -> Optional[List[Tuple[int, int]]]:
+    """(offset, length) of every BGZF block in the file or None if it's not a BGZF file."""
+    spans = []
+    file_size = path.getsize(file_path)
+
+    with open(file_path, 'rb') as gzip_file:
+        offset = 0
+
+        while offset < file_size:
+            gzip_file.seek(offset)
+            header = gzip_file.read(BGZF_HEADER.size)
+
+            if len(header) < BGZF_HEADER.size:
+                return None
+
+            fields = BGZF_HEADER.unpack(header)
+
+            # fields[8:11] are the extra subfield id ('B', 'C') and its length (2)
+            if fields[0:4] != BGZF_MAGIC or fields[8:11] != (66, 67, 2):
+                return None
+
+            block_size = fields[11] + 1
+            spans.append((offset, block_size))
+            offset += block_size
+
+    return spans
+
+
+def _zstd_seekable_frame_spans(file_path: str) -> Optional[List[Tuple[int, int]]]:
+    """(offset, length) of every frame listed in a seekable zstd file's seek table or None if there isn't one."""
+    file_size = path.getsize(file_path)
+
+    if file_size < ZSTD_SEEKABLE_FOOTER.size:
+        return None
+
+    with open(file_path, 'rb') as zstd_file:
+        zstd_file.seek(file_size - ZSTD_SEEKABLE_FOOTER.size)
+        num_frames, descriptor, magic = ZSTD_SEEKABLE_FOOTER.unpack(zstd_file.read(ZSTD_SEEKABLE_FOOTER.size))
+
+        if magic != ZSTD_SEEKABLE_MAGIC:
+            return None
+
+        entry_size = 12 if descriptor & ZSTD_SEEK_TABLE_CHECKSUM_FLAG else 8
+        seek_table_size = num_frames * entry_size
+        zstd_file.seek(file_size - ZSTD_SEEKABLE_FOOTER.size - seek_table_size)
+        seek_table = zstd_file.read(seek_table_size)
+
+    spans = []
+    offset = 0
+
+    for i in range(num_frames):
+        compressed_size = struct.unpack_from('<I', seek_table, i * entry_size)[0]
+        spans.append((offset, compressed_size))
+        offset += compressed_size
+
+    return spans
+
+
+def _batch_spans(spans: List[Tuple[int, int]], batch_size: int = BLOCK_BATCH_SIZE) -> List[Tuple[int, int]]:
+    """Merge runs of contiguous small blocks (BGZF blocks are <= 64KB) into ~batch_size spans."""
+    batches = []
+
+    for offset, length in spans:
+        if batches and batches[-1][1] < batch_size:
+            batch_offset, batch_length = batches[-1]
+            batches[-1] = (batch_offset, batch_length + length)
+        else:
+            batches.append((offset, length))
+
+    return batches
+
+
+def _zstd_decompressor() -> Callable[[bytes], bytes]:
+    """Returns a function that decompresses one or more complete zstd frames."""
+    zstandard = _import_zstandard()
+
+    def decompress(data: bytes) -> bytes:
+        # ZstdDecompressor objects aren't thread safe so each call gets its own
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True) as reader:
+            return reader.read()
+
+    return decompress
+
+
+def _zstd_stream(file_path: str) -> io.BufferedIOBase:
+    zstandard = _import_zstandard()
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True, closefd=True)
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("Reading .zst files requires zstandard ('pip install zstandard')")
+
+    return zstandard
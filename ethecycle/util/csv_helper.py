@@ -8,6 +8,24 @@ from rich.text import Text
 
 from ethecycle.util.filesystem_helper import file_size_string
 from ethecycle.util.logging import console
+from ethecycle.util.string_constants import *
+
+# Expected column order for source CSVs (and columns of source Parquet files)
+RAW_TXN_DATA_CSV_COLS = [
+    TOKEN_ADDRESS,
+    FROM_ADDRESS,
+    TO_ADDRESS,
+    'value',  # num_tokens
+    TRANSACTION_HASH,
+    LOG_INDEX,
+    BLOCK_NUMBER
+]
+
+# Column positions in raw source rows
+TOKEN_ADDRESS_IDX = RAW_TXN_DATA_CSV_COLS.index(TOKEN_ADDRESS)
+FROM_ADDRESS_IDX = RAW_TXN_DATA_CSV_COLS.index(FROM_ADDRESS)
+TO_ADDRESS_IDX = RAW_TXN_DATA_CSV_COLS.index(TO_ADDRESS)
+BLOCK_NUMBER_IDX = RAW_TXN_DATA_CSV_COLS.index(BLOCK_NUMBER)
 
 
 def write_list_of_lists_to_csv(csv_path: str, objs: List[Any]) -> None:
@@ -3,6 +3,7 @@ Functions and constants having to do with the filesystem.
 importlib explanation: https://fossies.org/linux/Python/Lib/importlib/resources.py
 """
 import gzip
+import hashlib
 import importlib.resources
 import os
 import re
@@ -44,7 +45,7 @@ CHAIN_ADDRESS_DATA_DIR = os.environ['CHAIN_ADDRESS_DATA_DIR']
 
 def files_in_dir(dir: Union[os.PathLike, str], with_extname: Optional[str] = None) -> List[str]:
     """paths for non-hidden files, optionally ending in 'with_extname'"""
-    files = [file for file in _non_hidden_files_in_dir(dir) if not path.isdir(file)]
+    files = [entry.path for entry in _non_hidden_dir_entries(dir) if not entry.is_dir()]
 
     if with_extname:
         files = [f for f in files if f.endswith(f".{with_extname}")]
@@ -54,7 +55,7 @@ def files_in_dir(dir: Union[os.PathLike, str], with_extname: Optional[str] = Non
 
 def subdirs_of_dir(dir: Union[os.PathLike, str]) -> List[str]:
     """Find non-hidden subdirs in 'dir'."""
-    return [file for file in _non_hidden_files_in_dir(dir) if path.isdir(file)]
+    return [entry.path for entry in _non_hidden_dir_entries(dir) if entry.is_dir()]
 
 
 def get_lines(file_path: str, comment_char: Optional[str] = '#') -> List[str]:
@@ -76,6 +77,18 @@ def file_size_string(file_path: str) -> str:
     return "File size: " + size_string(path.getsize(file_path))
 
 
+def file_fingerprint(*file_paths: str) -> str:
+    """sha256 of the contents of 'file_paths' (in the order given)."""
+    sha256 = hashlib.sha256()
+
+    for file_path in file_paths:
+        with open(file_path, 'rb') as file:
+            while data := file.read(1024 * 1024):
+                sha256.update(data)
+
+    return sha256.hexdigest()
+
+
 def is_running_in_container() -> bool:
     """Hacky way to guess if we're in a container or on the OS."""
     return str(PROJECT_ROOT_DIR).startswith(ETHECYCLE_DIR)
@@ -125,5 +138,7 @@ def split_big_file(file_path: str, lines_per_file: int = DEFAULT_LINES_PER_FILE)
     return files
 
 
-def _non_hidden_files_in_dir(dir: os.PathLike) -> List[str]:
-    return [path.join(dir, file) for file in os.listdir(dir) if not file.startswith('.')]
+def _non_hidden_dir_entries(dir: Union[os.PathLike, str]) -> List[os.DirEntry]:
+    """scandir() gets the file types along with the names so there's no extra stat() call per file."""
+    with os.scandir(dir) as entries:
+        return [entry for entry in entries if not entry.name.startswith('.')]
@@ -0,0 +1,95 @@
+"""
+Keccak-256 (the pre-standard SHA-3 Ethereum uses; hashlib's sha3_256 pads differently and gives
+different hashes). Uses pycryptodome's C implementation if it's installed, otherwise a pure python
+one that takes about half a millisecond per hash so only use it on short inputs like addresses.
+"""
+from typing import List
+
+try:
+    from Crypto.Hash import keccak as pycryptodome_keccak
+except ImportError:
+    pycryptodome_keccak = None
+
+RATE_BYTES = 136  # (1600 - 2 * 256) / 8
+LANE_MASK = (1 << 64) - 1
+
+# Rotation offset of lane (x, y) is at index x + 5 * y
+ROTATION_OFFSETS = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+]
+
+
+def _round_constants() -> List[int]:
+    """The 24 iota step constants, generated with the LFSR from the spec instead of typed out."""
+    constants = []
+    lfsr = 1
+
+    for _round in range(24):
+        constant = 0
+
+        for j in range(7):
+            lfsr = ((lfsr << 1) ^ ((lfsr >> 7) * 0x71)) % 256
+
+            if lfsr & 2:
+                constant ^= 1 << ((1 << j) - 1)
+
+        constants.append(constant)
+
+    return constants
+
+
+ROUND_CONSTANTS = _round_constants()
+# (destination, source, rotation offset) of each lane in the combined rho and pi steps
+RHO_PI_STEPS = [
+    (y + 5 * ((2 * x + 3 * y) % 5), x + 5 * y, ROTATION_OFFSETS[x + 5 * y])
+    for x in range(5)
+    for y in range(5)
+]
+
+
+def keccak256(data: bytes) -> bytes:
+    if pycryptodome_keccak is not None:
+        return pycryptodome_keccak.new(data=data, digest_bits=256).digest()
+
+    padded = bytearray(data) + b'\x01' + bytes(-(len(data) + 1) % RATE_BYTES)
+    padded[-1] |= 0x80
+    state = [0] * 25
+
+    for offset in range(0, len(padded), RATE_BYTES):
+        for i in range(RATE_BYTES // 8):
+            state[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], 'little')
+
+        state = _keccak_f(state)
+
+    return b''.join(lane.to_bytes(8, 'little') for lane in state[:4])
+
+
+def _keccak_f(state: List[int]) -> List[int]:
+    rotated = [0] * 25
+
+    for round_constant in ROUND_CONSTANTS:
+        # theta
+        c = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ _rotate(c[(x + 1) % 5], 1) for x in range(5)]
+
+        # rho and pi
+        for destination, source, offset in RHO_PI_STEPS:
+            lane = state[source] ^ d[source % 5]
+            rotated[destination] = ((lane << offset) | (lane >> (64 - offset))) & LANE_MASK
+
+        # chi and iota
+        for y in range(0, 25, 5):
+            b0, b1, b2, b3, b4 = rotated[y:y + 5]
+            state[y:y + 5] = [b0 ^ (~b1 & b2), b1 ^ (~b2 & b3), b2 ^ (~b3 & b4), b3 ^ (~b4 & b0), b4 ^ (~b0 & b1)]
+
+        state[0] ^= round_constant
+
+    return state
+
+
+def _rotate(lane: int, offset: int) -> int:
+    return ((lane << offset) | (lane >> (64 - offset))) & LANE_MASK
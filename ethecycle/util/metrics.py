@@ -0,0 +1,245 @@
+"""
+Per stage metrics for the transaction loader: wall time, CPU time, rows, bytes and peak RSS of each
+stage (extract, enrich, write wallets, etc.) of each source file. Written as JSON lines (one object per
+stage run) or in the Prometheus textfile collector format (summed per stage).
+
+With 'profile' on each stage also runs under cProfile (stats are dumped to a .prof file per stage run)
+and the main thread is renamed to the stage while it runs so 'py-spy record --threads' / 'py-spy dump'
+output shows which stage a sample came from.
+"""
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from os import path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from rich.table import Table
+
+from ethecycle.util.filesystem_helper import OUTPUT_DIR, timestamp_for_filename
+from ethecycle.util.logging import console, print_dim
+from ethecycle.util.number_helper import size_string
+
+if TYPE_CHECKING:
+    from ethecycle.util.progress import LoadProgress
+
+# Output formats
+JSONL = 'jsonl'
+PROMETHEUS = 'prometheus'
+METRICS_FORMATS = [JSONL, PROMETHEUS]
+METRICS_FILE_EXTENSIONS = {JSONL: '.jsonl', PROMETHEUS: '.prom'}
+
+# Loader stages
+EXTRACT = 'extract'  # Read and parse the source file into Txns (token symbol/decimals lookups included)
+ENRICH = 'enrich'  # Extract the wallets from the Txns and look up their labels
+WRITE_WALLETS = 'write_wallets'
+WRITE_TXNS = 'write_txns'
+EXPORT = 'export'  # Other graph formats (see graph_exporters.py)
+NEO4J_ADMIN_IMPORT = 'neo4j_admin_import'
+
+PROMETHEUS_PREFIX = 'ethecycle_load'
+# {metric name: HELP text}
+PROMETHEUS_METRICS = {
+    'wall_seconds': 'Wall clock seconds spent in the stage.',
+    'cpu_seconds': 'CPU seconds used by the loader process during the stage.',
+    'rows': 'Rows (txns or wallets) processed by the stage.',
+    'bytes': 'Bytes read (extract) or written (write_wallets, write_txns) by the stage.',
+    'peak_rss_bytes': 'Peak resident set size of the loader process during the stage.',
+}
+RSS_SAMPLE_INTERVAL_SECONDS = 0.01
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    source: Optional[str] = None  # Usually the basename of the file the stage was working on
+    rows: int = 0
+    bytes: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    started_at: float = 0.0  # Unix time, for lining stages up with py-spy recordings and system metrics
+    profile_path: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+@dataclass
+class LoadMetrics:
+    """Collects a StageMetrics for every stage() block."""
+    labels: Dict[str, str] = field(default_factory=dict)  # Added to every JSON line / Prometheus sample
+    profile: bool = False
+    output_dir: str = str(OUTPUT_DIR)
+    run_id: str = field(default_factory=timestamp_for_filename)
+    stages: List[StageMetrics] = field(default_factory=list)
+    # Told when each stage starts and finishes so it can show the current stage and its rows/sec
+    progress: Optional['LoadProgress'] = None
+
+    @contextmanager
+    def stage(
+            self,
+            stage: str,
+            source: Optional[str] = None,
+            rows: int = 0,
+            bytes: int = 0
+        ) -> Iterator[StageMetrics]:
+        """
+        Measure the block. Rows and bytes that aren't known up front can be set on the yielded StageMetrics.
+        Stages should not be nested when profiling (only one cProfile profiler can be active at a time).
+        """
+        stage_metrics = StageMetrics(stage, source, rows, bytes, started_at=time.time())
+
+        if self.progress:
+            self.progress.start_stage(stage)
+
+        profiler = cProfile.Profile() if self.profile else None
+        main_thread_name = threading.current_thread().name
+
+        with PeakRssSampler() as sampler:
+            start_time = time.perf_counter()
+            start_cpu_time = time.process_time()
+
+            if profiler:
+                threading.current_thread().name = f"stage:{stage}"
+                profiler.enable()
+
+            try:
+                yield stage_metrics
+            finally:
+                if profiler:
+                    profiler.disable()
+                    threading.current_thread().name = main_thread_name
+
+                stage_metrics.wall_seconds = time.perf_counter() - start_time
+                stage_metrics.cpu_seconds = time.process_time() - start_cpu_time
+
+        stage_metrics.peak_rss_bytes = sampler.peak_rss
+
+        if profiler:
+            stage_metrics.profile_path = self._output_path(f"profile_{len(self.stages):03d}_{stage}", '.prof')
+            profiler.dump_stats(stage_metrics.profile_path)
+
+        self.stages.append(stage_metrics)
+
+        if self.progress:
+            self.progress.finish_stage(stage_metrics)
+
+    def write(self, metrics_format: str) -> str:
+        """Write the metrics to a file in 'output_dir' in 'metrics_format' and return its path."""
+        if metrics_format not in METRICS_FORMATS:
+            raise ValueError(f"Unknown metrics format '{metrics_format}' (options: {METRICS_FORMATS})")
+
+        metrics_path = self._output_path('load_metrics', METRICS_FILE_EXTENSIONS[metrics_format])
+        contents = self.to_jsonl() if metrics_format == JSONL else self.to_prometheus()
+        tmp_path = metrics_path + '.tmp'
+
+        # Textfile collectors can read the file at any moment so it has to appear all at once
+        with open(tmp_path, 'w') as metrics_file:
+            metrics_file.write(contents)
+
+        os.replace(tmp_path, metrics_path)
+        print_dim(f"Wrote {metrics_format} load metrics to '{metrics_path}'")
+        return metrics_path
+
+    def to_jsonl(self) -> str:
+        lines = [
+            json.dumps({'run_id': self.run_id, **self.labels, **asdict(stage_metrics)})
+            for stage_metrics in self.stages
+        ]
+
+        return ''.join(line + '\n' for line in lines)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format. Values are summed over all runs of a stage (peak RSS is the max)."""
+        totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+        for stage_metrics in self.stages:
+            stage_totals = totals[stage_metrics.stage]
+            stage_totals['wall_seconds'] += stage_metrics.wall_seconds
+            stage_totals['cpu_seconds'] += stage_metrics.cpu_seconds
+            stage_totals['rows'] += stage_metrics.rows
+            stage_totals['bytes'] += stage_metrics.bytes
+            stage_totals['peak_rss_bytes'] = max(stage_totals['peak_rss_bytes'], stage_metrics.peak_rss_bytes)
+
+        lines = []
+
+        for metric, help_text in PROMETHEUS_METRICS.items():
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} gauge")
+
+            for stage, stage_totals in totals.items():
+                labels = ','.join(f'{k}="{v}"' for k, v in {**self.labels, 'stage': stage}.items())
+                lines.append(f"{PROMETHEUS_PREFIX}_{metric}{{{labels}}} {float(stage_totals[metric])!r}")
+
+        return '\n'.join(lines) + '\n'
+
+    def print_summary(self) -> None:
+        """Table of the totals for each stage."""
+        table = Table('Stage', 'Runs', 'Rows', 'Wall Seconds', 'CPU Seconds', 'Rows / Sec', 'Peak RSS', title='Stages')
+        stage_names = list(dict.fromkeys(stage_metrics.stage for stage_metrics in self.stages))
+
+        for stage in stage_names:
+            runs = [stage_metrics for stage_metrics in self.stages if stage_metrics.stage == stage]
+            rows = sum(stage_metrics.rows for stage_metrics in runs)
+            wall_seconds = sum(stage_metrics.wall_seconds for stage_metrics in runs)
+
+            table.add_row(
+                stage,
+                str(len(runs)),
+                f"{rows:,}",
+                f"{wall_seconds:,.2f}",
+                f"{sum(stage_metrics.cpu_seconds for stage_metrics in runs):,.2f}",
+                f"{rows / wall_seconds:,.0f}" if wall_seconds > 0 else '',
+                size_string(max(stage_metrics.peak_rss_bytes for stage_metrics in runs))
+            )
+
+        console.print(table)
+
+    def _output_path(self, label: str, extension: str) -> str:
+        return path.join(self.output_dir, f"{label}_{self.run_id}{extension}")
+
+
+class PeakRssSampler:
+    """
+    Tracks the peak resident set size while a block of code runs by polling /proc/self/statm on a
+    background thread. Where there's no /proc (macOS) it falls back to the process wide ru_maxrss high
+    water mark, which can't go down so it only says something for the first block that sets a new peak.
+    """
+    def __init__(self) -> None:
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> 'PeakRssSampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, current_rss())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL_SECONDS):
+            self.peak_rss = max(self.peak_rss, current_rss())
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (the peak so far if there's no /proc/self/statm)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024  # macOS reports bytes, Linux KB
+
@@ -31,7 +31,7 @@ SIZES = {
 
 def size_string(number: int) -> str:
     """Build a string representing 'number' as GB/MB/KB/etc."""
-    size_str = next(k for k in SIZES.keys() if number > SIZES[k])
+    size_str = next((k for k in SIZES.keys() if number >= SIZES[k]), BYTES)
     number_str = "{:,.2f}".format(float(number) / SIZES[size_str]) if size_str != BYTES else f"{number}"
     return f"{number_str} {size_str}"
 
@@ -0,0 +1,112 @@
+"""
+Parse lots of small files (e.g. the thousands of JSON files in some of the chain address repos) in a
+pool of processes. Results can be cached on disk by file path, size and mtime so a reimport only
+reparses the files that changed since the last one. The cache is thrown out if the parse function or
+anything else in its module's source has changed.
+"""
+import json
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count, path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ethecycle.util.filesystem_helper import file_fingerprint
+from ethecycle.util.logging import console, log
+
+DEFAULT_PARSER_PROCESSES = min(8, cpu_count() or 1)
+# Files are handed to the processes in chunks of this many to keep the IPC overhead down
+PARSER_CHUNK_SIZE = 64
+# Not worth starting processes for fewer files than this
+MIN_FILES_TO_PARALLELIZE = 2 * PARSER_CHUNK_SIZE
+
+# Must be a module level function so it can be pickled over to the worker processes
+ParseFxn = Callable[[str], Any]
+# (mtime in ns, size in bytes)
+FileStat = Tuple[int, int]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(file_path: str) -> Any:
+    """Read the whole file in one go and parse it with orjson if it's installed, otherwise the stdlib json."""
+    with open(file_path, 'rb') as json_file:
+        json_bytes = json_file.read()
+
+    return json.loads(json_bytes) if orjson is None else orjson.loads(json_bytes)
+
+
+def parse_files(
+        file_paths: List[str],
+        parse_fxn: ParseFxn,
+        cache_path: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Any]:
+    """
+    Returns [parse_fxn(file_path) for file_path in file_paths] computed in parallel. If 'cache_path'
+    is given results for files whose size and mtime haven't changed since the last call are read from
+    there instead (and it's rewritten with the current results).
+    """
+    parser_key = _parser_key(parse_fxn) if cache_path else None
+    cache = _load_cache(cache_path, parser_key) if cache_path else {}
+    file_stats = {file_path: _file_stat(file_path) for file_path in file_paths}
+    results = {fp: cache[fp][1] for fp in file_paths if fp in cache and cache[fp][0] == file_stats[fp]}
+    unparsed_paths = [fp for fp in file_paths if fp not in results]
+    max_workers = max_workers or DEFAULT_PARSER_PROCESSES
+    console.print(f"Parsing {len(unparsed_paths)} files ({len(results)} unchanged files cached)...", style='dim')
+
+    if max_workers == 1 or len(unparsed_paths) < MIN_FILES_TO_PARALLELIZE:
+        results.update({fp: parse_fxn(fp) for fp in unparsed_paths})
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            parsed = executor.map(parse_fxn, unparsed_paths, chunksize=PARSER_CHUNK_SIZE)
+            results.update(zip(unparsed_paths, parsed))
+
+    if cache_path:
+        _save_cache(cache_path, parser_key, {fp: (file_stats[fp], results[fp]) for fp in file_paths})
+
+    return [results[file_path] for file_path in file_paths]
+
+
+def _file_stat(file_path: str) -> FileStat:
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _parser_key(parse_fxn: ParseFxn) -> str:
+    """Name of 'parse_fxn' plus the sha256 of its module's source file (if there is one)."""
+    parser_name = f"{parse_fxn.__module__}.{parse_fxn.__qualname__}"
+    module_file = getattr(sys.modules.get(parse_fxn.__module__), '__file__', None)
+
+    if module_file is None or not path.isfile(module_file):
+        return parser_name
+
+    return f"{parser_name}@{file_fingerprint(module_file)}"
+
+
+def _load_cache(cache_path: str, parser_key: str) -> Dict[str, Tuple[FileStat, Any]]:
+    """Cached results are only used if they were produced by the same 'parser_key' (see _parser_key())."""
+    if not path.isfile(cache_path):
+        return {}
+
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cached_parser_key, cache = pickle.load(cache_file)
+    except Exception as e:
+        log.warning(f"Ignoring unreadable parse cache '{cache_path}' ({e})")
+        return {}
+
+    return cache if cached_parser_key == parser_key else {}
+
+
+def _save_cache(cache_path: str, parser_key: str, cache: Dict[str, Tuple[FileStat, Any]]) -> None:
+    tmp_path = cache_path + '.tmp'
+
+    with open(tmp_path, 'wb') as cache_file:
+        pickle.dump((parser_key, cache), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp_path, cache_path)
@@ -0,0 +1,208 @@
+"""
+Progress of a multi file load: bytes read (which the ETA is based on), rows read and rows/sec per file
+and overall, plus the current stage and the rows/sec of the last finished stage. On a terminal this is
+a live rich progress display; otherwise (e.g. output redirected to a log file) a log line is written
+every PROGRESS_LOG_INTERVAL_SECONDS instead.
+
+Rows are counted in batches of PROGRESS_BATCH_ROWS so the per row cost is just being passed through a
+list; the display is only touched once per batch.
+"""
+import time
+from itertools import islice
+from os import path
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from rich.progress import (BarColumn, DownloadColumn, Progress, TaskID, TextColumn, TimeElapsedColumn,
+                           TimeRemainingColumn, TransferSpeedColumn)
+
+from ethecycle.util.filesystem_helper import files_in_dir
+from ethecycle.util.logging import console, log
+from ethecycle.util.metrics import StageMetrics
+from ethecycle.util.number_helper import size_string
+
+PROGRESS_BATCH_ROWS = 50_000
+PROGRESS_LOG_INTERVAL_SECONDS = 30
+TOTAL_DESCRIPTION = 'All files'
+
+Row = TypeVar('Row')
+
+
+class LoadProgress:
+    def __init__(self, file_paths: List[str], live: Optional[bool] = None) -> None:
+        """'live' defaults to whether the console is a terminal."""
+        self.file_sizes = {file_path: _size_on_disk(file_path) for file_path in file_paths}
+        self.total_bytes = sum(self.file_sizes.values())
+        self.live = console.is_terminal if live is None else live
+        self.finished_files_bytes = 0
+        self.finished_files_rows = 0
+        self.file_path: Optional[str] = None
+        self.file_bytes = 0
+        self.file_rows = 0
+        self.stage: Optional[str] = None
+        self.last_stage = ''
+        self.start_time = self.file_start_time = self.last_log_time = time.perf_counter()
+        self._progress: Optional[Progress] = None
+        self._total_task: Optional[TaskID] = None
+        self._file_task: Optional[TaskID] = None
+        self._is_active = False
+
+    def __enter__(self) -> 'LoadProgress':
+        self.start_time = self.last_log_time = time.perf_counter()
+        self._is_active = True
+
+        if self.live:
+            self._progress = Progress(
+                TextColumn('{task.description}', style='bright_cyan'),
+                BarColumn(),
+                DownloadColumn(),
+                TransferSpeedColumn(),
+                TextColumn('{task.fields[rows]:>12,} rows {task.fields[rows_per_second]:>9,.0f} rows/s'),
+                TextColumn('{task.fields[stage]}', style='dim'),
+                TimeElapsedColumn(),
+                TimeRemainingColumn(),
+                console=console
+            )
+
+            self._progress.start()
+            self._total_task = self._progress.add_task(TOTAL_DESCRIPTION, total=self.total_bytes, **self._fields())
+
+        return self
+
+    def __exit__(self, *_args) -> None:
+        self._is_active = False
+
+        if self._progress:
+            self._progress.stop()
+            self._progress = None
+
+        self.print_summary()
+
+    def start_file(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.file_bytes = self.file_rows = 0
+        self.file_start_time = time.perf_counter()
+
+        if self._progress:
+            if self._file_task is not None:
+                self._progress.remove_task(self._file_task)
+
+            file_size = self.file_sizes.get(file_path) or _size_on_disk(file_path)
+            fields = self._fields(self.file_rows, self.file_start_time)
+            self._file_task = self._progress.add_task(path.basename(file_path), total=file_size, **fields)
+
+    def track_rows(self, rows: Iterable[Row], position: Optional[Callable[[], int]] = None) -> Iterator[Row]:
+        """
+        Pass 'rows' through, counting them a batch at a time. 'position' should return how many bytes of
+        the current file have been read so far; without it bytes only advance when the file is finished.
+        """
+        rows = iter(rows)
+
+        while True:
+            batch = list(islice(rows, PROGRESS_BATCH_ROWS))
+
+            if len(batch) == 0:
+                break
+
+            yield from batch
+            self.add_rows(len(batch), position() if position else None)
+
+    def add_rows(self, row_count: int, file_bytes: Optional[int] = None) -> None:
+        """Record 'row_count' more rows of the current file and (if known) the bytes of it read so far."""
+        self.file_rows += row_count
+
+        if file_bytes is not None:
+            self.file_bytes = file_bytes
+
+        self._refresh()
+
+    def finish_file(self) -> None:
+        self.file_bytes = self.file_sizes.get(self.file_path, self.file_bytes)
+        self._refresh(force_log=True)
+        self.finished_files_bytes += self.file_bytes
+        self.finished_files_rows += self.file_rows
+        self.file_bytes = self.file_rows = 0
+
+    def start_stage(self, stage: str) -> None:
+        self.stage = stage
+        self._refresh()
+
+    def finish_stage(self, stage_metrics: StageMetrics) -> None:
+        self.stage = None
+
+        if stage_metrics.rows > 0:
+            self.last_stage = f"{stage_metrics.stage} {stage_metrics.rows_per_second:,.0f} rows/s"
+
+        self._refresh()
+
+    @property
+    def bytes_read(self) -> int:
+        return self.finished_files_bytes + self.file_bytes
+
+    @property
+    def rows_read(self) -> int:
+        return self.finished_files_rows + self.file_rows
+
+    def eta_seconds(self) -> Optional[float]:
+        """Extrapolated from the bytes read so far."""
+        if self.bytes_read == 0:
+            return None
+
+        elapsed_seconds = time.perf_counter() - self.start_time
+        return elapsed_seconds * (self.total_bytes - self.bytes_read) / self.bytes_read
+
+    def print_summary(self) -> None:
+        elapsed_seconds = time.perf_counter() - self.start_time
+        rows_per_second = self.rows_read / elapsed_seconds if elapsed_seconds > 0 else 0
+        msg = f"Read {self.rows_read:,} rows ({size_string(self.bytes_read)}) from {len(self.file_sizes)} "
+        msg += f"files in {_duration_str(elapsed_seconds)} ({rows_per_second:,.0f} rows/sec)"
+        console.print(msg, style='bright_cyan')
+
+    def _refresh(self, force_log: bool = False) -> None:
+        if not self._is_active:
+            return
+        elif self._progress:
+            self._progress.update(self._total_task, completed=self.bytes_read, **self._fields())
+
+            if self._file_task is not None:
+                fields = self._fields(self.file_rows, self.file_start_time)
+                self._progress.update(self._file_task, completed=self.file_bytes, **fields)
+        elif force_log or time.perf_counter() - self.last_log_time >= PROGRESS_LOG_INTERVAL_SECONDS:
+            self.last_log_time = time.perf_counter()
+            self._log_progress()
+
+    def _log_progress(self) -> None:
+        eta_seconds = self.eta_seconds()
+        msg = f"Read {size_string(self.bytes_read)} of {size_string(self.total_bytes)} "
+        msg += f"({100 * self.bytes_read / max(self.total_bytes, 1):.1f}%), {self.rows_read:,} rows "
+        msg += f"({self._rows_per_second(self.rows_read, self.start_time):,.0f} rows/sec)"
+        msg += f", ETA {_duration_str(eta_seconds)}" if eta_seconds is not None else ''
+        msg += f", {self.stage}" if self.stage else ''
+        msg += f" (last stage: {self.last_stage})" if self.last_stage else ''
+        log.info(msg)
+
+    def _fields(self, rows: Optional[int] = None, start_time: Optional[float] = None) -> dict:
+        """Custom fields for the rich progress columns."""
+        rows = self.rows_read if rows is None else rows
+        rows_per_second = self._rows_per_second(rows, start_time or self.start_time)
+        return {'rows': rows, 'rows_per_second': rows_per_second, 'stage': self.stage or self.last_stage}
+
+    @staticmethod
+    def _rows_per_second(rows: int, start_time: float) -> float:
+        elapsed_seconds = time.perf_counter() - start_time
+        return rows / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+
+def _size_on_disk(file_path: str) -> int:
+    """Size of a file or the sum of the files in a directory (Parquet datasets can be directories)."""
+    if path.isdir(file_path):
+        return sum(path.getsize(f) for f in files_in_dir(file_path))
+    elif path.isfile(file_path):
+        return path.getsize(file_path)
+    else:
+        return 0
+
+
+def _duration_str(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,152 @@
+"""
+JSON record of a load_into_neo4j() run kept in OUTPUT_DIR: each source file's fingerprint, the Neo4j CSVs
+generated from it, its row counts and whether it has been transformed / loaded. A run that dies partway
+through (or whose neo4j-admin import fails) can be rerun with --resume, which reuses the CSVs of every
+source file that was already transformed instead of extracting and transforming it again.
+
+Source files are fingerprinted by size and mtime (like BlockIndex) rather than by hashing their contents
+because the files worth resuming are the multi-GB ones.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from os import path
+from typing import Dict, List, Optional
+
+from ethecycle.util.filesystem_helper import OUTPUT_DIR
+from ethecycle.util.logging import log
+from ethecycle.util.time_helper import current_timestamp_iso8601_str
+
+MANIFEST_PATH = str(OUTPUT_DIR.joinpath('load_manifest.json'))
+
+# Statuses (of the run and of each source file)
+TRANSFORMING = 'transforming'
+TRANSFORMED = 'transformed'
+LOADING = 'loading'
+LOADED = 'loaded'
+FAILED = 'failed'
+
+
+@dataclass
+class SourceFileRecord:
+    source_path: str
+    fingerprint: List[int]  # [size, mtime_ns]
+    wallet_csv_path: str
+    txn_csv_path: str
+    txn_count: int
+    wallet_count: int
+    status: str = TRANSFORMED
+    transformed_at: str = field(default_factory=current_timestamp_iso8601_str)
+
+
+@dataclass
+class RunManifest:
+    blockchain: str
+    txn_filter: str  # TxnFilter.fingerprint(); a run can only be resumed with the same filter
+    extracted_at: str
+    status: str = TRANSFORMING
+    # Keyed by absolute source file path
+    source_files: Dict[str, SourceFileRecord] = field(default_factory=dict)
+    manifest_path: str = MANIFEST_PATH
+
+    @classmethod
+    def load_or_create(
+            cls,
+            blockchain: str,
+            txn_filter: str,
+            resume: bool = False,
+            manifest_path: str = MANIFEST_PATH
+        ) -> 'RunManifest':
+        """
+        If 'resume' is set and the manifest at 'manifest_path' is for a run with the same blockchain and
+        filter return it, otherwise start a new one (overwriting whatever was at 'manifest_path').
+        """
+        manifest = cls._load(manifest_path) if resume else None
+
+        if manifest and (manifest.blockchain, manifest.txn_filter) != (blockchain, txn_filter):
+            log.warning(f"Not resuming {manifest.blockchain} {manifest.txn_filter} run (different blockchain/filter)")
+            manifest = None
+        elif manifest:
+            log.info(f"Resuming {manifest.status} run from '{manifest_path}'")
+            manifest.status = TRANSFORMING
+
+        if manifest is None:
+            manifest = cls(blockchain, txn_filter, current_timestamp_iso8601_str(), manifest_path=manifest_path)
+
+        manifest.save()
+        return manifest
+
+    def completed_record(self, source_path: str) -> Optional[SourceFileRecord]:
+        """The record for 'source_path' if it was transformed, hasn't changed since and its CSVs still exist."""
+        record = self.source_files.get(path.abspath(source_path))
+
+        if record is None or record.status != TRANSFORMED:
+            return None
+        elif record.fingerprint != source_fingerprint(source_path):
+            log.info(f"'{source_path}' has changed since it was transformed; transforming it again...")
+            return None
+        elif not (path.isfile(record.wallet_csv_path) and path.isfile(record.txn_csv_path)):
+            log.info(f"Neo4j CSVs for '{source_path}' are gone; transforming it again...")
+            return None
+
+        return record
+
+    def record_transformed(
+            self,
+            source_path: str,
+            wallet_csv_path: str,
+            txn_csv_path: str,
+            txn_count: int,
+            wallet_count: int
+        ) -> None:
+        source_path = path.abspath(source_path)
+        fingerprint = source_fingerprint(source_path)
+        record = SourceFileRecord(source_path, fingerprint, wallet_csv_path, txn_csv_path, txn_count, wallet_count)
+        self.source_files[source_path] = record
+        self.save()
+
+    def txn_count(self, source_paths: List[str]) -> int:
+        """Total txns transformed from 'source_paths' (which must all have been recorded)."""
+        return sum(self.source_files[path.abspath(source_path)].txn_count for source_path in source_paths)
+
+    def set_status(self, status: str) -> None:
+        """Set the run's status. LOADED also marks all the source files loaded so they won't be reused."""
+        self.status = status
+
+        if status == LOADED:
+            for record in self.source_files.values():
+                record.status = LOADED
+
+        self.save()
+
+    def save(self) -> None:
+        """Write to a temp file and rename it so a crash mid write can't leave a truncated manifest."""
+        manifest = asdict(self)
+        del manifest['manifest_path']
+        tmp_path = self.manifest_path + '.tmp'
+
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+
+        os.replace(tmp_path, self.manifest_path)
+
+    @classmethod
+    def _load(cls, manifest_path: str) -> Optional['RunManifest']:
+        if not path.isfile(manifest_path):
+            log.warning(f"No run manifest at '{manifest_path}' to resume from; starting a new run...")
+            return None
+
+        try:
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+
+            source_files = {k: SourceFileRecord(**record) for k, record in manifest.pop('source_files').items()}
+            return cls(**manifest, source_files=source_files, manifest_path=manifest_path)
+        except (KeyError, OSError, TypeError, ValueError) as e:
+            log.warning(f"Ignoring unreadable run manifest '{manifest_path}': {e}")
+            return None
+
+
+def source_fingerprint(source_path: str) -> List[int]:
+    stat = os.stat(source_path)
+    return [stat.st_size, stat.st_mtime_ns]
@@ -11,20 +11,23 @@ from rich_argparse_plus import RichHelpFormatterPlus
 
 from ethecycle.chain_addresses.address_db import drop_and_recreate_tables
 from ethecycle.chain_addresses.db import CHAIN_ADDRESSES_DB_FILE_NAME, CHAIN_ADDRESSES_DB_PATH
-from ethecycle.chain_addresses.importers import rebuild_chain_addresses_db
+from ethecycle.chain_addresses.importers import rebuild_chain_addresses_db, refresh_chain_addresses_db
+from ethecycle.chain_addresses.organization_backfill import backfill_organizations
 from ethecycle.config import Config
 from ethecycle.util.filesystem_helper import SCRIPTS_DIR
 from ethecycle.util.logging import console, set_log_level
 from ethecycle.util.string_constants import DEBUG
 
 REBUILD_ALL = 'ALL'
+REFRESH_ALL = 'REFRESH_ALL'
 RESET_DB = 'RESET_DB'
+BACKFILL_ORGANIZATIONS = 'BACKFILL_ORGANIZATIONS'
 IMPORT_PREFIX = 'import_'
 IMPORTER_MODULE_STR = 'ethecycle.chain_addresses.importers'
 IMPORTERS_MODULE = importlib.import_module(IMPORTER_MODULE_STR)
 PREBUILT_CHAIN_ADDRESS_DB_PATH = path.join(SCRIPTS_DIR, 'docker', 'container_files', CHAIN_ADDRESSES_DB_FILE_NAME)
 
-IMPORTER_METHODS = [REBUILD_ALL, RESET_DB] + [
+IMPORTER_METHODS = [REBUILD_ALL, REFRESH_ALL, RESET_DB, BACKFILL_ORGANIZATIONS] + [
     import_method.removeprefix(IMPORT_PREFIX)
     for import_method in dir(IMPORTERS_MODULE)
     if import_method.startswith(IMPORT_PREFIX)
@@ -36,13 +39,28 @@ RichHelpFormatterPlus.choose_theme('prince')
 
 parser = ArgumentParser(
     formatter_class=RichHelpFormatterPlus,
-    description=f"Reimport a chain address data sources. Select '{REBUILD_ALL}' to rebuild DB from scratch, '{RESET_DB}' to drop and recreate empty DB."
+    description=f"Reimport a chain address data sources. Select '{REBUILD_ALL}' to rebuild DB from scratch, " +
+                f"'{REFRESH_ALL}' to only reimport data sources that changed since the last import, " +
+                f"'{RESET_DB}' to drop and recreate empty DB, " +
+                f"'{BACKFILL_ORGANIZATIONS}' to derive wallet organizations from their names."
 )
 
 parser.add_argument('importer_method',
                     help='chain address importer method to call',
                     choices=IMPORTER_METHODS)
 
+parser.add_argument('-w', '--workers', type=int,
+                    help="number of processes to extract data sources with when rebuilding (1 runs serially)")
+
+parser.add_argument('-f', '--ignore-fingerprints', action='store_true',
+                    help="reimport data sources even if they haven't changed since the last import")
+
+parser.add_argument('-o', '--offline', action='store_true',
+                    help="only use local snapshots of remote data sources (e.g. Google Sheets), never fetch them")
+
+parser.add_argument('-n', '--dry-run', action='store_true',
+                    help=f"show what {BACKFILL_ORGANIZATIONS} would change without writing anything")
+
 parser.add_argument('-s', '--suppress-warnings', action='store_true',
                     help='suppress DB collision warnings')
 
@@ -58,6 +76,12 @@ if args.debug:
 if args.suppress_warnings:
     Config.suppress_chain_address_db_collision_warnings = True
 
+if args.ignore_fingerprints:
+    Config.ignore_data_source_fingerprints = True
+
+if args.offline:
+    Config.offline = True
+
 if args.importer_method == REBUILD_ALL:
     rebuild_db_arg = environ.get('REBUILD_CHAIN_ADDRESS_DB')
 
@@ -68,8 +92,12 @@ if args.importer_method == REBUILD_ALL:
         else:
             console.print(f"Prebuilt DB requested but '{CHAIN_ADDRESSES_DB_PATH}' does not exist so proceeding w/build...")
 
-    rebuild_chain_addresses_db()
+    rebuild_chain_addresses_db(args.workers)
+elif args.importer_method == REFRESH_ALL:
+    refresh_chain_addresses_db(args.workers)
 elif args.importer_method == RESET_DB:
     drop_and_recreate_tables()
+elif args.importer_method == BACKFILL_ORGANIZATIONS:
+    backfill_organizations(dry_run=args.dry_run).print()
 else:
     getattr(IMPORTERS_MODULE, IMPORT_PREFIX + args.importer_method)()
@@ -9,12 +9,15 @@ from rich.text import Text
 from rich_argparse_plus import RichHelpFormatterPlus
 
 from ethecycle.config import Config
+from ethecycle.export.graph_exporters import GRAPH_EXPORT_FORMATS
 from ethecycle.models.blockchain import BLOCKCHAINS
 from ethecycle.models.token import Token
+from ethecycle.models.txn_filter import TxnFilter
 from ethecycle.neo4j import Neo4j
 from ethecycle.transaction_loader import load_into_neo4j
 from ethecycle.util.filesystem_helper import files_in_dir
 from ethecycle.util.logging import ask_for_confirmation, console, set_log_level
+from ethecycle.util.metrics import METRICS_FORMATS
 from ethecycle.util.number_helper import MEGABYTE
 from ethecycle.util.string_constants import DEBUG, ETHEREUM
 
@@ -42,7 +45,7 @@ parser = ArgumentParser(
 )
 
 parser.add_argument('csv_path',
-                    help='either a CSV containing txion data or a directory containing multiple such CSVs')
+                    help='either a CSV (or .parquet file) containing txion data or a directory containing multiple such files')
 
 parser.add_argument('-b', '--blockchain',
                     help='blockchain this CSV contains data for',
@@ -52,6 +55,18 @@ parser.add_argument('-b', '--blockchain',
 parser.add_argument('-t', '--token',
                     help='token symbol to filter transactions for (e.g. USDT, WETH)')
 
+parser.add_argument('--from-block', type=int, metavar='BLOCK',
+                    help='only load txns in this block or later')
+
+parser.add_argument('--to-block', type=int, metavar='BLOCK',
+                    help='only load txns in this block or earlier')
+
+parser.add_argument('-a', '--address-file', metavar='FILE',
+                    help='only load txns to or from the addresses in this file (one per line, gzip ok)')
+
+parser.add_argument('-f', '--export-format', action='append', choices=GRAPH_EXPORT_FORMATS,
+                    help='also export the graph in this format from the same pass over the data (can be repeated)')
+
 parser.add_argument('-d', '--drop', action='store_true',
                     help="drop and recreate the database")
 
@@ -61,6 +76,15 @@ parser.add_argument('-e', '--extract-only', action='store_true',
 parser.add_argument('-p', '--preserve-csvs', action='store_true',
                     help="remove (delete) extracted data CSVs once they have been loaded")
 
+parser.add_argument('-r', '--resume', action='store_true',
+                    help="reuse the CSVs of the source files a failed earlier run already transformed")
+
+parser.add_argument('-m', '--metrics', choices=METRICS_FORMATS,
+                    help='write wall/CPU time, rows, bytes and peak RSS of each load stage to a file in this format')
+
+parser.add_argument('--profile', action='store_true',
+                    help='run each load stage under cProfile (a .prof file per stage) and name stages for py-spy')
+
 parser.add_argument('-D', '--debug', action='store_true',
                     help='show debug level log output')
 
@@ -96,6 +120,10 @@ if args.token and args.token not in CONFIGURED_TOKENS:
 if args.preserve_csvs:
     Config.preserve_csvs = True
 
+Config.metrics_format = args.metrics
+Config.profile = args.profile
+Config.resume = args.resume
+
 # Make sure we are passing a list of paths and not just a single path
 if path.isfile(args.csv_path):
     txn_csvs = [args.csv_path]
@@ -105,7 +133,8 @@ elif path.isdir(args.csv_path):
 else:
     raise ValueError(f"'{args.csv_path}' is not a filesystem path")
 
-load_into_neo4j(txn_csvs, args.blockchain, args.token)
+txn_filter = TxnFilter.build(args.blockchain, args.token, args.from_block, args.to_block, args.address_file)
+load_into_neo4j(txn_csvs, args.blockchain, txn_filter, args.export_format)
 
 if args.drop:
     Neo4j().create_indexes()
@@ -0,0 +1,39 @@
+from ethecycle.blockchains.address_format import (CHECKSUM_VALID, WELL_FORMED, eip55_checksum, eip55_match_level,
+     is_valid_base58check, is_valid_bech32, is_valid_cashaddr)
+from ethecycle.util.keccak import keccak256
+
+# From EIP-55
+CHECKSUMMED_ADDRESS = '5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'
+
+
+def test_keccak256():
+    assert keccak256(b'').hex() == 'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'
+    assert keccak256(b'abc').hex() == '4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45'
+
+
+def test_eip55():
+    assert eip55_checksum(CHECKSUMMED_ADDRESS.lower()) == CHECKSUMMED_ADDRESS
+    assert eip55_match_level(CHECKSUMMED_ADDRESS) == CHECKSUM_VALID
+    assert eip55_match_level(CHECKSUMMED_ADDRESS.lower()) == WELL_FORMED
+    assert eip55_match_level(CHECKSUMMED_ADDRESS.swapcase()) is None
+    assert eip55_match_level('xyz') is None
+
+
+def test_is_valid_base58check():
+    assert is_valid_base58check('1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2', (0x00,))
+    assert not is_valid_base58check('1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN3', (0x00,))
+    assert not is_valid_base58check('1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2', (0x05,))
+    assert not is_valid_base58check('0OIl')
+
+
+def test_is_valid_bech32():
+    assert is_valid_bech32('bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq')
+    assert is_valid_bech32('BC1QAR0SRRR7XFKVY5L643LYDNW9RE59GTZZWF5MDQ')
+    assert not is_valid_bech32('bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdp')
+    assert not is_valid_bech32('bc1QAR0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq')
+
+
+def test_is_valid_cashaddr():
+    assert is_valid_cashaddr('bitcoincash:qpm2qsznhks23z7629mms6s4cwef74vcwvy22gdx6a')
+    assert is_valid_cashaddr('qpm2qsznhks23z7629mms6s4cwef74vcwvy22gdx6a')
+    assert not is_valid_cashaddr('qpm2qsznhks23z7629mms6s4cwef74vcwvy22gdx6b')
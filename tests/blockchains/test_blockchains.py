@@ -1,7 +1,9 @@
-
-from ethecycle.models.blockchain import guess_chain_info_from_address
+from ethecycle.models.blockchain import (candidate_chain_infos, get_chain_info, guess_chain_info_from_address,
+     guess_chain_infos_from_addresses)
 from ethecycle.blockchains.ethereum import Ethereum
 from ethecycle.blockchains.bitcoin import Bitcoin
+from ethecycle.blockchains.bitcoin_cash import BitcoinCash
+from ethecycle.blockchains.litecoin import Litecoin
 from ethecycle.blockchains.tron import Tron
 
 
@@ -9,3 +11,34 @@ def test_guess_chain_info_from_address():
     assert guess_chain_info_from_address('0x3d4E3413babB4cd2ef5220e2cD64e64439B3514E') == Ethereum
     assert guess_chain_info_from_address('3DcTzg5Gyaj7JSAQu7gkqsoMztzUfwgT4u') == Bitcoin
     assert guess_chain_info_from_address('T9zs7iRBoPzUFEjiDVwyghsoEnnzqbtrq2') == Tron
+    assert guess_chain_info_from_address('qpm2qsznhks23z7629mms6s4cwef74vcwvy22gdx6a') == BitcoinCash
+    assert guess_chain_info_from_address('LVg2kJoFNg45Nbpy53h7Fe1wKyeXVRhMH9') == Litecoin
+
+    # Default ChainInfos accept anything so they're never guessed
+    get_chain_info('crypto bro incorporated')
+    assert guess_chain_info_from_address('not an address') is None
+
+
+def test_candidate_chain_infos():
+    assert candidate_chain_infos('0x3d4e3413babb4cd2ef5220e2cd64e64439b3514e') == [Ethereum]
+    # Bad EIP-55 checksum still passes the prefix check
+    assert candidate_chain_infos('0x3d4E3413babB4cd2ef5220e2cD64e64439B3514e') == [Ethereum]
+    assert candidate_chain_infos('xyz') == []
+
+
+def test_guess_chain_infos_from_addresses():
+    addresses = ['1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2', 'xyz', '1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2', None]
+    assert guess_chain_infos_from_addresses(addresses) == [Bitcoin, None, Bitcoin, None]
+
+    # Same answers as classifying the addresses one at a time
+    addresses = [
+        '0x3d4E3413babB4cd2ef5220e2cD64e64439B3514E',
+        '0x3d4e3413babb4cd2ef5220e2cd64e64439b3514e',
+        '3DcTzg5Gyaj7JSAQu7gkqsoMztzUfwgT4u',
+        'T9zs7iRBoPzUFEjiDVwyghsoEnnzqbtrq2',
+        'qpm2qsznhks23z7629mms6s4cwef74vcwvy22gdx6a',
+        'LVg2kJoFNg45Nbpy53h7Fe1wKyeXVRhMH9',
+        'bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq',
+    ]
+
+    assert guess_chain_infos_from_addresses(addresses) == [guess_chain_info_from_address(a) for a in addresses]
@@ -1,5 +1,8 @@
+import pandas as pd
 import pytest
 
+from ethecycle.blockchains.bitcoin import Bitcoin
+from ethecycle.blockchains.ethereum import Ethereum
 from ethecycle.models.address import get_chain_info
 from ethecycle.util.string_constants import USDT, USDT_ETHEREUM_ADDRESS
 
@@ -14,3 +17,20 @@ def test_is_valid_address(generic_chain_info):
     assert generic_chain_info.is_valid_address(USDT_ETHEREUM_ADDRESS + 'x')
     assert generic_chain_info.is_valid_address(USDT_ETHEREUM_ADDRESS.replace('0x', '\\x'))
     assert not generic_chain_info.is_valid_address('xyz')
+
+
+def test_valid_address_mask(generic_chain_info):
+    bitcoin_address = '1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2'
+    addresses = pd.Series([USDT_ETHEREUM_ADDRESS, USDT_ETHEREUM_ADDRESS + 'x', bitcoin_address, 'xyz', None])
+
+    for chain_info in [generic_chain_info, Ethereum, Bitcoin]:
+        expected = [isinstance(a, str) and chain_info.is_valid_address(a) for a in addresses]
+        assert chain_info.valid_address_mask(addresses).tolist() == expected
+
+    assert not Ethereum.valid_address_mask(pd.Series([None, None])).any()
+
+
+def test_chain_string(generic_chain_info):
+    assert Ethereum.chain_string() == 'ethereum'
+    assert generic_chain_info.chain_string() == 'crypto bro incorporated'
+    assert Bitcoin._chain_shortname() == 'btc'
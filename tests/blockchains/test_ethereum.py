@@ -7,3 +7,9 @@ def test_is_valid_address():
     assert Ethereum.is_valid_address(USDT_ETHEREUM_ADDRESS)
     assert not Ethereum.is_valid_address(USDT_ETHEREUM_ADDRESS + 'x')
     assert not Ethereum.is_valid_address(USDT_ETHEREUM_ADDRESS.replace('0x', '\\x'))
+
+
+def test_scanner_url():
+    assert Ethereum.scanner_url(USDT_ETHEREUM_ADDRESS) == f"https://etherscan.io/address/{USDT_ETHEREUM_ADDRESS}"
+    assert Ethereum.scanner_url('0x' + 'f' * 64) == f"https://etherscan.io/tx/0x{'f' * 64}"
+    assert Ethereum.scanner_url(Ethereum.ETH_ADDRESS) is None
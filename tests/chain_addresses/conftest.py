@@ -0,0 +1,17 @@
+import pytest
+
+from ethecycle.chain_addresses import address_db, db
+
+
+@pytest.fixture
+def tmp_address_db(tmp_path, monkeypatch) -> str:
+    """Point the address DB functions at a new, empty DB in 'tmp_path' for the length of the test."""
+    db_path = str(tmp_path.joinpath('chain_addresses.db'))
+    monkeypatch.setattr(db, 'CHAIN_ADDRESSES_DB_PATH', db_path)
+    monkeypatch.setattr(db, '_db', None)
+    monkeypatch.setattr(address_db, '_is_schema_verified', False)
+    monkeypatch.setattr(address_db, '_data_source_ids', None)
+    yield db_path
+
+    if db._db is not None:
+        db._db.disconnect()
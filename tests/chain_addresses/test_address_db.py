@@ -1,8 +1,20 @@
+import sqlite3
+from os import path
+
+import pytest
+
 from ethecycle.blockchains.ethereum import Ethereum
-from ethecycle.chain_addresses.address_db import _get_or_create_data_source_id
+from ethecycle.chain_addresses.address_db import (_get_or_create_data_source_id, get_db_connection,
+     insert_addresses, is_data_source_unchanged)
+from ethecycle.chain_addresses.db.connections import WAL_SUFFIX, read_only_connection, read_only_uri
+from ethecycle.chain_addresses.db.table_definitions import (DATA_SOURCE_ID, DATA_SOURCES_TABLE_NAME,
+     WALLETS_TABLE_NAME)
 from ethecycle.models.wallet import Wallet
+from ethecycle.util.string_constants import DATA_SOURCE, EXTRACTED_AT, NAME
 
 TEST_DATA_SOURCE = '/illmatic/the_world_is_yrs'
+TEST_INSERT_DATA_SOURCE = '/illmatic/represent'
+TEST_DIFF_DATA_SOURCE = '/illmatic/memory_lane'
 
 
 def test_get_or_create_data_source_id():
@@ -12,3 +24,110 @@ def test_get_or_create_data_source_id():
 
 def test_known_wallets(prep_db):
     assert Wallet.name_at_address(Ethereum.chain_string(), '0x6eff3372fa352b239bb24ff91b423a572347000d') == 'BIKI.com'
+
+
+def test_insert_addresses():
+    wallets = [
+        Wallet(address='0xbeef01', chain_info=Ethereum, name='Nas', data_source=TEST_INSERT_DATA_SOURCE),
+        Wallet(address='0xbeef02', chain_info=Ethereum, name='AZ', data_source=TEST_INSERT_DATA_SOURCE),
+        # Collides with the first row so it should not be written
+        Wallet(address='0xbeef01', chain_info=Ethereum, name='Nasty Nas', data_source=TEST_INSERT_DATA_SOURCE),
+    ]
+
+    report = insert_addresses(wallets)
+    assert _wallet_names() == ['AZ', 'Nas']
+    assert (report.inserted_rows, report.mismatched_rows, report.identical_rows, report.failed_rows) == (2, 1, 0, 0)
+    assert report.column_mismatch_counts == {NAME: 1}
+    discarded_row, kept_row = report.samples[0]
+    assert (kept_row[NAME], discarded_row[NAME]) == ('Nas', 'Nasty Nas')
+
+    # Reinserting replaces all of the data_source's rows
+    insert_addresses(wallets[1:])
+    assert _wallet_names() == ['AZ', 'Nasty Nas']
+
+
+def test_insert_addresses_row_diff():
+    wallets = [_diff_wallet('0xbeef01', 'Nas', '2022-01-01'), _diff_wallet('0xbeef02', 'AZ', '2022-01-01')]
+    insert_addresses(wallets, 'sha256:illmatic')
+    assert is_data_source_unchanged(TEST_DIFF_DATA_SOURCE, 'sha256:illmatic')
+    assert not is_data_source_unchanged(TEST_DIFF_DATA_SOURCE, 'sha256:stillmatic')
+
+    # Unchanged row keeps its old extracted_at, changed row is updated, missing row is deleted, new row is inserted
+    wallets = [_diff_wallet('0xbeef01', 'Nas', '2023-01-01'), _diff_wallet('0xbeef03', 'Q-Tip', '2023-01-01')]
+    insert_addresses(wallets, 'sha256:stillmatic')
+    rows = _wallet_rows(TEST_DIFF_DATA_SOURCE, f"{NAME}, {EXTRACTED_AT}")
+    assert rows == [('Nas', '2022-01-01'), ('Q-Tip', '2023-01-01')]
+    assert is_data_source_unchanged(TEST_DIFF_DATA_SOURCE, 'sha256:stillmatic')
+
+    # A source that no longer has any rows has all its rows deleted and its new fingerprint stored
+    insert_addresses([], 'sha256:nastradamus', TEST_DIFF_DATA_SOURCE, WALLETS_TABLE_NAME)
+    assert _wallet_rows(TEST_DIFF_DATA_SOURCE, NAME) == []
+    assert is_data_source_unchanged(TEST_DIFF_DATA_SOURCE, 'sha256:nastradamus')
+
+
+def _diff_wallet(address: str, name: str, extracted_at: str) -> Wallet:
+    return Wallet(address=address, chain_info=Ethereum, name=name, data_source=TEST_DIFF_DATA_SOURCE, extracted_at=extracted_at)
+
+
+def _wallet_names():
+    return [row[0] for row in _wallet_rows(TEST_INSERT_DATA_SOURCE, NAME)]
+
+
+def _wallet_rows(data_source: str, cols: str):
+    data_source_id = _get_or_create_data_source_id(data_source)
+
+    return get_db_connection().connection.execute(
+        f"SELECT {cols} FROM {WALLETS_TABLE_NAME} WHERE {DATA_SOURCE_ID} = ? ORDER BY {NAME}",
+        [data_source_id]
+    ).fetchall()
+
+
+def test_data_source_id_cache():
+    data_source_id = _get_or_create_data_source_id('/illmatic/one_love')
+    get_db_connection().disconnect()  # Cached ids survive reconnecting
+    assert _get_or_create_data_source_id('/illmatic/one_love') == data_source_id
+
+    db_ids = get_db_connection().connection.execute(
+        f"SELECT id FROM {DATA_SOURCES_TABLE_NAME} WHERE {DATA_SOURCE} = ?",
+        ['/illmatic/one_love']
+    ).fetchall()
+
+    assert db_ids == [(data_source_id,)]
+
+
+def test_fresh_db_uses_wal(tmp_address_db):
+    assert get_db_connection().connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+
+
+def test_read_only_connection(tmp_path):
+    db_path = str(tmp_path.joinpath('read_only.db'))
+    writer = sqlite3.connect(db_path)
+    writer.execute('PRAGMA journal_mode = WAL')
+    writer.execute('CREATE TABLE rappers (name TEXT)')
+    writer.execute("INSERT INTO rappers VALUES ('Nas')")
+    writer.commit()
+
+    # Writer still has the DB open so rows in the WAL have to be visible
+    with read_only_connection(db_path) as connection:
+        assert connection.execute('SELECT name FROM rappers').fetchall() == [('Nas',)]
+
+        with pytest.raises(sqlite3.OperationalError):
+            connection.execute("INSERT INTO rappers VALUES ('AZ')")
+
+        assert 'immutable=1' not in read_only_uri(db_path)
+
+    writer.close()
+    assert not path.exists(db_path + WAL_SUFFIX)
+    assert read_only_uri(db_path).endswith('&immutable=1')
+
+    with read_only_connection(db_path) as connection:
+        assert connection.execute('SELECT name FROM rappers').fetchall() == [('Nas',)]
+
+
+def test_rollback_journal_db_is_never_immutable(tmp_path):
+    db_path = str(tmp_path.joinpath('rollback_journal.db'))
+    writer = sqlite3.connect(db_path)
+    writer.execute('CREATE TABLE rappers (name TEXT)')
+    writer.commit()
+    writer.close()
+    assert 'immutable=1' not in read_only_uri(db_path)
@@ -0,0 +1,32 @@
+from ethecycle.chain_addresses.config.etherscan import determine_categories, determine_category
+from ethecycle.chain_addresses.config.organizations import SUBSTRINGS_TO_ORGS, NameToOrg
+from ethecycle.util.string_constants import *
+
+NAMES = [
+    'Aave: Lending Pool',
+    'aAVE holder',
+    'Binance 14',
+    'FTX Exchange',
+    'ftx exchange',
+    'ftx wallet',
+    'BoycottFTX',
+    'Binance Wallet for FTX Token ($FTT)',
+    'Uniswap',
+    '',
+]
+
+
+def test_get_orgs_for_names():
+    expected = [next((m.organization for m in SUBSTRINGS_TO_ORGS if m.is_match(n)), None) for n in NAMES]
+    assert expected == [AAVE, AAVE, BINANCE, None, 'Alameda/FTX', 'Alameda/FTX', None, BINANCE, None, None]
+    assert [NameToOrg.get_org_for_name(name) for name in NAMES] == expected
+    assert NameToOrg.get_orgs_for_names(NAMES + NAMES) == expected + expected
+
+
+def test_determine_category():
+    assert determine_category(['zerion', 'bridge']) == determine_category(['bridge', 'zerion'])
+    assert determine_category(['some-exploit-hack']) == HACKERS
+    assert determine_category(['token-sale', 'burn']) == 'burn'
+    assert determine_category(['ico-wallets']) == 'ico'
+    assert determine_category(['not-a-label']) is None
+    assert determine_categories([['ico-wallets'], ['burn'], ['ico-wallets']]) == ['ico', 'burn', 'ico']
@@ -0,0 +1,48 @@
+from os import makedirs, path
+from subprocess import check_output
+
+from ethecycle.chain_addresses.git_repo_cache import sync_repo, sync_repos
+
+INFO_JSON = 'blockchains/ethereum/assets/0xc0ffee/info.json'
+LOGO_PNG = 'blockchains/ethereum/assets/0xc0ffee/logo.png'
+NEW_INFO_JSON = 'blockchains/bitcoin/assets/1decaf/info.json'
+SPARSE_PATHS = ['blockchains/*/assets/*/info.json']
+
+
+def test_sync_repo(tmp_path):
+    work_dir = str(tmp_path.joinpath('work'))
+    bare_repo_url = f"file://{tmp_path.joinpath('remote.git')}"
+    sparse_dir = str(tmp_path.joinpath('sparse'))
+    full_dir = str(tmp_path.joinpath('full'))
+    _git(None, 'init', '-q', '-b', 'main', work_dir)
+    _commit(work_dir, INFO_JSON, LOGO_PNG)
+    _git(None, 'clone', '-q', '--bare', work_dir, str(tmp_path.joinpath('remote.git')))
+
+    sync_repo(bare_repo_url, sparse_dir, SPARSE_PATHS)
+    assert path.isfile(path.join(sparse_dir, INFO_JSON))
+    assert not path.exists(path.join(sparse_dir, LOGO_PNG))
+    assert _git(sparse_dir, 'rev-parse', '--is-shallow-repository') == 'true'
+
+    # Later syncs pick up new commits
+    _commit(work_dir, NEW_INFO_JSON)
+    _git(work_dir, 'push', '-q', bare_repo_url, 'main')
+    sync_repos([(bare_repo_url, sparse_dir, SPARSE_PATHS), (bare_repo_url, full_dir, None)])
+    assert path.isfile(path.join(sparse_dir, NEW_INFO_JSON))
+    assert path.isfile(path.join(full_dir, LOGO_PNG))
+    assert _git(sparse_dir, 'rev-parse', 'HEAD') == _git(work_dir, 'rev-parse', 'HEAD')
+
+
+def _commit(repo_dir: str, *file_paths: str) -> None:
+    for file_path in file_paths:
+        file_path = path.join(repo_dir, file_path)
+        makedirs(path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'w') as file:
+            file.write('{}')
+
+    _git(repo_dir, 'add', '-A')
+    _git(repo_dir, '-c', 'user.name=rza', '-c', 'user.email=rza@wu.tang', 'commit', '-q', '-m', 'commit')
+
+
+def _git(repo_dir, *args) -> str:
+    return check_output(['git'] + (['-C', repo_dir] if repo_dir else []) + list(args)).decode().strip()
@@ -0,0 +1,36 @@
+import pickle
+
+from ethecycle.chain_addresses.address_db import deferred_inserts
+from ethecycle.chain_addresses.importers.etherscrape_importer import import_etherscrape_chain_addresses
+from ethecycle.chain_addresses.importers.hardcoded_addresses_importer import import_hardcoded_addresses
+from ethecycle.chain_addresses.importers.importer_runner import run_importers
+from ethecycle.models.blockchain import get_chain_info
+from ethecycle.models.wallet import Wallet
+
+
+def test_deferred_inserts():
+    with deferred_inserts({}) as batches:
+        import_hardcoded_addresses()
+
+    assert len(batches) == 1
+    objs, fingerprint, _data_source, _table_name = batches[0]
+    assert objs[0].symbol == 'eth'
+    assert fingerprint is None
+
+
+def test_pickle_address_with_unknown_chain():
+    wallet = Wallet(address='0xabc123', blockchain='wakanda_chain', name='Shuri')
+    unpickled_wallet = pickle.loads(pickle.dumps(wallet))
+    assert unpickled_wallet == wallet
+    assert unpickled_wallet.chain_info is get_chain_info('wakanda_chain')
+
+
+def test_run_importers(tmp_address_db):
+    # A new DB each time so the first run can't be skipped because of fingerprints stored by an earlier test run
+    importers = [import_hardcoded_addresses, import_etherscrape_chain_addresses]
+    timings = run_importers(importers, max_workers=2)
+    assert [timing.importer_name for timing in timings] == [importer.__name__ for importer in importers]
+    assert all(timing.rows > 0 for timing in timings)
+
+    # etherscrape's source file hasn't changed so the second run skips it
+    assert [timing.rows for timing in run_importers(importers, max_workers=2)] == [1, 0]
@@ -0,0 +1,43 @@
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.chain_addresses.address_db import _get_or_create_data_source_id, get_db_connection, insert_addresses
+from ethecycle.chain_addresses.db.search_index import search_addresses
+from ethecycle.chain_addresses.db.table_definitions import DATA_SOURCE_ID, WALLETS_TABLE_NAME
+from ethecycle.chain_addresses.organization_backfill import backfill_organizations
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.string_constants import BINANCE, NAME, ORGANIZATION
+
+TEST_DATA_SOURCE = '/liquid_swords/4th_chamber'
+
+
+def test_backfill_organizations():
+    wallets = [
+        Wallet(address='0xfeed01', chain_info=Ethereum, name='Binance Gza Hot Wallet', data_source=TEST_DATA_SOURCE),
+        Wallet(address='0xfeed02', chain_info=Ethereum, name='Cappadonna', data_source=TEST_DATA_SOURCE),
+        Wallet(address='0xfeed03', chain_info=Ethereum, name='Binance Ghostface', organization=BINANCE,
+               data_source=TEST_DATA_SOURCE),
+    ]
+
+    insert_addresses(wallets)
+    rows = [('Binance Ghostface', BINANCE), ('Binance Gza Hot Wallet', None), ('Cappadonna', None)]
+    assert _organizations() == rows
+
+    dry_run_report = backfill_organizations(dry_run=True, chunk_size=7)
+    assert dry_run_report.change_counts[(None, BINANCE)] >= 1
+    assert dry_run_report.rows_scanned >= len(wallets)
+    assert _organizations() == rows
+
+    report = backfill_organizations(chunk_size=7)
+    assert report.rows_changed == dry_run_report.rows_changed
+    assert _organizations() == [rows[0], ('Binance Gza Hot Wallet', BINANCE), rows[2]]
+    assert backfill_organizations().rows_changed == 0
+
+    # The search index picks up the new organization too
+    results = search_addresses('gza binance', table_name=WALLETS_TABLE_NAME)
+    assert [(r.address, r.organization) for r in results] == [('0xfeed01', BINANCE)]
+
+
+def _organizations():
+    return get_db_connection().connection.execute(
+        f"SELECT {NAME}, {ORGANIZATION} FROM {WALLETS_TABLE_NAME} WHERE {DATA_SOURCE_ID} = ? ORDER BY {NAME}",
+        [_get_or_create_data_source_id(TEST_DATA_SOURCE)]
+    ).fetchall()
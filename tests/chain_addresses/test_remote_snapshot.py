@@ -0,0 +1,80 @@
+import gzip
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ethecycle.chain_addresses.remote_snapshot import (DOWNLOADED, FAILED, FRESH, NOT_MODIFIED, OFFLINE,
+     RemoteSnapshot, refresh_snapshots)
+from ethecycle.config import Config
+
+CSV = b'address,name\n0xc0ffee,shaolin\n'
+
+
+class SheetHandler(BaseHTTPRequestHandler):
+    """Serves CSV with an ETag, honoring If-None-Match. Counts requests in 'server.requests'."""
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('If-None-Match'))
+        etag = f'"{len(self.server.csv)}"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(self.server.csv)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sheet_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SheetHandler)
+    server.csv = CSV
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def test_refresh_snapshots(sheet_server, tmp_path):
+    url = f"http://127.0.0.1:{sheet_server.server_port}/sheet"
+    snapshot = RemoteSnapshot(url, str(tmp_path.joinpath('sheet.csv.gz')))
+    unreachable_snapshot = RemoteSnapshot('http://127.0.0.1:1/sheet', str(tmp_path.joinpath('gone.csv.gz')))
+
+    assert refresh_snapshots([snapshot, unreachable_snapshot]) == {
+        snapshot.snapshot_path: DOWNLOADED,
+        unreachable_snapshot.snapshot_path: FAILED,
+    }
+
+    assert gzip.decompress(open(snapshot.snapshot_path, 'rb').read()) == CSV
+    assert refresh_snapshots([snapshot]) == {snapshot.snapshot_path: FRESH}
+    assert len(sheet_server.requests) == 1
+
+    # Stale snapshots are revalidated with the ETag from the last download
+    _make_stale(snapshot)
+    assert refresh_snapshots([snapshot]) == {snapshot.snapshot_path: NOT_MODIFIED}
+    assert sheet_server.requests[-1] == f'"{len(CSV)}"'
+    assert snapshot.is_fresh()
+
+    _make_stale(snapshot)
+    Config.offline = True
+
+    try:
+        assert refresh_snapshots([snapshot]) == {snapshot.snapshot_path: OFFLINE}
+    finally:
+        Config.offline = False
+
+    sheet_server.csv = CSV + b'0xdecaf,wu\n'
+    assert refresh_snapshots([snapshot]) == {snapshot.snapshot_path: DOWNLOADED}
+    assert gzip.decompress(open(snapshot.snapshot_path, 'rb').read()) == sheet_server.csv
+    assert len(sheet_server.requests) == 3
+
+
+def _make_stale(snapshot: RemoteSnapshot) -> None:
+    os.utime(snapshot.snapshot_path, (0, 0))
@@ -0,0 +1,38 @@
+from ethecycle.blockchains.bitcoin import Bitcoin
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.chain_addresses.address_db import insert_addresses
+from ethecycle.chain_addresses.db.search_index import build_fts_query, search_addresses
+from ethecycle.chain_addresses.db.table_definitions import WALLETS_TABLE_NAME
+from ethecycle.models.wallet import Wallet
+
+DATA_SOURCE = '/wu_tang/36_chambers'
+OTHER_DATA_SOURCE = '/wu_tang/forever'
+
+
+def test_build_fts_query():
+    assert build_fts_query(['ftx', 'us']) == '"ftx"* AND "us"*'
+    assert build_fts_query(['a"b', ' '], match_any=True) == '"a""b"*'
+
+
+def test_search_addresses():
+    insert_addresses([
+        Wallet(address='0xc0ffee01', chain_info=Ethereum, name='Shaolin Treasury', data_source=DATA_SOURCE),
+        Wallet(address='0xc0ffee02', chain_info=Ethereum, name='Wu Hot Wallet', organization='Shaolin', data_source=DATA_SOURCE),
+        Wallet(address='1Shaolin03', chain_info=Bitcoin, name='Shaolin Cold Storage', data_source=DATA_SOURCE),
+    ])
+
+    insert_addresses([
+        Wallet(address='0xc0ffee01', chain_info=Ethereum, name='Shaolin Treasury 2', data_source=OTHER_DATA_SOURCE),
+    ])
+
+    # Prefix matched, deduped across data sources, name matches ranked above organization matches
+    results = search_addresses('shao', Ethereum.chain_string(), WALLETS_TABLE_NAME)
+    assert [r.address for r in results] == ['0xc0ffee01', '0xc0ffee02']
+    assert len(search_addresses('shaolin')) == 3
+    assert [r.address for r in search_addresses('shaolin cold')] == ['1shaolin03']
+    assert len(search_addresses('shaolin killa', match_any=True)) == 3
+
+    # Index follows the row diffs applied by insert_addresses() (rows missing from a data_source are deleted)
+    insert_addresses([Wallet(address='0xc0ffee01', chain_info=Ethereum, name='Killa Beez', data_source=DATA_SOURCE)])
+    assert [r.address for r in search_addresses('killa')] == ['0xc0ffee01']
+    assert [r.address for r in search_addresses('shaolin')] == ['0xc0ffee01']
@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import pytest
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.export.graph_exporter import GraphExporter
+from ethecycle.export.graph_exporters import GRAPH_EXPORT_FORMATS, build_graph_exporters
+from ethecycle.models.transaction import Txn
+from ethecycle.models.wallet import Wallet
+from ethecycle.util.string_constants import *
+
+
+@pytest.fixture
+def txns(prep_db, txn_csv):
+    return Txn.extract_from_csv(txn_csv, Ethereum, '2020-02-20T02:20:20', None)[0:100]
+
+
+def _export(export_format, txns, tmp_path):
+    exporter = build_graph_exporters([export_format], ETHEREUM, str(tmp_path))[0]
+
+    # Feed in two batches like the loader does with two source files
+    for batch in [txns[0:50], txns[50:]]:
+        exporter.add_txns(batch, Wallet.extract_wallets_from_transactions(batch))
+
+    return exporter.finish()
+
+
+def test_graph_export_formats():
+    assert set(['graphml', 'parquet', 'edge_list', 'graphson']).issubset(GRAPH_EXPORT_FORMATS)
+
+    with pytest.raises(ValueError):
+        build_graph_exporters(['gif'], ETHEREUM)
+
+
+def test_incomplete_exporter(tmp_path):
+    class IncompleteExporter(GraphExporter):
+        FORMAT = 'incomplete'
+
+    with pytest.raises(TypeError):
+        IncompleteExporter(ETHEREUM, str(tmp_path))
+
+
+def test_edge_list_export(txns, tmp_path):
+    with gzip.open(_export('edge_list', txns, tmp_path)[0], 'rt') as edge_list:
+        lines = edge_list.readlines()
+
+    assert len(lines) == len(txns)
+    assert lines[0].split()[0] == txns[0].from_address
+    assert float(lines[0].split()[2]) == txns[0].num_tokens
+
+
+def test_graphson_export(txns, tmp_path):
+    with open(_export('graphson', txns, tmp_path)[0]) as graphson:
+        vertices = [json.loads(line) for line in graphson]
+
+    out_edges = [edge for v in vertices for edge in v.get('outE', {}).get(TXN, [])]
+    in_edges = [edge for v in vertices for edge in v.get('inE', {}).get(TXN, [])]
+    assert len(out_edges) == len(in_edges) == len(txns)
+    assert len(vertices) == len(set(v['id'] for v in vertices))
+
+
+def test_parquet_export(txns, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    txn_parquet, wallet_parquet = _export('parquet', txns, tmp_path)
+    txn_table = pq.read_table(txn_parquet)
+    wallet_addresses = pq.read_table(wallet_parquet).column('address').to_pylist()
+    assert txn_table.num_rows == len(txns)
+    assert txn_table.column('block_number').to_pylist()[0] == txns[0].block_number
+    assert len(wallet_addresses) == len(set(wallet_addresses))
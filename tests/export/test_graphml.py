@@ -0,0 +1,40 @@
+import pytest
+from lxml import etree
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.export.graphml import GRAPHML_EXTENSION, build_graphml, export_graphml
+from ethecycle.models.transaction import Txn
+from ethecycle.util.string_constants import *
+
+
+def test_export_graphml(prep_db, txn_csv, tmp_path):
+    txns = Txn.extract_from_csv(txn_csv, Ethereum, '2020-02-20T02:20:20', None)[0:100]
+    output_path = export_graphml(iter(txns), ETHEREUM, str(tmp_path.joinpath('txns')))
+    assert output_path.endswith(GRAPHML_EXTENSION)
+    streamed = etree.parse(output_path).getroot()
+    in_memory = build_graphml(txns, ETHEREUM).getroot()
+
+    for graphml in [streamed, in_memory]:
+        graph = graphml.find('graph')
+        assert graph.get('id') == ETHEREUM
+        assert [child.tag for child in graphml].index('graph') == len(graphml) - 1
+        assert len(graph.findall('edge')) == len(txns)
+
+    streamed_node_ids = [node.get('id') for node in streamed.find('graph').findall('node')]
+    assert len(streamed_node_ids) == len(set(streamed_node_ids))
+    assert set(streamed_node_ids) == set(node.get('id') for node in in_memory.find('graph').findall('node'))
+
+
+def test_export_graphml_closes_file_on_error(prep_db, txn_csv, tmp_path):
+    txns = Txn.extract_from_csv(txn_csv, Ethereum, '2020-02-20T02:20:20', None)[0:10]
+    output_path = str(tmp_path.joinpath('txns' + GRAPHML_EXTENSION))
+
+    def failing_txns():
+        yield from txns
+        raise RuntimeError('source went away')
+
+    with pytest.raises(RuntimeError):
+        export_graphml(failing_txns(), ETHEREUM, output_path)
+
+    # Closing tags were still written so the partial file is valid XML
+    assert len(etree.parse(output_path).getroot().find('graph').findall('edge')) == len(txns)
@@ -0,0 +1,119 @@
+import csv
+import shutil
+
+import pytest
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.models.transaction import RAW_TXN_DATA_CSV_COLS, Txn
+from ethecycle.models.txn_filter import TxnFilter
+from ethecycle.util.block_index import BlockIndex
+from ethecycle.util.string_constants import *
+
+from tests.models.conftest import EXTRACTION_TIMESTAMP_STR
+
+FROM_BLOCK = 3995010
+TO_BLOCK = 3995020
+CHUNK_SIZE = 16 * 1024
+WATCHED_ADDRESS = '0x42da8a05cb7ed9a43572b5ba1b8f82a0a6e263dc'
+EIP55_WATCHED_ADDRESS = '0x42Da8a05cB7Ed9A43572b5BA1B8F82A0A6E263DC'
+
+
+@pytest.fixture
+def block_filter():
+    return TxnFilter.build(ETHEREUM, from_block=FROM_BLOCK, to_block=TO_BLOCK)
+
+
+@pytest.fixture
+def tmp_txn_csv(txn_csv, tmp_path):
+    """Copy of test_txns.csv in a tmp dir so the block index sidecar file isn't written into the fixtures dir."""
+    csv_copy = str(tmp_path.joinpath('txns.csv'))
+    shutil.copy(txn_csv, csv_copy)
+    return csv_copy
+
+
+@pytest.fixture
+def txn_parquet(txn_csv, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    with open(txn_csv, newline='') as csvfile:
+        rows = list(csv.reader(csvfile))
+
+    columns = {col: [row[i] or None for row in rows] for i, col in enumerate(RAW_TXN_DATA_CSV_COLS)}
+    columns[BLOCK_NUMBER] = [int(block_number) for block_number in columns[BLOCK_NUMBER]]
+    parquet_path = str(tmp_path.joinpath('test_txns.parquet'))
+    pq.write_table(pa.table(columns), parquet_path, row_group_size=250)
+    return parquet_path
+
+
+def test_build():
+    assert TxnFilter.build(ETHEREUM) is None
+
+    with pytest.raises(ValueError):
+        TxnFilter.build(ETHEREUM, from_block=2, to_block=1)
+
+
+def test_extract_from_csv(prep_db, tmp_txn_csv, block_filter):
+    txns = Txn.extract_from_csv(tmp_txn_csv, Ethereum, EXTRACTION_TIMESTAMP_STR, block_filter)
+    assert len(txns) > 0
+    assert all(FROM_BLOCK <= txn.block_number <= TO_BLOCK for txn in txns)
+
+
+def test_extract_from_parquet(prep_db, tmp_txn_csv, txn_parquet, block_filter):
+    csv_txns = Txn.extract_from_csv(tmp_txn_csv, Ethereum, EXTRACTION_TIMESTAMP_STR, block_filter)
+    parquet_txns = Txn.extract_from_file(txn_parquet, Ethereum, EXTRACTION_TIMESTAMP_STR, block_filter)
+    assert [t.transaction_id for t in parquet_txns] == [t.transaction_id for t in csv_txns]
+    assert parquet_txns[0].to_neo4j_csv_row() == csv_txns[0].to_neo4j_csv_row()
+    assert len(Txn.extract_from_parquet(txn_parquet, Ethereum, EXTRACTION_TIMESTAMP_STR)) == 5000
+
+
+def test_extract_from_parquet_with_null_block_number(prep_db, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    columns = {col: ['0x1'] for col in RAW_TXN_DATA_CSV_COLS}
+    columns[BLOCK_NUMBER] = pa.array([None], type=pa.int64())
+    parquet_path = str(tmp_path.joinpath('null_block.parquet'))
+    pq.write_table(pa.table(columns), parquet_path)
+
+    with pytest.raises(ValueError, match=BLOCK_NUMBER):
+        Txn.extract_from_parquet(parquet_path, Ethereum, EXTRACTION_TIMESTAMP_STR)
+
+
+@pytest.mark.parametrize('watched_address', [WATCHED_ADDRESS, EIP55_WATCHED_ADDRESS])
+def test_address_file(prep_db, txn_csv, tmp_path, watched_address):
+    address_file = tmp_path.joinpath('watchlist.txt')
+    address_file.write_text(f"# Watchlist\n{watched_address}\n\n")
+    txn_filter = TxnFilter.build(ETHEREUM, address_file=str(address_file))
+    txns = Txn.extract_from_csv(txn_csv, Ethereum, EXTRACTION_TIMESTAMP_STR, txn_filter)
+    assert len(txns) > 0
+    assert all(WATCHED_ADDRESS in [txn.from_address, txn.to_address] for txn in txns)
+
+
+def test_fingerprint():
+    watchlist = TxnFilter(from_block=FROM_BLOCK, addresses={WATCHED_ADDRESS})
+    other_watchlist = TxnFilter(from_block=FROM_BLOCK, addresses={WATCHED_ADDRESS[:-1] + 'd'})
+    assert str(watchlist) == str(other_watchlist)
+    assert watchlist.fingerprint() != other_watchlist.fingerprint()
+    assert watchlist.fingerprint() == TxnFilter(from_block=FROM_BLOCK, addresses={WATCHED_ADDRESS}).fingerprint()
+
+
+def test_block_index(tmp_txn_csv):
+    # First read builds the index and returns every row
+    all_rows = list(BlockIndex(tmp_txn_csv, CHUNK_SIZE).rows_in_block_range(FROM_BLOCK, TO_BLOCK))
+    assert len(all_rows) == 5000
+
+    block_index = BlockIndex(tmp_txn_csv, CHUNK_SIZE)
+    assert len(block_index.chunks) > 20
+    rows = list(block_index.rows_in_block_range(FROM_BLOCK, TO_BLOCK))
+    assert len(rows) < 5000
+    assert _rows_in_range(rows) == _rows_in_range(all_rows)
+
+    # Changing the file invalidates the index
+    with open(tmp_txn_csv, 'a') as csvfile:
+        csvfile.write(','.join(all_rows[0]) + '\n')
+
+    assert BlockIndex(tmp_txn_csv, CHUNK_SIZE).chunks is None
+
+
+def _rows_in_range(rows):
+    return [row for row in rows if FROM_BLOCK <= int(row[-1]) <= TO_BLOCK]
@@ -0,0 +1,84 @@
+import bz2
+import csv
+import gzip
+import struct
+import zlib
+
+import pytest
+
+from ethecycle.util.compressed_file import (ZSTD_SEEKABLE_FOOTER, ZSTD_SEEKABLE_MAGIC, _batch_spans,
+     _bgzf_block_spans, _zstd_seekable_frame_spans, csv_rows, decompressed_chunks)
+
+BLOCK_SIZE = 4096
+
+
+@pytest.fixture
+def csv_bytes(txn_csv):
+    with open(txn_csv, 'rb') as csvfile:
+        return csvfile.read()
+
+
+@pytest.fixture
+def expected_rows(txn_csv):
+    with open(txn_csv, newline='') as csvfile:
+        return list(csv.reader(csvfile))
+
+
+def test_plain_gzip_and_bz2(csv_bytes, expected_rows, tmp_path):
+    gzip_path = tmp_path.joinpath('txns.csv.gz')
+    gzip_path.write_bytes(gzip.compress(csv_bytes))
+    assert _bgzf_block_spans(str(gzip_path)) is None
+    assert list(csv_rows(str(gzip_path))) == expected_rows
+
+    bz2_path = tmp_path.joinpath('txns.csv.bz2')
+    bz2_path.write_bytes(bz2.compress(csv_bytes))
+    assert list(csv_rows(str(bz2_path))) == expected_rows
+
+
+def test_non_newline_line_breaks(tmp_path):
+    """str.splitlines() would also break rows on characters like \\x1c and \\u2028."""
+    gzip_path = tmp_path.joinpath('weird.csv.gz')
+    gzip_path.write_bytes(gzip.compress('a,b\r\nc,d\x1ce\u2028f\n'.encode()))
+    assert list(csv_rows(str(gzip_path))) == [['a', 'b'], ['c', 'd\x1ce\u2028f']]
+
+
+def test_bgzf(csv_bytes, expected_rows, tmp_path):
+    bgzf_path = str(tmp_path.joinpath('txns.csv.gz'))
+
+    with open(bgzf_path, 'wb') as bgzf_file:
+        for i in range(0, len(csv_bytes), BLOCK_SIZE):
+            bgzf_file.write(_bgzf_block(csv_bytes[i:i + BLOCK_SIZE]))
+
+        bgzf_file.write(_bgzf_block(b''))  # BGZF EOF marker block
+
+    spans = _bgzf_block_spans(bgzf_path)
+    assert len(spans) > 50
+    assert len(_batch_spans(spans, 10 * BLOCK_SIZE)) < len(spans)
+    assert b''.join(decompressed_chunks(bgzf_path, threads=4)) == csv_bytes
+    assert list(csv_rows(bgzf_path)) == expected_rows
+
+
+def test_seekable_zstd(csv_bytes, expected_rows, tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    compressor = zstandard.ZstdCompressor()
+    frames = [compressor.compress(csv_bytes[i:i + BLOCK_SIZE]) for i in range(0, len(csv_bytes), BLOCK_SIZE)]
+    seek_table = b''.join(struct.pack('<II', len(frame), BLOCK_SIZE) for frame in frames)
+    seek_table += ZSTD_SEEKABLE_FOOTER.pack(len(frames), 0, ZSTD_SEEKABLE_MAGIC)
+    zstd_path = str(tmp_path.joinpath('txns.csv.zst'))
+
+    with open(zstd_path, 'wb') as zstd_file:
+        zstd_file.write(b''.join(frames))
+        # Seek table lives in a skippable frame
+        zstd_file.write(struct.pack('<II', 0x184D2A5E, len(seek_table)) + seek_table)
+
+    assert len(_zstd_seekable_frame_spans(zstd_path)) == len(frames)
+    assert b''.join(decompressed_chunks(zstd_path, threads=4)) == csv_bytes
+    assert list(csv_rows(zstd_path)) == expected_rows
+
+
+def _bgzf_block(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    block_size = 18 + len(deflated) + 8
+    header = struct.pack('<4BI2BH2BHH', 0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6, 66, 67, 2, block_size - 1)
+    return header + deflated + struct.pack('<II', zlib.crc32(data), len(data))
@@ -0,0 +1,50 @@
+import json
+import pstats
+from os import path, remove
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.export.neo4j_csv import Neo4jCsvs
+from ethecycle.models.transaction import Txn
+from ethecycle.util.metrics import EXTRACT, JSONL, PROMETHEUS, WRITE_TXNS, WRITE_WALLETS, LoadMetrics
+
+
+def test_stage_metrics(prep_db, txn_csv, tmp_path):
+    metrics = LoadMetrics(labels={'blockchain': 'ethereum'}, output_dir=str(tmp_path))
+
+    with metrics.stage(EXTRACT, 'test_txns.csv') as stage:
+        txns = Txn.extract_from_csv(txn_csv, Ethereum, '2020-02-20T02:20:20')
+        stage.rows = len(txns)
+
+    neo4j_csvs = Neo4jCsvs(txns[0:100], None, metrics)
+    assert [stage.stage for stage in metrics.stages] == [EXTRACT, WRITE_WALLETS, WRITE_TXNS]
+    assert metrics.stages[0].rows == len(txns)
+    assert metrics.stages[0].wall_seconds > 0
+    assert metrics.stages[0].peak_rss_bytes > 0
+    assert metrics.stages[2].rows == 100
+    assert metrics.stages[2].bytes == path.getsize(neo4j_csvs.txn_csv_path)
+
+    for csv in neo4j_csvs.generated_csvs:
+        remove(csv)
+
+    with open(metrics.write(JSONL)) as jsonl_file:
+        lines = [json.loads(line) for line in jsonl_file]
+
+    assert [line['stage'] for line in lines] == [EXTRACT, WRITE_WALLETS, WRITE_TXNS]
+    assert lines[0]['blockchain'] == 'ethereum'
+    assert lines[0]['rows'] == len(txns)
+
+    with open(metrics.write(PROMETHEUS)) as prom_file:
+        prometheus = prom_file.read()
+
+    assert f'ethecycle_load_rows{{blockchain="ethereum",stage="write_txns"}} 100.0' in prometheus
+    assert '# TYPE ethecycle_load_peak_rss_bytes gauge' in prometheus
+
+
+def test_profile(tmp_path):
+    metrics = LoadMetrics(profile=True, output_dir=str(tmp_path))
+
+    with metrics.stage(EXTRACT):
+        sorted(range(1000), key=str)
+
+    stats = pstats.Stats(metrics.stages[0].profile_path)
+    assert any('sorted' in fxn_name for _file, _line, fxn_name in stats.stats.keys())
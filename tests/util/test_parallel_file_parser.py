@@ -0,0 +1,59 @@
+import importlib
+import json
+import os
+import sys
+
+from ethecycle.util.parallel_file_parser import MIN_FILES_TO_PARALLELIZE, load_json, parse_files
+
+
+def test_parse_files(tmp_path):
+    file_paths = [str(tmp_path.joinpath(f"{i}.json")) for i in range(MIN_FILES_TO_PARALLELIZE + 1)]
+
+    for i, file_path in enumerate(file_paths):
+        with open(file_path, 'w') as json_file:
+            json.dump({'id': i}, json_file)
+
+    assert parse_files(file_paths, load_json, max_workers=2) == [{'id': i} for i in range(len(file_paths))]
+
+
+def test_parse_files_cache(tmp_path):
+    cache_path = str(tmp_path.joinpath('cache.pickle'))
+    file_paths = [str(tmp_path.joinpath(f"{i}.json")) for i in range(3)]
+
+    for file_path in file_paths:
+        with open(file_path, 'w') as json_file:
+            json.dump({'version': 'old'}, json_file)
+
+    assert parse_files(file_paths, load_json, cache_path) == [{'version': 'old'}] * 3
+
+    # Files with the same size and mtime as last time are read from the cache
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+
+        with open(file_path, 'w') as json_file:
+            json.dump({'version': 'new'}, json_file)
+
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    os.utime(file_paths[0], ns=(0, 0))
+    expected = [{'version': 'new'}, {'version': 'old'}, {'version': 'old'}]
+    assert parse_files(file_paths, load_json, cache_path) == expected
+
+
+def test_parse_files_cache_invalidated_by_parser_change(tmp_path, monkeypatch):
+    cache_path = str(tmp_path.joinpath('cache.pickle'))
+    parser_path = tmp_path.joinpath('versioned_parser.py')
+    file_paths = [str(tmp_path.joinpath('data.json'))]
+    tmp_path.joinpath('data.json').write_text('{}')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+    parser_path.write_text("def parse(file_path):\n    return 'v1'\n")
+    parser = importlib.import_module('versioned_parser')
+
+    try:
+        assert parse_files(file_paths, parser.parse, cache_path) == ['v1']
+        parser_path.write_text("def parse(file_path):\n    return 'v2'\n")
+        parser = importlib.reload(parser)
+        assert parse_files(file_paths, parser.parse, cache_path) == ['v2']
+    finally:
+        sys.modules.pop('versioned_parser', None)
@@ -0,0 +1,26 @@
+from os import path
+
+from ethecycle.blockchains.ethereum import Ethereum
+from ethecycle.models.transaction import Txn
+from ethecycle.util.progress import PROGRESS_BATCH_ROWS, LoadProgress
+
+
+def test_track_rows():
+    with LoadProgress([], live=False) as progress:
+        rows = list(progress.track_rows(range(PROGRESS_BATCH_ROWS + 1)))
+
+    assert rows == list(range(PROGRESS_BATCH_ROWS + 1))
+    assert progress.rows_read == PROGRESS_BATCH_ROWS + 1
+
+
+def test_extract_progress(prep_db, txn_csv):
+    with LoadProgress([txn_csv], live=False) as progress:
+        progress.start_file(txn_csv)
+        txns = Txn.extract_from_file(txn_csv, Ethereum, '2020-02-20T02:20:20', None, progress)
+        assert progress.rows_read == len(txns)
+        assert progress.bytes_read == path.getsize(txn_csv)
+        progress.finish_file()
+
+    assert progress.rows_read == len(txns)
+    assert progress.bytes_read == progress.total_bytes == path.getsize(txn_csv)
+    assert progress.eta_seconds() == 0
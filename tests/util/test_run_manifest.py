@@ -0,0 +1,52 @@
+import os
+
+from ethecycle.util.run_manifest import LOADED, TRANSFORMED, RunManifest
+
+TXN_FILTER = 'TxnFilter(from_block=1)'
+
+
+def test_run_manifest(tmp_path):
+    manifest_path = str(tmp_path.joinpath('load_manifest.json'))
+    source_paths = [str(tmp_path.joinpath(f"txns_{i}.csv")) for i in range(2)]
+    csv_paths = [str(tmp_path.joinpath(f"{label}.csv")) for label in ['Wallet', 'TXN']]
+
+    for file_path in source_paths + csv_paths:
+        tmp_path.joinpath(file_path).write_text('0x0,0x1\n')
+
+    manifest = RunManifest.load_or_create('ethereum', TXN_FILTER, manifest_path=manifest_path)
+    manifest.record_transformed(source_paths[0], *csv_paths, 100, 20)
+
+    # Resuming finds the transformed file but not the one that wasn't
+    resumed = RunManifest.load_or_create('ethereum', TXN_FILTER, resume=True, manifest_path=manifest_path)
+    assert resumed.extracted_at == manifest.extracted_at
+    assert resumed.completed_record(source_paths[0]).txn_count == 100
+    assert resumed.completed_record(source_paths[0]).status == TRANSFORMED
+    assert resumed.completed_record(source_paths[1]) is None
+    assert resumed.txn_count(source_paths[0:1]) == 100
+
+    # A different filter or no --resume starts over
+    assert RunManifest.load_or_create('ethereum', 'TxnFilter()', True, manifest_path).source_files == {}
+    assert RunManifest.load_or_create('ethereum', TXN_FILTER, False, manifest_path).source_files == {}
+
+
+def test_changed_or_loaded_files_are_not_reused(tmp_path):
+    manifest_path = str(tmp_path.joinpath('load_manifest.json'))
+    source_path = str(tmp_path.joinpath('txns.csv'))
+    csv_paths = [str(tmp_path.joinpath(f"{label}.csv")) for label in ['Wallet', 'TXN']]
+
+    for file_path in [source_path] + csv_paths:
+        tmp_path.joinpath(file_path).write_text('0x0,0x1\n')
+
+    manifest = RunManifest.load_or_create('ethereum', TXN_FILTER, manifest_path=manifest_path)
+    manifest.record_transformed(source_path, *csv_paths, 100, 20)
+    assert manifest.completed_record(source_path) is not None
+    os.remove(csv_paths[1])
+    assert manifest.completed_record(source_path) is None
+
+    manifest.record_transformed(source_path, *csv_paths[0:1], source_path, 100, 20)
+    tmp_path.joinpath(source_path).write_text('0x0,0x1\n0x2,0x3\n')
+    assert manifest.completed_record(source_path) is None
+
+    manifest.record_transformed(source_path, *csv_paths[0:1], source_path, 100, 20)
+    manifest.set_status(LOADED)
+    assert manifest.completed_record(source_path) is None